@@ -1,16 +1,276 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
+from app.utils.metrics import metric, register_collector
 import os
+import threading
+import time
 
 # Load .env if present so local development picks up DATABASE_URL
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
+# DB_ASYNC=true serves requests through an asyncio driver (asyncpg / aiosqlite)
+# instead of running the blocking driver on the threadpool.
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Pool sizing is per engine, i.e. per uvicorn worker process.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+POOL_USE_LIFO = os.getenv("DB_POOL_USE_LIFO", "false").lower() in ("1", "true", "yes")
+# Pre-ping costs a round trip per checkout; turn it off when POOL_RECYCLE
+# already retires connections before the server or proxy drops them.
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self.pre_ping_failures = 0
+
+    def observe_checkout(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def observe_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def observe_pre_ping_failure(self):
+        with self._lock:
+            self.pre_ping_failures += 1
+
+
+class _TimedCheckout:
+    """Pool mixin recording how long each checkout waited for a connection."""
+
+    stats: PoolStats
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.observe_timeout()
+            raise
+        finally:
+            self.stats.observe_checkout(time.perf_counter() - start)
+
+
+pool_stats: dict[str, tuple[object, PoolStats]] = {}
+
+
+def engine_options(url: str, pool_base=QueuePool) -> dict:
+    """create_engine keyword arguments for the configured, instrumented pool."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite needs its single shared connection pool.
+        return {"pool_pre_ping": POOL_PRE_PING}
+
+    stats = PoolStats()
+    poolclass = type(f"Timed{pool_base.__name__}", (_TimedCheckout, pool_base), {"stats": stats})
+    return {
+        "poolclass": poolclass,
+        "pool_size": POOL_SIZE,
+        "max_overflow": POOL_MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_use_lifo": POOL_USE_LIFO,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+
+
+def track_pool(name: str, sync_engine):
+    stats = getattr(sync_engine.pool, "stats", None)
+    if stats is None:
+        return
+    pool_stats[name] = (sync_engine, stats)
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _count_pre_ping_failure(dbapi_connection, connection_record, exception):
+        # Failed pings invalidate the connection with a DisconnectionError.
+        if isinstance(exception, exc.DisconnectionError):
+            stats.observe_pre_ping_failure()
+
+
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True  # Helps handle disconnects
+    **engine_options(SQLALCHEMY_DATABASE_URL),
 )
+track_pool("sync", engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_database_url(url: str) -> str:
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"No async driver configured for {url.get_backend_name()}")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    async_engine = create_async_engine(
+        async_database_url(SQLALCHEMY_DATABASE_URL),
+        **engine_options(SQLALCHEMY_DATABASE_URL, AsyncAdaptedQueuePool),
+    )
+    track_pool("async", async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+# Read replicas for the handlers that depend on get_read_db; see app/utils/replicas.py.
+REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+
+class ReplicaEngines:
+    """One replica's engine (for health checks) and session factory, sync or async."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine = create_engine(url, **engine_options(url))
+        track_pool(name, self.engine)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.async_engine = None
+        self.async_session_factory = None
+        if DB_ASYNC:
+            self.async_engine = create_async_engine(
+                async_database_url(url), **engine_options(url, AsyncAdaptedQueuePool)
+            )
+            track_pool(f"async_{name}", self.async_engine.sync_engine)
+            self.async_session_factory = async_sessionmaker(
+                self.async_engine, autoflush=False, expire_on_commit=False
+            )
+
+    @property
+    def serving_engine(self):
+        """The sync Engine behind the sessions that serve requests."""
+        return self.async_engine.sync_engine if self.async_engine is not None else self.engine
+
+
+replica_engines = [ReplicaEngines(f"replica{i}", url) for i, url in enumerate(REPLICA_URLS)]
+
+
+class ThreadedSession:
+    """The subset of AsyncSession used by the routers, backed by a sync Session.
+
+    Each call runs on Starlette's threadpool, so handlers are written once as
+    `async def` and work unchanged whether or not DB_ASYNC is enabled.
+
+    With `slots` (see app/dependencies/db.py), the session takes a slot before
+    its first statement and gives it back on commit, rollback or close, when
+    the sync Session returns its connection to the pool. Awaits in between that
+    do not touch the database, such as password hashing, hold no slot.
+    """
+
+    def __init__(self, session, slots=None):
+        self.sync_session = session
+        self.slots = slots
+        self._holding = False
+
+    async def _hold(self):
+        if self.slots is not None and not self._holding:
+            await self.slots.acquire()
+            self._holding = True
+
+    def _let_go(self):
+        if self._holding:
+            self._holding = False
+            self.slots.release()
+
+    async def _run(self, fn, *args, **kwargs):
+        await self._hold()
+        return await run_in_threadpool(fn, *args, **kwargs)
+
+    def get_bind(self, *args, **kwargs):
+        return self.sync_session.get_bind(*args, **kwargs)
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, params=None, **kwargs):
+        return await self._run(self.sync_session.execute, statement, params, **kwargs)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return await self._run(self.sync_session.scalar, statement, params, **kwargs)
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return await self._run(self.sync_session.scalars, statement, params, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await self._run(self.sync_session.get, entity, ident, **kwargs)
+
+    async def refresh(self, instance, attribute_names=None):
+        await self._run(self.sync_session.refresh, instance, attribute_names)
+
+    async def delete(self, instance):
+        await self._run(self.sync_session.delete, instance)
+
+    async def flush(self):
+        await self._run(self.sync_session.flush)
+
+    async def commit(self):
+        # Pending objects are flushed on commit, so it may need a connection.
+        # A failed commit keeps its connection (and slot) until rollback.
+        await self._run(self.sync_session.commit)
+        self._let_go()
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+        self._let_go()
+
+    async def close(self):
+        try:
+            await run_in_threadpool(self.sync_session.close)
+        finally:
+            self._let_go()
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await self._run(fn, self.sync_session, *args, **kwargs)
+
+
+@register_collector
+def _pool_metrics():
+    pools = [(name, sync_engine.pool, stats) for name, (sync_engine, stats) in pool_stats.items()]
+    yield from metric("db_pool_size", "gauge", "Configured persistent connections.",
+                      (({"pool": n}, p.size()) for n, p, _ in pools))
+    yield from metric("db_pool_checked_out", "gauge", "Connections currently checked out.",
+                      (({"pool": n}, p.checkedout()) for n, p, _ in pools))
+    yield from metric("db_pool_overflow", "gauge", "Connections open beyond pool_size.",
+                      (({"pool": n}, max(p.overflow(), 0)) for n, p, _ in pools))
+    yield from metric("db_pool_checkouts_total", "counter", "Connection checkouts.",
+                      (({"pool": n}, s.checkouts) for n, _, s in pools))
+    yield from metric("db_pool_checkout_wait_seconds_total", "counter",
+                      "Time spent waiting for a connection, including pre-ping.",
+                      (({"pool": n}, round(s.wait_seconds, 6)) for n, _, s in pools))
+    yield from metric("db_pool_checkout_wait_seconds_max", "gauge", "Longest single checkout wait.",
+                      (({"pool": n}, round(s.wait_max, 6)) for n, _, s in pools))
+    yield from metric("db_pool_timeouts_total", "counter", "Checkouts that hit pool_timeout.",
+                      (({"pool": n}, s.timeouts) for n, _, s in pools))
+    yield from metric("db_pool_pre_ping_failures_total", "counter",
+                      "Pooled connections found dead by pre-ping.",
+                      (({"pool": n}, s.pre_ping_failures) for n, _, s in pools))
@@ -1,8 +1,108 @@
-from app.database import SessionLocal
+import contextlib
 
-def get_db():
-    db = SessionLocal()
+import anyio
+from fastapi import HTTPException, Request
+from app.database import (
+    POOL_MAX_OVERFLOW,
+    POOL_SIZE,
+    POOL_TIMEOUT,
+    AsyncSessionLocal,
+    SessionLocal,
+    ThreadedSession,
+    engine,
+    replica_engines,
+)
+from app.utils.replicas import router as replica_router
+
+
+class _Slots:
+    """Admission to one pool's connections for threaded sessions.
+
+    Threaded sessions check out connections on threadpool threads. Admitting
+    more of them than the pool can serve parks threads in checkout while the
+    sessions already holding connections wait for a thread to commit, so the
+    excess waits here, on the event loop. ThreadedSession holds a slot only
+    while it holds a connection.
+    """
+
+    def __init__(self, size: int):
+        self._semaphore = anyio.Semaphore(size)
+
+    async def acquire(self):
+        with anyio.move_on_after(POOL_TIMEOUT):
+            await self._semaphore.acquire()
+            return
+        raise HTTPException(
+            status_code=503,
+            detail="Database busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    def release(self):
+        self._semaphore.release()
+
+
+def _slots():
+    # A negative overflow means no limit.
+    return _Slots(POOL_SIZE + POOL_MAX_OVERFLOW) if POOL_MAX_OVERFLOW >= 0 else None
+
+
+_session_slots = _slots()
+# Each replica has its own pool, so its own slots.
+_replica_slots = {replica.name: _slots() for replica in replica_engines}
+
+
+@contextlib.asynccontextmanager
+async def _session(async_factory, factory, slots):
+    if async_factory is not None:
+        async with async_factory() as db:
+            yield db
+        return
+
+    db = ThreadedSession(factory(expire_on_commit=False), slots)
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+def primary_session():
+    """A session on the primary outside the request's dependencies.
+
+    For handlers that do slow work besides the database (e.g. login's
+    password hashing): open one around each burst of queries, so nothing
+    holds the session while the slow part runs.
+    """
+    return _session(AsyncSessionLocal, SessionLocal, _session_slots)
+
+
+async def get_db():
+    async with _session(AsyncSessionLocal, SessionLocal, _session_slots) as db:
+        yield db
+
+
+async def get_read_db(request: Request):
+    """get_db for handlers that never write: a read replica when one can serve
+    the caller, otherwise the primary. See app/utils/replicas.py."""
+    replica = await replica_router.route(request)
+    if replica is None:
+        async with _session(AsyncSessionLocal, SessionLocal, _session_slots) as db:
+            yield db
+        return
+    async with _session(replica.async_session_factory, replica.session_factory,
+                        _replica_slots[replica.name]) as db:
+        yield db
+
+
+async def read_engine(request: Request):
+    """The sync engine, and its held slot, for a read that streams after the handler returns.
+
+    Routed like get_read_db. The caller releases the slot (None when
+    unlimited) once it has finished with the engine.
+    """
+    replica = await replica_router.route(request)
+    bind, slots = (engine, _session_slots) if replica is None else (
+        replica.engine, _replica_slots[replica.name])
+    if slots is not None:
+        await slots.acquire()
+    return bind, slots
@@ -1,11 +1,11 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.utils.jwt import decode_access_token
 
 security = HTTPBearer()
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ):
     token = credentials.credentials
@@ -17,13 +17,28 @@ def get_current_user(
     return payload
 
 
-def require_agent(user=Depends(get_current_user)):
+async def require_agent(user=Depends(get_current_user)):
     if user["role"] != "AGENT":
         raise HTTPException(status_code=403, detail="Agent access required")
     return user
 
 
-def require_contractor(user=Depends(get_current_user)):
+async def require_contractor(user=Depends(get_current_user)):
     if user["role"] != "CONTRACTOR":
         raise HTTPException(status_code=403, detail="Contractor access required")
     return user
+
+
+async def get_stream_user(
+    access_token: str | None = Query(None),
+    credentials: HTTPAuthorizationCredentials | None = Depends(HTTPBearer(auto_error=False)),
+):
+    """get_current_user that also accepts ?access_token=, for browser EventSource
+    connections, which cannot send an Authorization header."""
+    token = credentials.credentials if credentials else access_token
+    payload = decode_access_token(token) if token else None
+
+    if not payload:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    return payload
@@ -1,11 +1,55 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine
-from app.models import Base
-from app.routers import auth, jobs, applications, work_plans, invoices
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm.exc import StaleDataError
+from starlette.concurrency import run_in_threadpool
+from app.database import async_engine, engine
+from app.routers import (
+	auth, jobs, applications, work_plans, invoices, dashboard, exports, stats, events, metrics, health,
+)
+from app.utils import events as event_bus, lifecycle
+from app.utils.admission import ADMISSION_CONTROL, AdmissionMiddleware
+from app.utils.compression import CompressionMiddleware
+from app.utils.instrumentation import InstrumentationMiddleware
+from app.utils.recommend import recommender
+from app.utils.replicas import StickyWritesMiddleware, router as replica_router
+from app.utils.security import hashing_pool
+from app.utils.static import STATIC_DIR, SPAFiles, has_build
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	# Hashing processes boot alongside the rest of start-up instead of delaying readiness.
+	await run_in_threadpool(hashing_pool.start, False)
+	await event_bus.bus.start()
+	await replica_router.start()
+	await recommender.start(engine)
+	await lifecycle.warm_up(app)
+	lifecycle.install_drain()
+	lifecycle.state.ready = True
+	yield
+	lifecycle.state.ready = False
+	await recommender.stop(engine)
+	await replica_router.stop()
+	await event_bus.bus.stop()
+	hashing_pool.shutdown()
+	engine.dispose()
+	replica_router.dispose()
+	if async_engine is not None:
+		await async_engine.dispose()
+	await replica_router.dispose_async()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
+# Middleware added later wraps the earlier ones.
+if replica_router.replicas:
+	# Reads by a user who just wrote go to the primary.
+	app.add_middleware(StickyWritesMiddleware)
+if ADMISSION_CONTROL:
+	# Inside CORS, so browsers can read the 429/503 responses.
+	app.add_middleware(AdmissionMiddleware)
 # Allow browser-based frontend during development
 app.add_middleware(
 	CORSMiddleware,
@@ -14,11 +58,30 @@ app.add_middleware(
 	allow_methods=["*"],
 	allow_headers=["*"],
 )
+# Inside the instrumentation, so request timings include compression.
+app.add_middleware(CompressionMiddleware)
+# Outermost, so request timings include CORS handling and shed requests.
+app.add_middleware(InstrumentationMiddleware)
+
+
+# A versioned row (Job.version) changed between read and write.
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError):
+	return JSONResponse(status_code=409, content={"detail": "Resource was modified concurrently"})
 
-Base.metadata.create_all(bind=engine)
 
 app.include_router(auth.router)
 app.include_router(jobs.router)
 app.include_router(applications.router)
 app.include_router(work_plans.router)
 app.include_router(invoices.router)
+app.include_router(dashboard.router)
+app.include_router(exports.router)
+app.include_router(stats.router)
+app.include_router(events.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
+
+if has_build(STATIC_DIR):
+	# Requests no API route matches serve the frontend.
+	app.router.default = SPAFiles(STATIC_DIR, app.router.not_found)
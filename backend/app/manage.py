@@ -0,0 +1,73 @@
+"""Maintenance commands.
+
+    python -m app.manage migrate
+    python -m app.manage rebuild-stats
+    python -m app.manage build-recommendations
+"""
+import argparse
+import os
+import sys
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.database import engine
+from app.utils import recommend, stats
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def migrate(args) -> int:
+    tables = set(inspect(engine).get_table_names())
+    if "users" in tables and "alembic_version" not in tables:
+        print(
+            "The schema was created without migrations. Stamp the revision it matches, "
+            "e.g. `alembic stamp 0001` for a database created before migrations existed, "
+            "then run this again.",
+            file=sys.stderr,
+        )
+        return 1
+    command.upgrade(Config(ALEMBIC_INI), args.revision)
+    return 0
+
+
+def rebuild_stats(args) -> int:
+    with engine.begin() as conn:
+        counts = stats.rebuild(conn)
+    for table, rows in counts.items():
+        print(f"{table}: {rows} rows")
+    return 0
+
+
+def build_recommendations(args) -> int:
+    if not recommend.INDEX_PATH:
+        print("RECOMMEND_INDEX_PATH is empty; nothing to write", file=sys.stderr)
+        return 1
+    with engine.connect() as conn:
+        recommend.recommender.refresh(conn)
+    recommend.recommender.save(recommend.INDEX_PATH, engine)
+    print(f"{recommend.recommender.size()} open jobs written to {recommend.INDEX_PATH}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.manage", description="Maintenance commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = commands.add_parser(
+        "migrate", help="Upgrade the database schema; run once per deploy, before starting workers."
+    )
+    migrate_parser.add_argument("--revision", default="head")
+    migrate_parser.set_defaults(run=migrate)
+    commands.add_parser(
+        "rebuild-stats", help="Recompute the stats tables from jobs, applications and invoices."
+    ).set_defaults(run=rebuild_stats)
+    commands.add_parser(
+        "build-recommendations", help="Write the recommendation index snapshot that workers load at start."
+    ).set_defaults(run=build_recommendations)
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
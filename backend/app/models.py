@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Enum, ForeignKey,
-    Float, Text, Date, DateTime
+    Float, Text, Date, DateTime, Index, JSON, func, literal_column
 )
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
@@ -43,6 +43,20 @@ class InvoiceStatus(enum.Enum):
     PAID = "PAID"
 
 
+def search_document(title, description):
+    """Full-text document searched by GET /jobs/?search=.
+
+    Constants are rendered inline so that queries match the GIN expression
+    index even when the driver uses server-side bind parameters.
+    """
+    return func.to_tsvector(
+        literal_column("'english'"),
+        func.coalesce(title, literal_column("''"))
+        + literal_column("' '")
+        + func.coalesce(description, literal_column("''")),
+    )
+
+
 # --------------------
 # USERS
 # --------------------
@@ -79,6 +93,8 @@ class Job(Base):
     agent_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     assigned_contractor_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped on every state change; ORM flushes of a stale Job raise StaleDataError.
+    version = Column(Integer, nullable=False, server_default="0")
 
     applications = relationship("Application", back_populates="job")
     work_plan = relationship("WorkPlan", back_populates="job", uselist=False)
@@ -87,6 +103,21 @@ class Job(Base):
     agent = relationship("User", foreign_keys=[agent_id])
     assigned_contractor = relationship("User", foreign_keys=[assigned_contractor_id])
 
+    __table_args__ = (
+        Index("ix_jobs_status_created_at", "status", "created_at", "id"),
+        Index("ix_jobs_agent_id", "agent_id"),
+        Index("ix_jobs_assigned_contractor_status", "assigned_contractor_id", "status"),
+        Index(
+            "ix_jobs_search_document",
+            search_document(title, description),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+    __mapper_args__ = {"version_id_col": version}
+
+
+job_search_document = search_document(Job.title, Job.description)
+
 
 # --------------------
 # APPLICATIONS
@@ -105,6 +136,20 @@ class Application(Base):
     job = relationship("Job", back_populates="applications")
     contractor = relationship("User")
 
+    __table_args__ = (
+        Index("ix_applications_job_contractor_status", "job_id", "contractor_id", "status"),
+        Index("ix_applications_contractor_id", "contractor_id"),
+        # At most one pending application per contractor and job.
+        Index(
+            "uq_applications_job_contractor_submitted",
+            "job_id",
+            "contractor_id",
+            unique=True,
+            postgresql_where=status == ApplicationStatus.SUBMITTED,
+            sqlite_where=status == ApplicationStatus.SUBMITTED,
+        ),
+    )
+
 
 # --------------------
 # WORK PLANS
@@ -143,3 +188,89 @@ class Invoice(Base):
 
     job = relationship("Job", back_populates="invoice")
     contractor = relationship("User")
+
+    __table_args__ = (
+        Index("ix_invoices_contractor_id", "contractor_id"),
+    )
+
+
+# --------------------
+# STATS
+# --------------------
+# Running totals maintained by app.utils.stats in the same transaction as
+# the state change they count; `python -m app.manage rebuild-stats`
+# recomputes them from the source tables.
+class AgentStats(Base):
+    __tablename__ = "agent_stats"
+
+    agent_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    open_jobs = Column(Integer, nullable=False, default=0, server_default="0")
+    assigned_jobs = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_jobs = Column(Integer, nullable=False, default=0, server_default="0")
+    applications_received = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class ContractorStats(Base):
+    __tablename__ = "contractor_stats"
+
+    contractor_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    applications_submitted = Column(Integer, nullable=False, default=0, server_default="0")
+    assigned_jobs = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_jobs = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_work_plans = Column(Integer, nullable=False, default=0, server_default="0")
+    invoices_submitted = Column(Integer, nullable=False, default=0, server_default="0")
+    invoiced_amount = Column(Float, nullable=False, default=0, server_default="0")
+    paid_amount = Column(Float, nullable=False, default=0, server_default="0")
+
+
+class JobStats(Base):
+    __tablename__ = "job_stats"
+
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+    applications = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+# --------------------
+# OUTBOX
+# --------------------
+# Side effects of state transitions, written in the transition's own
+# transaction and carried out by `python -m app.worker`.
+class OutboxMessage(Base):
+    __tablename__ = "outbox"
+
+    id = Column(Integer, primary_key=True)
+    idempotency_key = Column(String(200), nullable=False, unique=True)
+    kind = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Not picked up before this time; pushed back after each failed attempt.
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text)
+    processed_at = Column(DateTime)
+    # Set when the message ran out of attempts.
+    failed_at = Column(DateTime)
+
+    __table_args__ = (
+        Index(
+            "ix_outbox_pending",
+            "available_at",
+            postgresql_where=(processed_at.is_(None) & failed_at.is_(None)),
+            sqlite_where=(processed_at.is_(None) & failed_at.is_(None)),
+        ),
+        Index("ix_outbox_processed_at", "processed_at"),
+    )
+
+
+class AuditRecord(Base):
+    __tablename__ = "audit_log"
+
+    id = Column(Integer, primary_key=True)
+    # The outbox message's key, so a transition is recorded at most once.
+    idempotency_key = Column(String(200), nullable=False, unique=True)
+    kind = Column(String(100), nullable=False)
+    actor_id = Column(Integer, ForeignKey("users.id"))
+    payload = Column(JSON, nullable=False)
+    # When the transition happened, not when the worker recorded it.
+    occurred_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,29 +1,149 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.dependencies.db import get_db
+from sqlalchemy import case, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.dependencies.db import get_db, get_read_db
 from app.dependencies.rbac import require_contractor, require_agent
-from app.models import Application, Job, JobStatus, ApplicationStatus
-from app.schemas import ApplicationCreate, ApplicationOut
+from app.models import (
+    AgentStats,
+    Application,
+    ApplicationStatus,
+    ContractorStats,
+    Job,
+    JobStats,
+    JobStatus,
+    User,
+)
+from app.schemas import (
+    ApplicationBulkDecision,
+    ApplicationCreate,
+    ApplicationDecisionResult,
+    ApplicationOut,
+)
+from app.utils.cache import invalidate_jobs
+from app.utils.events import Event, publish
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.outbox import enqueue
+from app.utils.recommend import recommender
+from app.utils.serialization import ORJSONResponse, application_rows
+from app.utils.stats import bump
 
-router = APIRouter(prefix="/applications", tags=["Applications"])
+router = APIRouter(prefix="/applications", tags=["Applications"], route_class=InstrumentedRoute)
+
+
+async def _assign_jobs(
+    db: AsyncSession, agent_id: int, assignments: dict[int, tuple[int, int]], notify: list[Event]
+) -> set[int]:
+    """Assign `agent_id`'s jobs to approved applications; return the job ids assigned.
+
+    `assignments` maps job_id to (application_id, contractor_id). The UPDATE
+    only matches jobs that are still OPEN, so of two concurrent approvals for
+    the same job exactly one wins; rows of other jobs are never locked.
+    Events for the affected contractors are appended to `notify`.
+    """
+    contractors = {job_id: contractor_id for job_id, (_, contractor_id) in assignments.items()}
+    assigned = set((await db.execute(
+        update(Job)
+        .where(Job.id.in_(list(assignments)), Job.status == JobStatus.OPEN)
+        .values(
+            status=JobStatus.ASSIGNED,
+            assigned_contractor_id=case(contractors, value=Job.id),
+            version=Job.version + 1,
+        )
+        .returning(Job.id)
+        .execution_options(synchronize_session=False)
+    )).scalars())
+    if not assigned:
+        return assigned
+    # A Core UPDATE fires no mapper events; the next refresh restores the
+    # jobs if this transaction rolls back.
+    recommender.discard(assigned)
+
+    approved = [assignments[job_id][0] for job_id in assigned]
+    await db.execute(
+        update(Application)
+        .where(Application.id.in_(approved))
+        .values(status=ApplicationStatus.APPROVED)
+        .execution_options(synchronize_session=False)
+    )
+    # mark other pending submissions as rejected to avoid ambiguity
+    others = (await db.execute(
+        update(Application)
+        .where(
+            Application.job_id.in_(list(assigned)),
+            Application.id.not_in(approved),
+            Application.status == ApplicationStatus.SUBMITTED,
+        )
+        .values(status=ApplicationStatus.REJECTED)
+        .returning(Application.id, Application.job_id, Application.contractor_id)
+        .execution_options(synchronize_session=False)
+    )).all()
+
+    won = {}
+    for job_id in assigned:
+        contractor_id = assignments[job_id][1]
+        won[contractor_id] = won.get(contractor_id, 0) + 1
+    await bump(db, AgentStats, {
+        agent_id: {"open_jobs": -len(assigned), "assigned_jobs": len(assigned)}
+    })
+    await bump(db, ContractorStats, {c: {"assigned_jobs": n} for c, n in won.items()})
+
+    for job_id in assigned:
+        app_id, contractor_id = assignments[job_id]
+        enqueue(db, "application.approved", {
+            "application_id": app_id, "job_id": job_id,
+            "contractor_id": contractor_id, "actor_id": agent_id,
+        }, key=f"application.approved:{app_id}")
+        notify.append(Event(contractor_id, "application", {
+            "id": app_id, "job_id": job_id, "status": ApplicationStatus.APPROVED,
+        }))
+        notify.append(Event(contractor_id, "job", {"id": job_id, "status": JobStatus.ASSIGNED}))
+    notify.extend(_rejected_events(others))
+    return assigned
+
+
+def _rejected_events(rows) -> list[Event]:
+    return [
+        Event(row.contractor_id, "application", {
+            "id": row.id, "job_id": row.job_id, "status": ApplicationStatus.REJECTED,
+        })
+        for row in rows
+    ]
+
+
+async def _reject(db: AsyncSession, application_ids: list[int], notify: list[Event]) -> set[int]:
+    """Reject applications that have not been approved; return the ids rejected."""
+    rows = (await db.execute(
+        update(Application)
+        .where(Application.id.in_(application_ids), Application.status != ApplicationStatus.APPROVED)
+        .values(status=ApplicationStatus.REJECTED)
+        .returning(Application.id, Application.job_id, Application.contractor_id)
+        .execution_options(synchronize_session=False)
+    )).all()
+    notify.extend(_rejected_events(rows))
+    return {row.id for row in rows}
 
 
 @router.post("/apply/{job_id}", response_model=ApplicationOut)
-def apply_to_job(
+async def apply_to_job(
     job_id: int,
     payload: ApplicationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user=Depends(require_contractor),
 ):
-    job = db.query(Job).filter(Job.id == job_id).first()
+    # FOR SHARE: an approval of this job waits for (and then rejects) this application.
+    job = await db.get(Job, job_id, with_for_update={"read": True})
     if not job or job.status != JobStatus.OPEN:
         raise HTTPException(status_code=400, detail="Job not open")
 
-    existing = db.query(Application).filter(
-        Application.job_id == job_id,
-        Application.contractor_id == user["id"],
-        Application.status == ApplicationStatus.SUBMITTED,
-    ).first()
+    existing = await db.scalar(
+        select(Application.id).where(
+            Application.job_id == job_id,
+            Application.contractor_id == user["id"],
+            Application.status == ApplicationStatus.SUBMITTED,
+        ).limit(1)
+    )
     if existing:
         raise HTTPException(status_code=400, detail="Already applied to this job")
 
@@ -33,35 +153,56 @@ def apply_to_job(
         proposed_cost=payload.proposed_cost,
     )
     db.add(application)
-    db.commit()
-    db.refresh(application)
+    await bump(db, JobStats, {job_id: {"applications": 1}})
+    await bump(db, AgentStats, {job.agent_id: {"applications_received": 1}})
+    await bump(db, ContractorStats, {user["id"]: {"applications_submitted": 1}})
+    try:
+        await db.commit()
+    except IntegrityError:
+        # uq_applications_job_contractor_submitted: a concurrent duplicate won
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Already applied to this job")
+    await publish(Event(job.agent_id, "application", {
+        "id": application.id, "job_id": job_id, "status": ApplicationStatus.SUBMITTED,
+    }))
+    await db.refresh(application, ["contractor"])
     return application
 
 
-@router.get("/job/{job_id}", response_model=list[ApplicationOut])
-def list_applications_for_job(
+@router.get("/job/{job_id}", response_model=list[ApplicationOut], response_class=ORJSONResponse)
+async def list_applications_for_job(
     job_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(require_agent),
 ):
-    job = db.query(Job).filter(Job.id == job_id, Job.agent_id == user["id"]).first()
+    job = await db.scalar(select(Job).where(Job.id == job_id, Job.agent_id == user["id"]))
     if not job:
         raise HTTPException(status_code=404, detail="Job not found or not owned by agent")
-    return db.query(Application).filter(Application.job_id == job_id).all()
+    stmt = (
+        select(*application_rows.columns)
+        .join(User, Application.contractor_id == User.id)
+        .where(Application.job_id == job_id)
+    )
+    return ORJSONResponse(application_rows.many(await db.execute(stmt)))
 
 
-@router.get("/me", response_model=list[ApplicationOut])
-def list_my_applications(db: Session = Depends(get_db), user=Depends(require_contractor)):
-    return db.query(Application).filter(Application.contractor_id == user["id"]).all()
+@router.get("/me", response_model=list[ApplicationOut], response_class=ORJSONResponse)
+async def list_my_applications(db: AsyncSession = Depends(get_read_db), user=Depends(require_contractor)):
+    stmt = (
+        select(*application_rows.columns)
+        .join(User, Application.contractor_id == User.id)
+        .where(Application.contractor_id == user["id"])
+    )
+    return ORJSONResponse(application_rows.many(await db.execute(stmt)))
 
 
 @router.post("/approve/{application_id}")
-def approve_application(
+async def approve_application(
     application_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user=Depends(require_agent),
 ):
-    application = db.query(Application).filter(Application.id == application_id).first()
+    application = await db.get(Application, application_id, options=[joinedload(Application.job)])
 
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -72,33 +213,115 @@ def approve_application(
     if job.status != JobStatus.OPEN:
         raise HTTPException(status_code=400, detail="Job not open for approval")
 
-    application.status = ApplicationStatus.APPROVED
-    job.status = JobStatus.ASSIGNED
-    job.assigned_contractor_id = application.contractor_id
-
-    # optional: mark other submissions as rejected to avoid ambiguity
-    db.query(Application).filter(
-        Application.job_id == job.id,
-        Application.id != application.id,
-    ).update({Application.status: ApplicationStatus.REJECTED})
+    notify = []
+    assignment = {job.id: (application.id, application.contractor_id)}
+    if not await _assign_jobs(db, user["id"], assignment, notify):
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Job not open for approval")
 
-    db.commit()
+    await db.commit()
+    await invalidate_jobs()
+    await publish(*notify)
     return {"message": "Application approved", "job_id": job.id}
 
 
 @router.post("/reject/{application_id}")
-def reject_application(
+async def reject_application(
     application_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user=Depends(require_agent),
 ):
-    application = db.query(Application).filter(Application.id == application_id).first()
+    application = await db.get(Application, application_id, options=[joinedload(Application.job)])
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
 
     if application.job.agent_id != user["id"]:
         raise HTTPException(status_code=403, detail="Not authorized for this job")
 
-    application.status = ApplicationStatus.REJECTED
-    db.commit()
+    notify = []
+    if not await _reject(db, [application.id], notify):
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Application already approved")
+    await db.commit()
+    await publish(*notify)
     return {"message": "Application rejected"}
+
+
+@router.post("/bulk", response_model=list[ApplicationDecisionResult])
+async def decide_applications(
+    payload: ApplicationBulkDecision,
+    db: AsyncSession = Depends(get_db),
+    user=Depends(require_agent),
+):
+    """Approve or reject many applications in one transaction.
+
+    Ownership and job state are checked with a single query; decisions that
+    fail validation are reported per item and do not block the rest.
+    """
+    ids = [decision.application_id for decision in payload.decisions]
+    rows = (await db.execute(
+        select(
+            Application.id,
+            Application.contractor_id,
+            Job.id.label("job_id"),
+            Job.agent_id,
+            Job.status.label("job_status"),
+        )
+        .join(Job, Application.job_id == Job.id)
+        .where(Application.id.in_(ids))
+    )).all()
+    found = {row.id: row for row in rows}
+
+    results = []
+    # application_id -> position of its (first) decision in `results`
+    positions = {}
+    rejected = []
+    # job_id -> (application_id, contractor_id); at most one approval per job
+    assignments = {}
+    for decision in payload.decisions:
+        app_id = decision.application_id
+        row = found.get(app_id)
+        detail = None
+        if app_id in positions:
+            detail = "Duplicate decision for application"
+        elif row is None:
+            detail = "Application not found"
+        elif row.agent_id != user["id"]:
+            detail = "Not authorized for this job"
+        elif decision.status == ApplicationStatus.APPROVED:
+            if row.job_status != JobStatus.OPEN or row.job_id in assignments:
+                detail = "Job not open for approval"
+            else:
+                assignments[row.job_id] = (app_id, row.contractor_id)
+        elif decision.status == ApplicationStatus.REJECTED:
+            rejected.append(app_id)
+        else:
+            detail = "Only APPROVED or REJECTED decisions are supported"
+
+        if detail:
+            results.append(ApplicationDecisionResult(application_id=app_id, ok=False, detail=detail))
+        else:
+            results.append(ApplicationDecisionResult(
+                application_id=app_id, ok=True, status=decision.status, job_id=row.job_id,
+            ))
+        positions.setdefault(app_id, len(results) - 1)
+
+    # Re-check state in the UPDATEs themselves; a concurrent request may have won.
+    notify = []
+    if rejected:
+        for app_id in set(rejected) - await _reject(db, rejected, notify):
+            results[positions[app_id]] = ApplicationDecisionResult(
+                application_id=app_id, ok=False, detail="Application already approved",
+            )
+    if assignments:
+        for job_id in set(assignments) - await _assign_jobs(db, user["id"], assignments, notify):
+            app_id = assignments[job_id][0]
+            results[positions[app_id]] = ApplicationDecisionResult(
+                application_id=app_id, ok=False, detail="Job not open for approval",
+            )
+
+    await db.commit()
+    if assignments:
+        await invalidate_jobs()
+    await publish(*notify)
+    return results
@@ -1,14 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from app.dependencies.db import get_db
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies.db import get_db, primary_session
 from app.dependencies.rbac import get_current_user
 from app.models import User
 from app.schemas import UserCreate, UserOut
+from app.utils.instrumentation import InstrumentedRoute
 from app.utils.jwt import create_access_token
-from app.utils.security import hash_password, verify_password
+from app.utils.security import (
+    HashingBusy,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
+router = APIRouter(prefix="/auth", tags=["Auth"], route_class=InstrumentedRoute)
 
 
 class LoginRequest(BaseModel):
@@ -16,45 +23,75 @@ class LoginRequest(BaseModel):
     password: str
 
 
+async def _hashing(call):
+    try:
+        return await call
+    except HashingBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many sign-ins in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+
 @router.post("/register", response_model=UserOut)
-def register(payload: UserCreate, db: Session = Depends(get_db)):
+async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)):
     if not payload.password or len(payload.password) < 6:
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
 
     user = User(
         name=payload.name, 
         role=payload.role,
-        password_hash=hash_password(payload.password),
+        password_hash=await _hashing(hash_password_async(payload.password)),
         email=payload.email,
         contact_number=payload.contact_number,
         skills=payload.skills,
         education=payload.education
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
 @router.post("/login")
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == payload.user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+async def login(payload: LoginRequest):
+    # Short sessions on either side of the hashing, which can queue for a
+    # while under load, so the hash never holds a connection.
+    async with primary_session() as db:
+        user = await db.get(User, payload.user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
 
-    if not user.password_hash:
-        raise HTTPException(status_code=400, detail="Password not set for this user. Please re-register.")
+        if not user.password_hash:
+            raise HTTPException(status_code=400, detail="Password not set for this user. Please re-register.")
 
-    if not verify_password(payload.password, user.password_hash):
+        claims = {"id": user.id, "role": user.role.value}
+        stored = user.password_hash
+
+    if not await _hashing(verify_password_async(payload.password, stored)):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    token = create_access_token({"id": user.id, "role": user.role.value})
+    if needs_rehash(stored):
+        try:
+            rehashed = await hash_password_async(payload.password)
+        except HashingBusy:
+            # The password is verified; the hash is upgraded on a later login.
+            rehashed = None
+        if rehashed is not None:
+            async with primary_session() as db:
+                await db.execute(
+                    update(User).where(User.id == claims["id"]).values(password_hash=rehashed)
+                )
+                await db.commit()
+
+    token = create_access_token(claims)
     return {"access_token": token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserOut)
-def me(user=Depends(get_current_user), db: Session = Depends(get_db)):
-    record = db.query(User).filter(User.id == user["id"]).first()
+async def me(user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    record = await db.get(User, user["id"])
     if not record:
         raise HTTPException(status_code=404, detail="User not found")
     return record
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.dependencies.db import get_read_db
+from app.dependencies.rbac import require_agent, require_contractor
+from app.models import Application, Job, JobStatus
+from app.schemas import AgentDashboardPage, ContractorDashboardPage
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    created_cursor,
+    created_keyset,
+    paginate,
+)
+from app.utils.serialization import ORJSONResponse, agent_dashboard_job, contractor_dashboard_job
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"], route_class=InstrumentedRoute)
+
+
+async def _job_page(db: AsyncSession, stmt, cursor: str | None, limit: int, serialize):
+    after = created_keyset(Job, cursor)
+    if after is not None:
+        stmt = stmt.where(after)
+    stmt = stmt.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit + 1)
+    rows = (await db.scalars(stmt)).all()
+    items, next_cursor = paginate(rows, limit, created_cursor)
+    return ORJSONResponse({"items": serialize.many(items), "next_cursor": next_cursor})
+
+
+@router.get("/agent", response_model=AgentDashboardPage, response_class=ORJSONResponse)
+async def agent_dashboard(
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(require_agent),
+):
+    # One query for the page of jobs, then one batched IN query per relation.
+    stmt = (
+        select(Job)
+        .where(Job.agent_id == user["id"])
+        .options(
+            selectinload(Job.applications).joinedload(Application.contractor),
+            selectinload(Job.work_plan),
+            selectinload(Job.invoice),
+        )
+    )
+    return await _job_page(db, stmt, cursor, limit, agent_dashboard_job)
+
+
+@router.get("/contractor", response_model=ContractorDashboardPage, response_class=ORJSONResponse)
+async def contractor_dashboard(
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(require_contractor),
+):
+    stmt = (
+        select(Job)
+        .where(
+            Job.assigned_contractor_id == user["id"],
+            Job.status.in_([JobStatus.ASSIGNED, JobStatus.COMPLETED]),
+        )
+        .options(selectinload(Job.work_plan), selectinload(Job.invoice))
+    )
+    return await _job_page(db, stmt, cursor, limit, contractor_dashboard_job)
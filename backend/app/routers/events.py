@@ -0,0 +1,55 @@
+import asyncio
+import os
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.dependencies.rbac import get_stream_user
+from app.utils import events
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.serialization import dumps
+
+# Comment lines sent on idle streams so proxies keep the connection open.
+EVENTS_KEEPALIVE = float(os.getenv("EVENTS_KEEPALIVE", "15"))
+
+router = APIRouter(tags=["Events"], route_class=InstrumentedRoute)
+
+
+async def _stream(request: Request, subscription: events.Subscription):
+    try:
+        # Clients reconnect after 3s; they should reload their lists then,
+        # since events published while disconnected are not replayed.
+        yield b"retry: 3000\n\n"
+        while not subscription.closed:
+            if subscription.overflowed:
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.overflowed = False
+                yield b"event: resync\ndata: {}\n\n"
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), EVENTS_KEEPALIVE)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield b": keepalive\n\n"
+                continue
+            if event is None:
+                return
+            yield b"event: " + event.type.encode() + b"\ndata: " + dumps(event.data) + b"\n\n"
+    finally:
+        events.bus.unsubscribe(subscription)
+
+
+@router.get("/events")
+async def stream_events(request: Request, user=Depends(get_stream_user)):
+    """Server-sent events for status changes that affect the caller.
+
+    Event names are `application`, `job`, `work_plan` and `invoice`, with
+    the entity's `id`, `job_id` and new `status` as data; `resync` means
+    events were dropped and the client should reload.
+    """
+    # Subscribe before responding so nothing published meanwhile is missed.
+    subscription = events.bus.subscribe(user["id"])
+    return StreamingResponse(
+        _stream(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
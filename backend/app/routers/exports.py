@@ -0,0 +1,154 @@
+import csv
+import enum
+import io
+import os
+from datetime import date, datetime
+from typing import Literal
+
+import orjson
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from app.database import engine
+from app.dependencies.db import read_engine
+from app.dependencies.rbac import get_current_user, require_agent
+from app.models import Application, ApplicationStatus, Invoice, InvoiceStatus, Job, JobStatus
+from app.schemas import ApplicationOut
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.serialization import RowSerializer, invoice_rows, job_rows
+
+router = APIRouter(prefix="/exports", tags=["Exports"], route_class=InstrumentedRoute)
+
+# Rows fetched per round trip; memory use is bounded by one batch.
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+application_export_rows = RowSerializer(Application, ApplicationOut, exclude=("contractor",))
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def stream_rows(stmt, serializer: RowSerializer, fmt: str, bind=engine):
+    """Yield `stmt`'s rows as NDJSON or CSV, one chunk per batch.
+
+    Runs on its own connection from `bind` with `yield_per`, which uses a
+    server-side cursor where the driver supports one, so rows are never all
+    in memory. Starlette iterates sync generators on the threadpool.
+    """
+    with bind.connect() as conn:
+        result = conn.execution_options(yield_per=EXPORT_BATCH_SIZE).execute(stmt)
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(serializer.names)
+            for rows in result.partitions():
+                writer.writerows([_csv_value(value) for value in row] for row in rows)
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode("utf-8")
+        else:
+            for rows in result.partitions():
+                yield b"".join(
+                    orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+                    for item in serializer.many(rows)
+                )
+
+
+class ExportResponse(StreamingResponse):
+    """A StreamingResponse that gives back its connection slot when it ends, however it ends."""
+
+    def __init__(self, content, slots, **kwargs):
+        super().__init__(content, **kwargs)
+        self.slots = slots
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if self.slots is not None:
+                self.slots.release()
+
+
+async def _export(request: Request, name: str, stmt, serializer: RowSerializer, fmt: str) -> StreamingResponse:
+    # A replica when one can serve the caller, and a connection slot like any
+    # session's, held until the stream ends.
+    bind, slots = await read_engine(request)
+    return ExportResponse(
+        stream_rows(stmt, serializer, fmt, bind),
+        slots,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+def _filter(stmt, model, status, created_after, created_before):
+    if status is not None:
+        stmt = stmt.where(model.status == status)
+    if created_after is not None:
+        stmt = stmt.where(model.created_at >= created_after)
+    if created_before is not None:
+        stmt = stmt.where(model.created_at < created_before)
+    return stmt.order_by(model.id)
+
+
+@router.get("/jobs")
+async def export_jobs(
+    request: Request,
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    status: JobStatus | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    user=Depends(require_agent),
+):
+    stmt = select(*job_rows.columns).where(Job.agent_id == user["id"])
+    stmt = _filter(stmt, Job, status, created_after, created_before)
+    return await _export(request, "jobs", stmt, job_rows, fmt)
+
+
+@router.get("/applications")
+async def export_applications(
+    request: Request,
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    status: ApplicationStatus | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    user=Depends(get_current_user),
+):
+    """Applications to the caller's jobs (agents) or by the caller (contractors)."""
+    stmt = select(*application_export_rows.columns)
+    if user["role"] == "AGENT":
+        stmt = stmt.join(Job, Application.job_id == Job.id).where(Job.agent_id == user["id"])
+    else:
+        stmt = stmt.where(Application.contractor_id == user["id"])
+    stmt = _filter(stmt, Application, status, created_after, created_before)
+    return await _export(request, "applications", stmt, application_export_rows, fmt)
+
+
+@router.get("/invoices")
+async def export_invoices(
+    request: Request,
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    status: InvoiceStatus | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    user=Depends(get_current_user),
+):
+    """Invoices on the caller's jobs (agents) or submitted by the caller (contractors)."""
+    stmt = select(*invoice_rows.columns)
+    if user["role"] == "AGENT":
+        stmt = stmt.join(Job, Invoice.job_id == Job.id).where(Job.agent_id == user["id"])
+    else:
+        stmt = stmt.where(Invoice.contractor_id == user["id"])
+    stmt = _filter(stmt, Invoice, status, created_after, created_before)
+    return await _export(request, "invoices", stmt, invoice_rows, fmt)
@@ -0,0 +1,26 @@
+import asyncio
+from fastapi import APIRouter, HTTPException
+from app.utils import lifecycle
+from app.utils.instrumentation import InstrumentedRoute
+
+router = APIRouter(prefix="/health", tags=["Health"], route_class=InstrumentedRoute)
+
+
+@router.get("/live")
+async def live():
+    """The worker's event loop is running. Never touches the database."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready():
+    """The worker has warmed up, is not draining and can reach the database."""
+    if lifecycle.state.draining:
+        raise HTTPException(status_code=503, detail="Draining")
+    if not lifecycle.state.ready:
+        raise HTTPException(status_code=503, detail="Starting")
+    try:
+        await asyncio.wait_for(lifecycle.ping(), lifecycle.READY_TIMEOUT)
+    except Exception:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    return {"status": "ok"}
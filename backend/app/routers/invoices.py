@@ -1,21 +1,40 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.dependencies.db import get_db
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.dependencies.db import get_db, get_read_db
 from app.dependencies.rbac import require_contractor, require_agent
-from app.models import Invoice, Job, JobStatus, WorkPlanStatus, InvoiceStatus
+from app.models import (
+    AgentStats,
+    ContractorStats,
+    Invoice,
+    InvoiceStatus,
+    Job,
+    JobStatus,
+    WorkPlanStatus,
+)
 from app.schemas import InvoiceCreate, InvoiceUpdateStatus, InvoiceOut
+from app.utils.cache import invalidate_jobs
+from app.utils.events import Event, publish
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.outbox import enqueue
+from app.utils.serialization import ORJSONResponse, invoice_rows
+from app.utils.stats import bump
 
-router = APIRouter(prefix="/invoices", tags=["Invoices"])
+router = APIRouter(prefix="/invoices", tags=["Invoices"], route_class=InstrumentedRoute)
 
 
 @router.post("/{job_id}", response_model=InvoiceOut)
-def submit_invoice(
+async def submit_invoice(
     job_id: int,
     payload: InvoiceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user=Depends(require_contractor),
 ):
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.get(
+        Job, job_id, options=[joinedload(Job.work_plan), joinedload(Job.invoice)]
+    )
     if not job or job.assigned_contractor_id != user["id"]:
         raise HTTPException(status_code=403, detail="Not allowed to invoice this job")
 
@@ -33,41 +52,83 @@ def submit_invoice(
     )
     db.add(invoice)
     job.status = JobStatus.COMPLETED
-    db.commit()
-    db.refresh(invoice)
+    await bump(db, AgentStats, {job.agent_id: {"assigned_jobs": -1, "completed_jobs": 1}})
+    await bump(db, ContractorStats, {user["id"]: {
+        "assigned_jobs": -1,
+        "completed_jobs": 1,
+        "invoices_submitted": 1,
+        "invoiced_amount": payload.amount,
+    }})
+    try:
+        await db.flush()
+        enqueue(db, "invoice.submitted", {
+            "invoice_id": invoice.id, "job_id": job_id, "contractor_id": user["id"],
+            "actor_id": user["id"], "amount": invoice.amount,
+        }, key=f"invoice.submitted:{invoice.id}")
+        await db.commit()
+    except IntegrityError:
+        # invoices.job_id is unique: a concurrent submission won
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Invoice already submitted")
+    await invalidate_jobs()
+    await db.refresh(invoice)
+    await publish(
+        Event(job.agent_id, "invoice", {
+            "id": invoice.id, "job_id": job_id, "status": invoice.status, "amount": invoice.amount,
+        }),
+        Event(job.agent_id, "job", {"id": job_id, "status": JobStatus.COMPLETED}),
+    )
     return invoice
 
 
 @router.patch("/{invoice_id}/status", response_model=InvoiceOut)
-def update_invoice_status(
+async def update_invoice_status(
     invoice_id: int,
     payload: InvoiceUpdateStatus,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user=Depends(require_agent),
 ):
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    # Locked so concurrent updates see each other's status and count a payment once.
+    invoice = await db.get(
+        Invoice, invoice_id, options=[joinedload(Invoice.job)], with_for_update={"of": Invoice}
+    )
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
 
     if invoice.job.agent_id != user["id"]:
         raise HTTPException(status_code=403, detail="Not authorized for this job")
 
+    status_changed = invoice.status != payload.status
+    was_paid = invoice.status == InvoiceStatus.PAID
+    if was_paid != (payload.status == InvoiceStatus.PAID):
+        paid = -invoice.amount if was_paid else invoice.amount
+        await bump(db, ContractorStats, {invoice.contractor_id: {"paid_amount": paid}})
+    if status_changed:
+        enqueue(db, "invoice.status_changed", {
+            "invoice_id": invoice.id, "job_id": invoice.job_id, "contractor_id": invoice.contractor_id,
+            "actor_id": user["id"], "amount": invoice.amount,
+            "from": invoice.status.value, "to": payload.status.value,
+        })
     invoice.status = payload.status
     if payload.status == InvoiceStatus.PAID:
         invoice.job.status = JobStatus.COMPLETED
 
-    db.commit()
-    db.refresh(invoice)
+    await db.commit()
+    await db.refresh(invoice)
+    if status_changed:
+        await publish(Event(invoice.contractor_id, "invoice", {
+            "id": invoice.id, "job_id": invoice.job_id, "status": invoice.status,
+            "amount": invoice.amount,
+        }))
     return invoice
 
 
 @router.get("/job/{job_id}", response_model=InvoiceOut)
-def get_job_invoice(job_id: int, db: Session = Depends(get_db), user=Depends(require_agent)):
-    invoice = (
-        db.query(Invoice)
+async def get_job_invoice(job_id: int, db: AsyncSession = Depends(get_read_db), user=Depends(require_agent)):
+    invoice = await db.scalar(
+        select(Invoice)
         .join(Job)
-        .filter(Invoice.job_id == job_id, Job.agent_id == user["id"])
-        .first()
+        .where(Invoice.job_id == job_id, Job.agent_id == user["id"])
     )
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
@@ -75,25 +136,25 @@ def get_job_invoice(job_id: int, db: Session = Depends(get_db), user=Depends(req
 
 
 @router.get("/job/{job_id}/me", response_model=InvoiceOut)
-def get_my_invoice_for_job(
+async def get_my_invoice_for_job(
     job_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(require_contractor),
 ):
-    invoice = (
-        db.query(Invoice)
+    invoice = await db.scalar(
+        select(Invoice)
         .join(Job)
-        .filter(
+        .where(
             Invoice.job_id == job_id,
             Invoice.contractor_id == user["id"],
         )
-        .first()
     )
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     return invoice
 
 
-@router.get("/me", response_model=list[InvoiceOut])
-def list_my_invoices(db: Session = Depends(get_db), user=Depends(require_contractor)):
-    return db.query(Invoice).filter(Invoice.contractor_id == user["id"]).all()
+@router.get("/me", response_model=list[InvoiceOut], response_class=ORJSONResponse)
+async def list_my_invoices(db: AsyncSession = Depends(get_read_db), user=Depends(require_contractor)):
+    stmt = select(*invoice_rows.columns).where(Invoice.contractor_id == user["id"])
+    return ORJSONResponse(invoice_rows.many(await db.execute(stmt)))
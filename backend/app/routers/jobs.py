@@ -1,17 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.dependencies.db import get_db
+import os
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies.db import get_db, get_read_db
 from app.dependencies.rbac import require_agent, require_contractor
-from app.models import Job, JobStatus
-from app.schemas import JobCreate, JobOut
+from app.models import AgentStats, Job, JobStatus, User
+from app.schemas import JobCreate, JobImportResult, JobOut, JobPage, JobRecommendation
+from app.utils.cache import cached_json, invalidate_jobs, request_key
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    created_cursor,
+    created_keyset,
+    paginate,
+)
+from app.utils.recommend import recommender
+from app.utils.search import index_inserted, search_jobs
+from app.utils.serialization import ORJSONResponse, job_rows
+from app.utils.stats import bump
+from app.utils.uploads import iter_rows
 
-router = APIRouter(prefix="/jobs", tags=["Jobs"])
+JOB_IMPORT_BATCH_SIZE = int(os.getenv("JOB_IMPORT_BATCH_SIZE", "500"))
+JOB_IMPORT_MAX_ROWS = int(os.getenv("JOB_IMPORT_MAX_ROWS", "100000"))
+JOB_IMPORT_MAX_JSON_BYTES = int(os.getenv("JOB_IMPORT_MAX_JSON_BYTES", str(16 * 1024 * 1024)))
+# Rows beyond this many failures are counted but not described.
+JOB_IMPORT_MAX_ERRORS = 1000
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=InstrumentedRoute)
 
 
 @router.post("/", response_model=JobOut)
-def create_job(
+async def create_job(
     payload: JobCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user=Depends(require_agent),
 ):
     job = Job(
@@ -21,45 +46,184 @@ def create_job(
         agent_id=user["id"],
     )
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    await bump(db, AgentStats, {user["id"]: {"open_jobs": 1}})
+    await db.commit()
+    await db.refresh(job)
+    await invalidate_jobs()
     return job
 
 
-@router.get("/", response_model=list[JobOut])
-def list_open_jobs(
+async def _insert_jobs(db: AsyncSession, agent_id: int, rows: list[dict]) -> list[int]:
+    # Not sort_by_parameter_order: SQLite cannot promise RETURNING order, so
+    # SQLAlchemy would fall back to one INSERT per row. Each returned row
+    # carries its own text for the search index instead.
+    result = await db.execute(insert(Job).returning(Job.id, Job.version, Job.title, Job.description), rows)
+    inserted = result.all()
+    await bump(db, AgentStats, {agent_id: {"open_jobs": len(inserted)}})
+    await db.commit()
+    index_inserted(db.get_bind(), ((row.id, row.title, row.description) for row in inserted))
+    recommender.track(inserted)
+    await invalidate_jobs()
+    return sorted(row.id for row in inserted)
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+_IMPORT_BODY = {"type": "array", "items": {"$ref": "#/components/schemas/JobCreate"}}
+
+
+@router.post(
+    "/import",
+    response_model=JobImportResult,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/json": {"schema": _IMPORT_BODY},
+        "application/x-ndjson": {"schema": {"$ref": "#/components/schemas/JobCreate"}},
+        "text/csv": {"schema": {"type": "string", "description": "Header row: title,description,budget"}},
+    }}},
+)
+async def import_jobs(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user=Depends(require_agent),
+):
+    """Create many jobs from a JSON array, NDJSON or CSV body.
+
+    Each row is validated like POST /jobs/; invalid rows are reported by row
+    number and skipped without affecting the others. Valid rows are inserted
+    JOB_IMPORT_BATCH_SIZE at a time with one INSERT ... RETURNING, and each
+    batch commits on its own so a long upload never holds a transaction open
+    while the next chunk arrives.
+    """
+    ids: list[int] = []
+    errors = []
+    failed = 0
+    batch: list[dict] = []
+    async for row, value, error in iter_rows(request, JOB_IMPORT_MAX_JSON_BYTES):
+        if row > JOB_IMPORT_MAX_ROWS:
+            error = f"Imports are limited to {JOB_IMPORT_MAX_ROWS} rows; the rest were ignored"
+        elif error is None:
+            try:
+                job = JobCreate.model_validate(value)
+            except ValidationError as exc:
+                error = _describe(exc)
+        if error is not None:
+            failed += 1
+            if len(errors) < JOB_IMPORT_MAX_ERRORS:
+                errors.append({"row": row, "detail": error})
+            if row > JOB_IMPORT_MAX_ROWS:
+                break
+            continue
+
+        batch.append({**job.model_dump(), "agent_id": user["id"]})
+        if len(batch) >= JOB_IMPORT_BATCH_SIZE:
+            ids += await _insert_jobs(db, user["id"], batch)
+            batch = []
+    if batch:
+        ids += await _insert_jobs(db, user["id"], batch)
+    return {"created": len(ids), "failed": failed, "ids": ids, "errors": errors}
+
+
+@router.get("/", response_model=JobPage)
+async def list_open_jobs(
+    request: Request,
     search: str | None = None,
-    db: Session = Depends(get_db),
+    min_budget: float | None = None,
+    max_budget: float | None = None,
+    agent_id: int | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    query = db.query(Job).filter(Job.status == JobStatus.OPEN)
-    if search:
-        query = query.filter(Job.title.ilike(f"%{search}%"))
-    return query.all()
+    async def load():
+        stmt = select(*job_rows.columns).where(Job.status == JobStatus.OPEN)
+        if min_budget is not None:
+            stmt = stmt.where(Job.budget >= min_budget)
+        if max_budget is not None:
+            stmt = stmt.where(Job.budget <= max_budget)
+        if agent_id is not None:
+            stmt = stmt.where(Job.agent_id == agent_id)
+        if created_after is not None:
+            stmt = stmt.where(Job.created_at >= created_after)
+        if created_before is not None:
+            stmt = stmt.where(Job.created_at < created_before)
 
+        if search:
+            items, next_cursor = await search_jobs(db, stmt, search, cursor, limit)
+            return {"items": job_rows.many(items), "next_cursor": next_cursor}
 
-@router.get("/assigned/me", response_model=list[JobOut])
-def get_assigned_jobs(
-    db: Session = Depends(get_db),
+        after = created_keyset(Job, cursor)
+        if after is not None:
+            stmt = stmt.where(after)
+
+        stmt = stmt.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit + 1)
+        rows = (await db.execute(stmt)).all()
+        items, next_cursor = paginate(rows, limit, created_cursor)
+        return {"items": job_rows.many(items), "next_cursor": next_cursor}
+
+    return await cached_json(request, request_key(request), load)
+
+
+@router.get("/assigned/me", response_model=list[JobOut], response_class=ORJSONResponse)
+async def get_assigned_jobs(
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(require_contractor),
 ):
-    return (
-        db.query(Job)
-        .filter(
-            Job.assigned_contractor_id == user["id"],
-            Job.status.in_([JobStatus.ASSIGNED, JobStatus.COMPLETED]),
-        )
-        .all()
+    stmt = select(*job_rows.columns).where(
+        Job.assigned_contractor_id == user["id"],
+        Job.status.in_([JobStatus.ASSIGNED, JobStatus.COMPLETED]),
     )
+    return ORJSONResponse(job_rows.many(await db.execute(stmt)))
 
 
-@router.get("/agent/me", response_model=list[JobOut])
-def list_agent_jobs(db: Session = Depends(get_db), user=Depends(require_agent)):
-    return db.query(Job).filter(Job.agent_id == user["id"]).all()
+@router.get("/agent/me", response_model=list[JobOut], response_class=ORJSONResponse)
+async def list_agent_jobs(db: AsyncSession = Depends(get_read_db), user=Depends(require_agent)):
+    stmt = select(*job_rows.columns).where(Job.agent_id == user["id"])
+    return ORJSONResponse(job_rows.many(await db.execute(stmt)))
+
+
+@router.get("/recommended", response_model=list[JobRecommendation], response_class=ORJSONResponse)
+async def recommended_jobs(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(require_contractor),
+):
+    """Open jobs ranked by how well they match the caller's skills and education."""
+    profile = (await db.execute(
+        select(User.skills, User.education).where(User.id == user["id"])
+    )).first()
+    if profile is None or not (profile.skills or profile.education):
+        return ORJSONResponse([])
+    if not recommender.loaded:
+        await db.run_sync(recommender.refresh)
+
+    # Ask for a few extra in case some were assigned since the index last heard.
+    ranked = await run_in_threadpool(
+        recommender.recommend, f"{profile.skills or ''} {profile.education or ''}", limit + 10
+    )
+    if not ranked:
+        return ORJSONResponse([])
+    rows = await db.execute(
+        select(*job_rows.columns).where(Job.id.in_([job_id for _, job_id in ranked]), Job.status == JobStatus.OPEN)
+    )
+    jobs = {job["id"]: job for job in job_rows.many(rows)}
+    return ORJSONResponse([
+        {**jobs[job_id], "score": score} for score, job_id in ranked if job_id in jobs
+    ][:limit])
 
 
 @router.get("/{job_id}", response_model=JobOut)
-def get_job(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    return job
+async def get_job(job_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def load():
+        row = (await db.execute(select(*job_rows.columns).where(Job.id == job_id))).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job_rows(row)
+
+    return await cached_json(request, f"job:{job_id}", load)
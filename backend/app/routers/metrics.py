@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.metrics import CONTENT_TYPE, render
+
+router = APIRouter(tags=["Metrics"], route_class=InstrumentedRoute)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies.db import get_read_db
+from app.dependencies.rbac import require_agent, require_contractor
+from app.models import AgentStats, ContractorStats, Job, JobStats
+from app.schemas import AgentStatsOut, ContractorStatsOut, JobStatsOut
+from app.utils.instrumentation import InstrumentedRoute
+
+router = APIRouter(prefix="/stats", tags=["Stats"], route_class=InstrumentedRoute)
+
+
+@router.get("/agent/me", response_model=AgentStatsOut)
+async def my_agent_stats(db: AsyncSession = Depends(get_read_db), user=Depends(require_agent)):
+    # No row yet means nothing has been counted for this agent.
+    return await db.get(AgentStats, user["id"]) or AgentStatsOut()
+
+
+@router.get("/contractor/me", response_model=ContractorStatsOut)
+async def my_contractor_stats(db: AsyncSession = Depends(get_read_db), user=Depends(require_contractor)):
+    return await db.get(ContractorStats, user["id"]) or ContractorStatsOut()
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatsOut)
+async def job_stats(job_id: int, db: AsyncSession = Depends(get_read_db), user=Depends(require_agent)):
+    row = (await db.execute(
+        select(Job.id.label("job_id"), func.coalesce(JobStats.applications, 0).label("applications"))
+        .outerjoin(JobStats, JobStats.job_id == Job.id)
+        .where(Job.id == job_id, Job.agent_id == user["id"])
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found or not owned by agent")
+    return row
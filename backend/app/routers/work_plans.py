@@ -1,11 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.dependencies.db import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.dependencies.db import get_db, get_read_db
 from app.dependencies.rbac import require_contractor, require_agent
-from app.models import WorkPlan, Job, JobStatus
+from app.models import ContractorStats, WorkPlan, WorkPlanStatus, Job, JobStatus
 from app.schemas import WorkPlanCreate, WorkPlanUpdate, WorkPlanOut
+from app.utils.events import Event, publish
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.stats import bump
 
-router = APIRouter(prefix="/work-plans", tags=["WorkPlans"])
+router = APIRouter(prefix="/work-plans", tags=["WorkPlans"], route_class=InstrumentedRoute)
 
 
 def _ensure_assignment(job: Job, contractor_id: int):
@@ -14,13 +19,13 @@ def _ensure_assignment(job: Job, contractor_id: int):
 
 
 @router.post("/{job_id}", response_model=WorkPlanOut)
-def create_work_plan(
+async def create_work_plan(
     job_id: int,
     payload: WorkPlanCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user=Depends(require_contractor),
 ):
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.get(Job, job_id, options=[joinedload(Job.work_plan)])
     if not job or job.status != JobStatus.ASSIGNED:
         raise HTTPException(status_code=400, detail="Job not assigned")
     _ensure_assignment(job, user["id"])
@@ -36,23 +41,33 @@ def create_work_plan(
         end_date=payload.end_date,
     )
     db.add(work_plan)
-    db.commit()
-    db.refresh(work_plan)
+    await db.commit()
+    await db.refresh(work_plan)
+    await publish(Event(job.agent_id, "work_plan", {
+        "id": work_plan.id, "job_id": job_id, "status": work_plan.status,
+    }))
     return work_plan
 
 
 @router.patch("/{job_id}", response_model=WorkPlanOut)
-def update_work_plan(
+async def update_work_plan(
     job_id: int,
     payload: WorkPlanUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user=Depends(require_contractor),
 ):
-    work_plan = db.query(WorkPlan).filter(WorkPlan.job_id == job_id).first()
+    # Locked so concurrent updates count a completion once.
+    work_plan = await db.scalar(
+        select(WorkPlan)
+        .where(WorkPlan.job_id == job_id)
+        .options(joinedload(WorkPlan.job))
+        .with_for_update(of=WorkPlan)
+    )
     if not work_plan:
         raise HTTPException(status_code=404, detail="Work plan not found")
 
     _ensure_assignment(work_plan.job, user["id"])
+    agent_id = work_plan.job.agent_id
 
     if payload.plan_description is not None:
         work_plan.plan_description = payload.plan_description
@@ -60,21 +75,33 @@ def update_work_plan(
         work_plan.start_date = payload.start_date
     if payload.end_date is not None:
         work_plan.end_date = payload.end_date
+    status_changed = payload.status is not None and payload.status != work_plan.status
     if payload.status is not None:
+        was_completed = work_plan.status == WorkPlanStatus.COMPLETED
+        if was_completed != (payload.status == WorkPlanStatus.COMPLETED):
+            await bump(db, ContractorStats, {
+                work_plan.contractor_id: {"completed_work_plans": -1 if was_completed else 1}
+            })
         work_plan.status = payload.status
 
-    db.commit()
-    db.refresh(work_plan)
+    await db.commit()
+    await db.refresh(work_plan)
+    if status_changed:
+        await publish(Event(agent_id, "work_plan", {
+            "id": work_plan.id, "job_id": job_id, "status": work_plan.status,
+        }))
     return work_plan
 
 
 @router.get("/{job_id}", response_model=WorkPlanOut)
-def get_work_plan(
+async def get_work_plan(
     job_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(require_contractor),
 ):
-    work_plan = db.query(WorkPlan).filter(WorkPlan.job_id == job_id).first()
+    work_plan = await db.scalar(
+        select(WorkPlan).where(WorkPlan.job_id == job_id).options(joinedload(WorkPlan.job))
+    )
     if not work_plan:
         raise HTTPException(status_code=404, detail="Work plan not found")
     _ensure_assignment(work_plan.job, user["id"])
@@ -82,15 +109,17 @@ def get_work_plan(
 
 
 @router.get("/agent-view/{job_id}", response_model=WorkPlanOut)
-def get_work_plan_as_agent(
+async def get_work_plan_as_agent(
     job_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(require_agent),
 ):
-    work_plan = db.query(WorkPlan).join(Job).filter(
-        WorkPlan.job_id == job_id,
-        Job.agent_id == user["id"],
-    ).first()
+    work_plan = await db.scalar(
+        select(WorkPlan).join(Job).where(
+            WorkPlan.job_id == job_id,
+            Job.agent_id == user["id"],
+        )
+    )
     if not work_plan:
         raise HTTPException(status_code=404, detail="Work plan not found")
     return work_plan
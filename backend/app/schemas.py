@@ -57,6 +57,29 @@ class JobOut(BaseModel):
     created_at: datetime
 
 
+class JobPage(BaseModel):
+    items: list[JobOut]
+    next_cursor: Optional[str] = None
+
+
+class JobRecommendation(JobOut):
+    # Cosine similarity of the job to the caller's skills, 0..1.
+    score: float
+
+
+class JobImportError(BaseModel):
+    row: int
+    detail: str
+
+
+class JobImportResult(BaseModel):
+    created: int
+    failed: int
+    # Ids of the created jobs, ascending.
+    ids: list[int]
+    errors: list[JobImportError]
+
+
 # --------------------
 # APPLICATIONS
 # --------------------
@@ -76,6 +99,23 @@ class ApplicationOut(BaseModel):
     created_at: datetime
 
 
+class ApplicationDecision(BaseModel):
+    application_id: int
+    status: ApplicationStatus
+
+
+class ApplicationBulkDecision(BaseModel):
+    decisions: list[ApplicationDecision] = Field(..., min_length=1, max_length=500)
+
+
+class ApplicationDecisionResult(BaseModel):
+    application_id: int
+    ok: bool
+    status: Optional[ApplicationStatus] = None
+    job_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
 # --------------------
 # WORK PLANS
 # --------------------
@@ -125,3 +165,56 @@ class InvoiceOut(BaseModel):
     amount: float
     status: InvoiceStatus
     created_at: datetime
+
+
+# --------------------
+# DASHBOARDS
+# --------------------
+class ContractorDashboardJob(JobOut):
+    work_plan: Optional[WorkPlanOut] = None
+    invoice: Optional[InvoiceOut] = None
+
+
+class AgentDashboardJob(ContractorDashboardJob):
+    applications: list[ApplicationOut] = []
+
+
+class AgentDashboardPage(BaseModel):
+    items: list[AgentDashboardJob]
+    next_cursor: Optional[str] = None
+
+
+class ContractorDashboardPage(BaseModel):
+    items: list[ContractorDashboardJob]
+    next_cursor: Optional[str] = None
+
+
+# --------------------
+# STATS
+# --------------------
+class AgentStatsOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    open_jobs: int = 0
+    assigned_jobs: int = 0
+    completed_jobs: int = 0
+    applications_received: int = 0
+
+
+class ContractorStatsOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    applications_submitted: int = 0
+    assigned_jobs: int = 0
+    completed_jobs: int = 0
+    completed_work_plans: int = 0
+    invoices_submitted: int = 0
+    invoiced_amount: float = 0
+    paid_amount: float = 0
+
+
+class JobStatsOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    job_id: int
+    applications: int = 0
@@ -0,0 +1,267 @@
+"""Admission control: per-caller rate limits and an in-flight cap.
+
+`AdmissionMiddleware` sorts each request into a route class:
+- "auth" for POST /auth/*;
+- "write" for the other POST, PUT, PATCH and DELETE requests;
+- "search" for GET /jobs/?search=...;
+- "read" for everything else.
+
+It charges one token from the caller's bucket for that class. The caller is
+the `id` of a valid bearer token, or else the client address. When the peer
+is one of ADMISSION_TRUSTED_PROXIES (by default the server's
+FORWARDED_ALLOW_IPS), that is the nearest untrusted X-Forwarded-For hop, so
+callers behind a load balancer do not share its bucket. Callers behind one
+NAT still do, which is why the anonymous "auth" budget allows a burst of
+logins from a shared address.
+An empty bucket answers 429 with Retry-After set to when the next token
+arrives.
+
+ADMISSION_LIMITS overrides the classes' "rate:burst" budgets (tokens per
+second, bucket size), e.g. "auth=0.5:5,read=100:200"; a rate of 0 turns a
+class's limit off. ADMISSION_BACKEND picks the bucket store: "local" (per
+process, the default) or "redis" (shared by all workers; needs the `redis`
+package and ADMISSION_URL).
+
+Separately, at most ADMISSION_MAX_IN_FLIGHT requests run at once in this
+worker. Beyond that it answers 503 with Retry-After at once, rather than
+queueing work that would only push every request's latency up. Event streams
+are long-lived, so they are rate-limited when they connect but not counted
+as in flight. /health and /metrics are never limited. ADMISSION_CONTROL=false
+turns the middleware off.
+"""
+import ipaddress
+import math
+import os
+import time
+from collections import OrderedDict, defaultdict
+
+import orjson
+from starlette.datastructures import Headers
+
+from app.utils.jwt import caller_id
+from app.utils.metrics import metric, register_collector
+
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "true").lower() in ("1", "true", "yes")
+ADMISSION_BACKEND = os.getenv("ADMISSION_BACKEND", "local").lower()
+ADMISSION_URL = os.getenv("ADMISSION_URL", os.getenv("CACHE_URL", "redis://localhost:6379/0"))
+MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "128"))
+# Callers whose buckets are remembered by the local store.
+MAX_KEYS = int(os.getenv("ADMISSION_MAX_KEYS", "100000"))
+
+DEFAULT_LIMITS = {
+    "auth": (5.0, 50),
+    "write": (5.0, 20),
+    "search": (5.0, 20),
+    "read": (50.0, 100),
+}
+# Addresses or networks, comma-separated, or "*" for any peer.
+TRUSTED_PROXIES = os.getenv("ADMISSION_TRUSTED_PROXIES", os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"))
+EXEMPT_PREFIXES = ("/health/", "/metrics")
+NOT_IN_FLIGHT = ("/events",)
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def parse_limits(spec: str) -> dict[str, tuple[float, int]]:
+    """DEFAULT_LIMITS with the "class=rate:burst,..." overrides in `spec`."""
+    limits = dict(DEFAULT_LIMITS)
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, budget = item.partition("=")
+        rate, _, burst = budget.partition(":")
+        if name not in limits:
+            raise ValueError(f"ADMISSION_LIMITS: unknown route class {name!r}")
+        limits[name] = (float(rate), int(burst or max(1, math.ceil(float(rate)))))
+    return limits
+
+
+LIMITS = parse_limits(os.getenv("ADMISSION_LIMITS", ""))
+
+
+def parse_networks(spec: str) -> list | None:
+    """The networks in a TRUSTED_PROXIES spec; None for "*"."""
+    items = [item.strip() for item in spec.split(",") if item.strip()]
+    if "*" in items:
+        return None
+    return [ipaddress.ip_network(item, strict=False) for item in items]
+
+
+_trusted_networks = parse_networks(TRUSTED_PROXIES)
+
+
+def _trusted(address: str) -> bool:
+    if _trusted_networks is None:
+        return True
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_networks)
+
+
+def client_address(scope) -> str:
+    """The peer address, or behind trusted proxies the client they forwarded for."""
+    peer = scope["client"][0] if scope.get("client") else "-"
+    forwarded = Headers(scope=scope).get("x-forwarded-for") if _trusted(peer) else None
+    if not forwarded:
+        return peer
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    # Proxies append, so the last hop a trusted proxy did not add is the client.
+    for hop in reversed(hops):
+        if not _trusted(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+class LocalBuckets:
+    """Token buckets in this process, least recently used evicted past `max_keys`.
+
+    Only the event loop thread touches them, so no lock is needed.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Take a token; return 0 if there was one, else seconds until there is."""
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - last) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+_TAKE_SCRIPT = """
+local rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = clock[1] + clock[2] / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = math.min(burst, (tonumber(bucket[1]) or burst) + math.max(0, now - (tonumber(bucket[2]) or now)) * rate)
+local wait = 0
+if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisBuckets:
+    """Token buckets shared by all workers, updated atomically by a Lua script."""
+
+    def __init__(self, client):
+        self.client = client
+        self._take = client.register_script(_TAKE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str):
+        from redis import asyncio as redis
+
+        return cls(redis.Redis.from_url(url))
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        return float(await self._take(keys=[f"admission:{key}"], args=[rate, burst]))
+
+
+def _make_store():
+    if ADMISSION_BACKEND == "redis":
+        return RedisBuckets.from_url(ADMISSION_URL)
+    return LocalBuckets(MAX_KEYS)
+
+
+store = _make_store()
+in_flight = 0
+admitted: dict[str, int] = defaultdict(int)
+rejected: dict[tuple[str, str], int] = defaultdict(int)
+
+
+def set_store(new_store):
+    """Swap the bucket store, e.g. for a fresh LocalBuckets in a benchmark."""
+    global store
+    store = new_store
+
+
+def route_class(method: str, path: str, query_string: bytes) -> str:
+    if method in WRITE_METHODS:
+        return "auth" if path.startswith("/auth/") else "write"
+    if path in ("/jobs", "/jobs/") and any(
+        param.startswith(b"search=") and len(param) > 7 for param in query_string.split(b"&")
+    ):
+        return "search"
+    return "read"
+
+
+async def _reject(send, status: int, detail: str, retry_after: float):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": orjson.dumps({"detail": detail})})
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying the limits above; see the module docstring."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global in_flight
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        name = route_class(scope["method"], scope["path"], scope["query_string"])
+        counted = not scope["path"].startswith(NOT_IN_FLIGHT)
+        # Checked first: when the worker is saturated, shedding must stay cheap.
+        if counted and MAX_IN_FLIGHT > 0 and in_flight >= MAX_IN_FLIGHT:
+            rejected[name, "busy"] += 1
+            await _reject(send, 503, "Server busy, please retry", 1)
+            return
+
+        # Held from here, so requests waiting on a shared store count too.
+        in_flight += counted
+        try:
+            rate, burst = LIMITS[name]
+            if rate > 0:
+                wait = await store.take(_caller_key(name, scope), rate, burst)
+                if wait > 0:
+                    rejected[name, "rate"] += 1
+                    await _reject(send, 429, "Too many requests, please retry", wait)
+                    return
+            admitted[name] += 1
+            await self.app(scope, receive, send)
+        finally:
+            in_flight -= counted
+
+
+def _caller_key(name: str, scope) -> str:
+    user_id = caller_id(Headers(scope=scope))
+    if user_id is not None:
+        return f"{name}:user:{user_id}"
+    return f"{name}:ip:{client_address(scope)}"
+
+
+@register_collector
+def _admission_metrics():
+    yield from metric("admission_in_flight", "gauge", "Requests running in this worker.",
+                      [(None, in_flight)])
+    yield from metric("admission_admitted_total", "counter", "Requests admitted, by route class.",
+                      (({"class": name}, count) for name, count in list(admitted.items())))
+    yield from metric("admission_rejected_total", "counter",
+                      "Requests shed: reason=rate (429) or busy (503).",
+                      (({"class": name, "reason": reason}, count)
+                       for (name, reason), count in list(rejected.items())))
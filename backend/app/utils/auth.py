@@ -1,19 +0,0 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.dependencies.db import get_db
-from app.models import User
-from app.utils.jwt import create_access_token
-
-router = APIRouter(prefix="/auth", tags=["Auth"])
-
-
-@router.post("/login")
-def login(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    token = create_access_token(
-        {"id": user.id, "role": user.role.value}
-    )
-    return {"access_token": token, "token_type": "bearer"}
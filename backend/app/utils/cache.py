@@ -0,0 +1,241 @@
+"""Read-through cache for the public job endpoints.
+
+Bodies are cached as serialized JSON together with their ETag. Every key
+embeds a generation number; `invalidate_jobs()` bumps it after a write that
+changes what GET /jobs/ or GET /jobs/{id} return, so all cached pages and
+jobs are dropped at once and a read that raced the write can only fill an
+entry under the old generation.
+
+Handlers reading through get_read_db may build entries from a lagging
+replica. Those entries expire after REPLICA_STICKY_SECONDS rather than
+CACHE_TTL, and a caller who just wrote skips the lookup and rebuilds the
+entry from the primary, so they never read a stale page that another user's
+replica read cached (see app/utils/replicas.py).
+
+CACHE_BACKEND selects the store: "local" (per-process LRU, the default),
+"redis" (shared by all workers, needs the `redis` package and CACHE_URL) or
+"none". A local generation is bumped only in the process that wrote, so the
+gunicorn profile defaults to "none" when it runs more than one worker.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+
+from app.utils.metrics import metric, register_collector
+from app.utils.serialization import dumps
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local").lower()
+CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+CACHE_SIZE = int(os.getenv("CACHE_SIZE", "10000"))
+CACHE_TTL = int(os.getenv("CACHE_TTL", "30"))
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+GENERATION_KEY = "jobs:generation"
+
+
+class LocalCache:
+    """Bounded in-process LRU with per-entry expiry.
+
+    Counters live outside the LRU so a generation is never evicted.
+    """
+
+    # Whether every worker sees the same entries.
+    shared = False
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        now = time.monotonic()
+        with self._lock:
+            if key in self._counters:
+                return str(self._counters[key]).encode()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    async def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCache:
+    """Store backed by a `redis.asyncio.Redis`-compatible client."""
+
+    shared = True
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str):
+        from redis import asyncio as redis
+
+        return cls(redis.Redis.from_url(url))
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        await self.client.set(key, value, ex=ttl)
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+    async def clear(self):
+        await self.client.flushdb()
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio client commands RedisCache uses."""
+
+    def __init__(self):
+        self.data: dict[str, tuple[float | None, bytes]] = {}
+
+    async def get(self, key):
+        entry = self.data.get(key)
+        if entry is None or (entry[0] is not None and entry[0] <= time.monotonic()):
+            self.data.pop(key, None)
+            return None
+        return entry[1]
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = (time.monotonic() + ex if ex else None, value)
+
+    async def incr(self, key):
+        value = int(await self.get(key) or 0) + 1
+        self.data[key] = (None, str(value).encode())
+        return value
+
+    async def flushdb(self):
+        self.data.clear()
+
+
+def _make_backend():
+    if CACHE_BACKEND == "none":
+        return None
+    if CACHE_BACKEND == "redis":
+        return RedisCache.from_url(CACHE_URL)
+    return LocalCache(CACHE_SIZE)
+
+
+backend = _make_backend()
+hits = 0
+misses = 0
+not_modified = 0
+
+
+def set_backend(new_backend):
+    """Swap the store, e.g. for `RedisCache(FakeRedis())` in tests."""
+    global backend
+    backend = new_backend
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha1(body, usedforsecurity=False).hexdigest() + '"'
+
+
+_ENTITY_TAG = re.compile(r'(?:W/)?"[^"]*"')
+
+
+def entity_tags(header: str) -> list[str]:
+    """The entity tags, W/ prefix included, in an If-None-Match or If-Match header."""
+    return _ENTITY_TAG.findall(header)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches `etag`.
+
+    The header is "*" or a comma-separated list of entity tags. Tags are
+    compared weakly, i.e. ignoring W/, so a tag the compression middleware
+    weakened still matches.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == opaque for tag in entity_tags(if_none_match))
+
+
+def _respond(request: Request, etag: str, body: bytes) -> Response:
+    global not_modified
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def request_key(request: Request) -> str:
+    """Cache key for a path plus its query parameters in canonical order."""
+    params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{params}"
+
+
+async def cached_json(request: Request, key: str, build: Callable[[], Awaitable[Any]]) -> Response:
+    """Serve `build()`'s JSON-able content through the cache, answering 304 on a matching ETag."""
+    global hits, misses
+    if backend is None:
+        body = dumps(await build())
+        return _respond(request, etag_for(body), body)
+
+    read_from = getattr(request.state, "read_from", "primary")
+    generation = int(await backend.get(GENERATION_KEY) or 0)
+    key = f"jobs:{generation}:{key}"
+    entry = await backend.get(key) if read_from != "sticky" else None
+    if entry is not None:
+        hits += 1
+        etag, body = entry.split(b" ", 1)
+        return _respond(request, etag.decode(), body)
+
+    misses += 1
+    body = dumps(await build())
+    etag = etag_for(body)
+    ttl = CACHE_TTL if read_from in ("primary", "sticky") else min(CACHE_TTL, max(REPLICA_STICKY_SECONDS, 1))
+    await backend.set(key, etag.encode() + b" " + body, ttl)
+    return _respond(request, etag, body)
+
+
+async def invalidate_jobs():
+    """Drop every cached job and job page; call after committing a job change."""
+    if backend is not None:
+        await backend.incr(GENERATION_KEY)
+
+
+@register_collector
+def _cache_metrics():
+    yield from metric("job_cache_hits_total", "counter", "Job reads served from the cache.",
+                      [(None, hits)])
+    yield from metric("job_cache_misses_total", "counter", "Job reads that queried the database.",
+                      [(None, misses)])
+    yield from metric("job_cache_not_modified_total", "counter",
+                      "Job reads answered 304 Not Modified.", [(None, not_modified)])
@@ -0,0 +1,192 @@
+"""Negotiated brotli/gzip compression of responses.
+
+`CompressionMiddleware` compresses a response when the client accepts br or
+gzip (br wins a tie), its Content-Type is textual (JSON, NDJSON, CSV, HTML,
+...) and its body is at least COMPRESS_MIN_BYTES. It handles two cases:
+- A complete body is compressed in one go. Past COMPRESS_OFFLOAD_BYTES that
+  runs on the threadpool, so a large dashboard page does not stall the event
+  loop.
+- A streamed body (the exports) is compressed chunk by chunk and flushed, so
+  rows still reach the client as they are produced.
+
+Event streams, and responses that already carry a Content-Encoding (the
+precompressed frontend files), pass through untouched. A strong ETag becomes
+weak, because the bytes differ but the content does not. If-None-Match
+revalidation keeps working.
+
+brotli is optional: without the package only gzip is offered.
+"""
+import os
+import zlib
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.utils.cache import entity_tags
+from app.utils.metrics import metric, register_collector
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_OFFLOAD_BYTES = int(os.getenv("COMPRESS_OFFLOAD_BYTES", str(256 * 1024)))
+# Per-request levels: fast settings that still beat gzip -9 on JSON.
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+
+OFFERED = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json", "application/x-ndjson", "application/javascript",
+    "application/xml", "image/svg+xml", "application/manifest+json",
+})
+
+compressed: dict[str, int] = {coding: 0 for coding in OFFERED}
+bytes_in = 0
+bytes_out = 0
+
+
+def negotiate(accept_encoding: str, offered=OFFERED) -> str | None:
+    """The first of `offered` with the highest q-value in `accept_encoding`, if any."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for coding in offered:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type.startswith("text/"):
+        return media_type != "text/event-stream"
+    return media_type in COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+
+def compress(coding: str, body: bytes) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return zlib.compress(body, GZIP_LEVEL, wbits=31)
+
+
+class _Encoder:
+    """Streaming compressor that flushes after every chunk."""
+
+    def __init__(self, coding: str):
+        self.coding = coding
+        if coding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        if self.coding == "br":
+            out = self._compressor.process(data)
+            return out + (self._compressor.finish() if final else self._compressor.flush())
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def _revalidated(headers: MutableHeaders, if_none_match: str):
+    """Give a 304 for a response sent compressed the same ETag and Vary as that response."""
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/") and "W/" + etag in entity_tags(if_none_match):
+        headers["etag"] = "W/" + etag
+        headers.add_vary_header("Accept-Encoding")
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing eligible responses; see the module docstring."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        coding = None
+        if scope["type"] == "http":
+            coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+        start = None
+        encoder: _Encoder | None = None
+        passthrough = False
+
+        async def send_compressed(message):
+            global bytes_in, bytes_out
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if encoder is None:
+                headers = MutableHeaders(raw=start["headers"])
+                if start["status"] == 304:
+                    _revalidated(headers, if_none_match)
+                if (start["status"] < 200 or start["status"] in (204, 304)
+                        or "content-encoding" in headers
+                        or "no-transform" in headers.get("cache-control", "")
+                        or not compressible(headers.get("content-type", ""))
+                        or (not more and len(body) < COMPRESS_MIN_BYTES)):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                headers["content-encoding"] = coding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["etag"] = "W/" + etag
+                compressed[coding] += 1
+                if not more:
+                    if len(body) >= COMPRESS_OFFLOAD_BYTES:
+                        data = await run_in_threadpool(compress, coding, body)
+                    else:
+                        data = compress(coding, body)
+                    headers["content-length"] = str(len(data))
+                    bytes_in += len(body)
+                    bytes_out += len(data)
+                    await send(start)
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                if "content-length" in headers:
+                    del headers["content-length"]
+                encoder = _Encoder(coding)
+                await send(start)
+
+            data = encoder.encode(body, final=not more)
+            bytes_in += len(body)
+            bytes_out += len(data)
+            await send({"type": "http.response.body", "body": data, "more_body": more})
+
+        await self.app(scope, receive, send_compressed)
+
+
+@register_collector
+def _compression_metrics():
+    yield from metric("http_compressed_responses_total", "counter", "Responses compressed, by encoding.",
+                      (({"encoding": coding}, count) for coding, count in compressed.items()))
+    yield from metric("http_compression_bytes_in_total", "counter",
+                      "Response bytes before compression.", [(None, bytes_in)])
+    yield from metric("http_compression_bytes_out_total", "counter",
+                      "Response bytes after compression.", [(None, bytes_out)])
@@ -0,0 +1,262 @@
+"""Status-change events pushed to the users they affect.
+
+Routers call `publish()` after committing a transition; GET /events streams
+each subscriber's events as server-sent events. Subscribers are per-process
+asyncio queues, so an idle stream costs one parked coroutine and no
+database work.
+
+EVENTS_BACKEND selects how events reach the subscribers: "local" (the
+default) delivers them inside the publishing process only, which is enough
+for a single worker; "postgres" sends them through NOTIFY on EVENTS_CHANNEL
+and every worker LISTENs, so a user connected to any worker receives them.
+It needs `asyncpg` and a PostgreSQL DATABASE_URL.
+
+Publishing is best effort: the change is committed by then, so a failure is
+logged and counted rather than turned into an error response. A lost
+PostgreSQL connection is reopened; after the listener reconnects, open
+streams are closed so their clients reconnect and reload what they missed.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, NamedTuple
+
+import orjson
+
+from app.utils.metrics import metric, register_collector
+from app.utils.serialization import dumps
+
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "local").lower()
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "job_events")
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+
+# NOTIFY payloads must stay below 8000 bytes.
+_NOTIFY_LIMIT = 7000
+# Backoff between attempts to reopen a lost LISTEN connection.
+_RECONNECT_DELAYS = (0.5, 1, 2, 5, 10, 30)
+
+logger = logging.getLogger(__name__)
+
+
+class Event(NamedTuple):
+    user_id: int
+    type: str
+    data: dict[str, Any]
+
+
+class Subscription:
+    """One open stream. `overflowed` is set when events were dropped because
+    the client fell behind; the stream then tells it to reload."""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[Event | None] = asyncio.Queue(EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+        self.closed = False
+
+    def close(self):
+        """End the stream; the client reconnects, e.g. to another worker."""
+        self.closed = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+
+class LocalBus:
+    """Deliver published events to this process's subscribers."""
+
+    def __init__(self):
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self.published = 0
+        self.dropped = 0
+        self.failed = 0
+        self.reconnects = 0
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+
+    def close_streams(self):
+        for subscribers in list(self._subscribers.values()):
+            for subscription in list(subscribers):
+                subscription.close()
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def deliver(self, events):
+        for event in events:
+            for subscription in self._subscribers.get(event.user_id, ()):
+                try:
+                    subscription.queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    subscription.overflowed = True
+                    self.dropped += 1
+
+    async def publish(self, events: list[Event]):
+        self.published += len(events)
+        self.deliver(events)
+
+
+class PostgresBus(LocalBus):
+    """Fan events out to every worker through PostgreSQL LISTEN/NOTIFY.
+
+    The publishing worker hears its own notifications too, so `publish`
+    does not deliver locally. Either connection is reopened when it is lost:
+    the publisher on the next publish, the listener in the background.
+    """
+
+    def __init__(self, dsn: str, channel: str):
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self._listener = None
+        self._publisher = None
+        self._publish_lock = asyncio.Lock()
+        self._relisten_task = None
+        self._stopping = False
+
+    async def _connect(self):
+        import asyncpg
+
+        return await asyncpg.connect(self.dsn)
+
+    async def _listen(self):
+        listener = await self._connect()
+        await listener.add_listener(self.channel, self._on_notify)
+        listener.add_termination_listener(self._on_listener_lost)
+        self._listener = listener
+
+    async def start(self):
+        self._stopping = False
+        await self._listen()
+        self._publisher = await self._connect()
+
+    async def stop(self):
+        self._stopping = True
+        if self._relisten_task is not None:
+            self._relisten_task.cancel()
+            self._relisten_task = None
+        for connection in (self._listener, self._publisher):
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        self._listener = self._publisher = None
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.deliver(Event(*item) for item in orjson.loads(payload))
+
+    def _on_listener_lost(self, connection):
+        if self._stopping or connection is not self._listener:
+            return
+        logger.warning("events listener connection lost; reconnecting")
+        self._listener = None
+        self._relisten_task = asyncio.get_running_loop().create_task(self._relisten())
+
+    async def _relisten(self):
+        attempt = 0
+        while not self._stopping:
+            try:
+                await self._listen()
+            except Exception as exc:
+                delay = _RECONNECT_DELAYS[min(attempt, len(_RECONNECT_DELAYS) - 1)]
+                logger.warning("events listener reconnect failed (%s); retrying in %gs", exc, delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self.reconnects += 1
+            self._relisten_task = None
+            # Notifications sent while nobody listened are gone; make the
+            # clients reconnect and reload instead of silently missing them.
+            self.close_streams()
+            return
+
+    async def publish(self, events: list[Event]):
+        self.published += len(events)
+        async with self._publish_lock:
+            if self._publisher is None or self._publisher.is_closed():
+                self._publisher = await self._connect()
+            try:
+                for payload in _payloads(events):
+                    await self._publisher.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+            except Exception:
+                # Drop the connection; the next publish opens a fresh one.
+                publisher, self._publisher = self._publisher, None
+                publisher.terminate()
+                raise
+
+
+def _payloads(events: list[Event]):
+    """Encode events as JSON arrays that each fit in one NOTIFY."""
+    batch, size = [], 2
+    for event in events:
+        encoded = dumps(list(event))
+        if batch and size + len(encoded) + 1 > _NOTIFY_LIMIT:
+            yield (b"[" + b",".join(batch) + b"]").decode()
+            batch, size = [], 2
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        yield (b"[" + b",".join(batch) + b"]").decode()
+
+
+def _make_bus():
+    if EVENTS_BACKEND == "postgres":
+        from sqlalchemy.engine import make_url
+
+        url = make_url(os.getenv("DATABASE_URL"))
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        return PostgresBus(dsn, EVENTS_CHANNEL)
+    return LocalBus()
+
+
+bus = _make_bus()
+
+
+def set_bus(new_bus):
+    """Swap the bus, e.g. for a fresh `LocalBus()` in tests."""
+    global bus
+    bus = new_bus
+
+
+async def publish(*events: Event):
+    """Push `events` to their users; call after committing the change they describe.
+
+    Never raises: the change is already committed, and retrying the request
+    would repeat it, so a failed publish is only logged and counted.
+    """
+    if not events:
+        return
+    try:
+        await bus.publish(list(events))
+    except Exception:
+        bus.failed += len(events)
+        logger.exception("publishing %d status events failed", len(events))
+
+
+@register_collector
+def _event_metrics():
+    yield from metric("events_published_total", "counter", "Status-change events published.",
+                      [(None, bus.published)])
+    yield from metric("events_dropped_total", "counter",
+                      "Events dropped because a subscriber fell behind.", [(None, bus.dropped)])
+    yield from metric("events_publish_failures_total", "counter",
+                      "Events lost because publishing them failed.", [(None, bus.failed)])
+    yield from metric("events_listener_reconnects_total", "counter",
+                      "Times the LISTEN connection was lost and reopened.", [(None, bus.reconnects)])
+    yield from metric("events_subscribers", "gauge", "Open event streams in this process.",
+                      [(None, bus.subscriber_count())])
@@ -0,0 +1,236 @@
+"""Per-request latency, SQL and serialization metrics and a slow-query log.
+
+`InstrumentationMiddleware` times every HTTP request and labels it with the
+route template it matched, so /jobs/1 and /jobs/2 share one series. While
+the request runs, a `RequestStats` in a context variable collects the SQL
+statements the serving engines execute (count and time, from the
+before/after_cursor_execute events) and the time spent serializing the
+response. Routes built with `InstrumentedRoute` count everything between the
+endpoint returning and its Response existing, which covers response_model
+validation and rendering by any response class; `dumps()` adds what the
+endpoint encodes itself, such as an ORJSONResponse it builds or SSE events it
+streams. The threadpool and the async drivers both run statements in a copy of
+the request's context, so this works with and without DB_ASYNC. The totals
+feed histograms served at GET /metrics.
+
+Statements slower than SLOW_QUERY_MS are logged to the "app.slow_query"
+logger with the route and the SQL text; parameter values are never logged.
+SERVER_TIMING=true also adds a Server-Timing header with each response's
+statement count and SQL time, which browser dev tools display per request.
+"""
+import functools
+import inspect
+import logging
+import os
+import time
+from contextvars import ContextVar
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from app.database import async_engine, engine, replica_engines
+from app.utils.metrics import Histogram, metric, register_collector
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+slow_query_log = logging.getLogger("app.slow_query")
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time from receiving a request to sending the last byte.",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+request_statements = Histogram(
+    "http_request_sql_statements", "SQL statements executed per request.",
+    ("method", "route"), STATEMENT_BUCKETS,
+)
+request_sql_time = Histogram(
+    "http_request_sql_seconds", "Time per request spent executing SQL.",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+request_serialize_time = Histogram(
+    "http_request_serialize_seconds", "Time per request spent validating and encoding the response.",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+statement_duration = Histogram(
+    "db_statement_duration_seconds", "Execution time of single SQL statements.",
+    (), LATENCY_BUCKETS,
+)
+slow_statements = 0
+
+
+class RequestStats:
+    __slots__ = ("scope", "statements", "sql_seconds", "serialize_seconds", "returned_at")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements = 0
+        self.sql_seconds = 0.0
+        self.serialize_seconds = 0.0
+        # When the endpoint returned, while FastAPI is still building its Response.
+        self.returned_at = None
+
+    @property
+    def method(self) -> str:
+        return self.scope["method"]
+
+    @property
+    def route(self) -> str:
+        # Set by the router once a route matched; the template, not the path.
+        return getattr(self.scope.get("route"), "path", None) or "<unmatched>"
+
+    def server_timing(self) -> bytes:
+        return (
+            f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.statements} statements", '
+            f"json;dur={self.serialize_seconds * 1000:.1f}"
+        ).encode()
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def record_serialization(seconds: float):
+    stats = _current.get()
+    # After the endpoint returned, InstrumentedRoute already times the rendering.
+    if stats is not None and stats.returned_at is None:
+        stats.serialize_seconds += seconds
+
+
+def _mark_return():
+    stats = _current.get()
+    if stats is not None:
+        stats.returned_at = time.perf_counter()
+
+
+def _marking_return(endpoint):
+    if inspect.isasyncgenfunction(endpoint) or inspect.isgeneratorfunction(endpoint):
+        return endpoint
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def marked(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            _mark_return()
+            return result
+    else:
+        @functools.wraps(endpoint)
+        def marked(*args, **kwargs):
+            result = endpoint(*args, **kwargs)
+            _mark_return()
+            return result
+    return marked
+
+
+class InstrumentedRoute(APIRoute):
+    """APIRoute that records the time FastAPI spends serializing the response.
+
+    Use it as the `route_class` of every APIRouter, so endpoints returning
+    models or dicts through `response_model` are timed as well as the ones
+    that build an ORJSONResponse themselves.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, _marking_return(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            stats = _current.get()
+            if stats is not None and stats.returned_at is not None:
+                stats.serialize_seconds += time.perf_counter() - stats.returned_at
+                stats.returned_at = None
+            return response
+
+        return timed_handler
+
+
+# --------------------
+# SQL
+# --------------------
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    context._instrumentation_start = time.perf_counter()
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    global slow_statements
+    elapsed = time.perf_counter() - context._instrumentation_start
+    statement_duration.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.sql_seconds += elapsed
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        slow_statements += 1
+        where = f"{stats.method} {stats.route}" if stats is not None else "outside a request"
+        slow_query_log.warning(
+            "slow query %.1f ms (%s): %s [parameters redacted]",
+            elapsed * 1000, where, " ".join(statement.split())[:2000],
+        )
+
+
+def instrument_engine(sync_engine):
+    event.listen(sync_engine, "before_cursor_execute", _before_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_execute)
+
+
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+for replica in replica_engines:
+    instrument_engine(replica.serving_engine)
+
+
+# --------------------
+# MIDDLEWARE
+# --------------------
+class InstrumentationMiddleware:
+    """ASGI middleware recording the metrics above for every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    message["headers"] = [
+                        *message.get("headers", ()), (b"server-timing", stats.server_timing())
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current.reset(token)
+            method, route = stats.method, stats.route
+            request_duration.observe(time.perf_counter() - start, method, route, str(status))
+            request_statements.observe(stats.statements, method, route)
+            request_sql_time.observe(stats.sql_seconds, method, route)
+            request_serialize_time.observe(stats.serialize_seconds, method, route)
+
+
+@register_collector
+def _request_metrics():
+    yield from request_duration.collect()
+    yield from request_statements.collect()
+    yield from request_sql_time.collect()
+    yield from request_serialize_time.collect()
+    yield from statement_duration.collect()
+    yield from metric("db_slow_statements_total", "counter",
+                      f"Statements slower than SLOW_QUERY_MS ({SLOW_QUERY_MS:g} ms).",
+                      [(None, slow_statements)])
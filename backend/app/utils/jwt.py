@@ -1,10 +1,83 @@
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
+from collections import OrderedDict
+from dotenv import load_dotenv
+from app.utils.metrics import metric, register_collector
+import hashlib
+import os
+import threading
+import time
 
-SECRET_KEY = "dev-secret-key"   # move to env later
+load_dotenv()
+
+SECRET_KEY = os.getenv("SECRET_KEY") or "dev-secret-key"
 ALGORITHM = "HS256"
 TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
 
+# Decoded tokens are reused for at most JWT_CACHE_TTL seconds and never past `exp`.
+TOKEN_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = float(os.getenv("JWT_CACHE_TTL", "300"))
+
+
+class TokenCache:
+    """Bounded LRU of verified token payloads keyed by SHA-256 of key and token.
+
+    The signing key is part of the digest, so entries verified under a
+    previous key can never be served after rotation.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: bytes):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, digest: bytes, payload: dict):
+        expires_at = time.time() + self.ttl
+        if "exp" in payload:
+            expires_at = min(expires_at, float(payload["exp"]))
+        with self._lock:
+            self._entries[digest] = (expires_at, dict(payload))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL)
+
+
+def set_secret_key(key: str):
+    """Rotate the signing key; tokens signed with the old key stop validating."""
+    global SECRET_KEY
+    SECRET_KEY = key
+    token_cache.clear()
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(f"{SECRET_KEY}\0{token}".encode("utf-8")).digest()
+
 
 def create_access_token(data: dict):
     payload = data.copy()
@@ -13,7 +86,44 @@ def create_access_token(data: dict):
 
 
 def decode_access_token(token: str):
+    if TOKEN_CACHE_SIZE <= 0:
+        return _decode(token)
+
+    digest = _token_digest(token)
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return payload
+
+    payload = _decode(token)
+    if payload is not None:
+        token_cache.put(digest, payload)
+    return payload
+
+
+def caller_id(headers) -> int | None:
+    """The user id of a valid bearer token in request `headers`, if any.
+
+    For middleware, which runs before get_current_user.
+    """
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_access_token(token)
+    return payload.get("id") if payload else None
+
+
+def _decode(token: str):
     try:
         return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
+
+
+@register_collector
+def _token_cache_metrics():
+    yield from metric("jwt_cache_hits_total", "counter", "Tokens served from the decode cache.",
+                      [(None, token_cache.hits)])
+    yield from metric("jwt_cache_misses_total", "counter", "Tokens decoded and verified.",
+                      [(None, token_cache.misses)])
+    yield from metric("jwt_cache_entries", "gauge", "Tokens currently cached.",
+                      [(None, len(token_cache))])
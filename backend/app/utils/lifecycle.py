@@ -0,0 +1,154 @@
+"""Worker warm-up, readiness and graceful drain.
+
+The lifespan hook calls `warm_up()` before the worker accepts traffic. It
+opens WARMUP_CONNECTIONS pooled database connections and sends a GET for
+each of WARMUP_PATHS through the app in-process. That fills the response cache and
+SQLAlchemy's statement cache for the hottest pages, so the first real
+requests do not pay for them. It then calls `install_drain()`.
+
+On the first SIGTERM or SIGINT the worker starts draining:
+- GET /health/ready answers 503, so load balancers stop sending it traffic;
+- open event streams are closed, and their clients reconnect elsewhere.
+
+After DRAIN_DELAY_SECONDS the server's own handler runs. The server stops
+accepting connections, finishes in-flight requests and runs the lifespan
+shutdown. A second signal skips the delay.
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import threading
+import time
+
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from app.database import POOL_SIZE, async_engine, engine
+from app.utils import events
+
+DRAIN_DELAY = float(os.getenv("DRAIN_DELAY_SECONDS", "0"))
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", str(POOL_SIZE)))
+WARMUP_PATHS = [path for path in os.getenv("WARMUP_PATHS", "/jobs/").split(",") if path]
+READY_TIMEOUT = float(os.getenv("READY_TIMEOUT", "2"))
+
+logger = logging.getLogger(__name__)
+
+
+class State:
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        # The server's own signal handler has run.
+        self.stopping = False
+
+
+state = State()
+
+
+async def ping():
+    """Run SELECT 1 on the engine that serves requests."""
+    if async_engine is not None:
+        async with async_engine.connect() as conn:
+            await conn.execute(select(1))
+    else:
+        await run_in_threadpool(_ping_sync, 1)
+
+
+def _ping_sync(connections: int):
+    # Hold them all at once, so the pool opens that many.
+    with contextlib.ExitStack() as stack:
+        for _ in range(connections):
+            stack.enter_context(engine.connect()).execute(select(1))
+
+
+async def _open_connections(connections: int):
+    if async_engine is None:
+        await run_in_threadpool(_ping_sync, connections)
+        return
+    async with contextlib.AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(async_engine.connect())
+            await conn.execute(select(1))
+
+
+async def _get(app, target: str) -> int:
+    """Send GET `target` through the app in-process; return the status."""
+    path, _, query = target.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "root_path": "", "headers": [(b"host", b"warmup")], "client": ("127.0.0.1", 0),
+        "server": ("warmup", 80), "app": app, "state": {},
+    }
+    status = 0
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def warm_up(app):
+    start = time.perf_counter()
+    try:
+        await _open_connections(WARMUP_CONNECTIONS)
+    except Exception:
+        # Serve anyway; /health/ready reports the database until it recovers.
+        logger.exception("could not open database connections during warm-up")
+    for path in WARMUP_PATHS:
+        try:
+            status = await _get(app, path)
+        except Exception:
+            logger.exception("warm-up GET %s failed", path)
+            continue
+        if status >= 400:
+            logger.warning("warm-up GET %s answered %s", path, status)
+    logger.info("worker warmed up in %.0f ms", (time.perf_counter() - start) * 1000)
+
+
+def install_drain():
+    """Wrap the server's SIGTERM and SIGINT handlers; see the module docstring."""
+    if threading.current_thread() is not threading.main_thread():
+        # Signal handlers can only be set from the main thread (not e.g. under TestClient).
+        return
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        previous = signal.getsignal(signum)
+        if not callable(previous):
+            continue
+
+        def handler(signum, frame, previous=previous):
+            if not state.draining:
+                state.draining = True
+                loop.call_soon_threadsafe(_drain, loop, previous, signum, frame)
+            else:
+                # A second signal stops now; a third is the server's forced exit.
+                _stop(previous, signum, frame, force=True)
+
+        signal.signal(signum, handler)
+
+
+def _drain(loop, previous, signum, frame):
+    logger.info("draining for %.1f s before shutdown", DRAIN_DELAY)
+    events.bus.close_streams()
+    loop.call_later(DRAIN_DELAY, _stop, previous, signum, frame)
+
+
+def _stop(previous, signum, frame, force: bool = False):
+    if state.stopping and not force:
+        return
+    state.stopping = True
+    previous(signum, frame)
@@ -0,0 +1,84 @@
+"""Prometheus text exposition for in-process metrics served at GET /metrics."""
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_collectors: list[Callable[[], Iterable[str]]] = []
+
+
+def register_collector(collector: Callable[[], Iterable[str]]):
+    """Register a callable yielding exposition lines; usable as a decorator."""
+    _collectors.append(collector)
+    return collector
+
+
+def metric(name: str, kind: str, help_text: str, samples) -> list[str]:
+    """Format one metric family. `samples` is an iterable of (labels, value)."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{format_labels(labels)} {value}")
+    return lines
+
+
+def format_labels(labels: dict | None) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per tuple of label values.
+
+    `observe` is thread-safe. Register `collect` to export it.
+    """
+
+    def __init__(self, name: str, help_text: str, label_names=(), buckets=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # One count per bucket plus +Inf, then the sum.
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            snapshot = [(labels, list(series)) for labels, series in self._series.items()]
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        bounds = [_format_bound(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, series in snapshot:
+            base = dict(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels({**base, 'le': bound})} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(base)} {round(series[-1], 6)}")
+            lines.append(f"{self.name}_count{format_labels(base)} {cumulative}")
+        return lines
+
+
+def _format_bound(bound: float) -> str:
+    return str(int(bound)) if float(bound).is_integer() else repr(float(bound))
+
+
+def render() -> str:
+    lines = []
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,232 @@
+"""Transactional outbox for the side effects of state transitions.
+
+Routers call `enqueue()` before committing a transition, so the message is
+stored if and only if the transition is. `python -m app.worker` processes
+pending messages in batches, in three steps:
+
+1. Claim: lock due messages with FOR UPDATE SKIP LOCKED (several workers
+   never claim the same message), lease them by pushing `available_at`
+   past the work ahead, and commit.
+2. Run the external effects (the webhook) with no transaction open and no
+   connection checked out.
+3. Record: in one short transaction, run the database effects (the audit
+   record) for each message whose external effects succeeded, each inside
+   a savepoint, and mark it processed.
+
+A failed message is retried with exponential backoff and given up on after
+OUTBOX_MAX_ATTEMPTS, which leaves it in the table with `failed_at` set. If a
+worker dies mid-batch, its messages are claimed again once the lease runs
+out.
+
+Delivery is at least once. Effects deduplicate by the message's
+idempotency key: the audit record has a unique key and the webhook sends it
+as the Idempotency-Key header.
+"""
+import json
+import os
+import urllib.request
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, NamedTuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import AuditRecord, OutboxMessage
+
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "2"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "600"))
+OUTBOX_RETENTION_DAYS = float(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+OUTBOX_WEBHOOK_URL = os.getenv("OUTBOX_WEBHOOK_URL")
+OUTBOX_WEBHOOK_TIMEOUT = float(os.getenv("OUTBOX_WEBHOOK_TIMEOUT", "5"))
+# A claim lasts this long plus OUTBOX_WEBHOOK_TIMEOUT per claimed message.
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "60"))
+
+pending = OutboxMessage.processed_at.is_(None) & OutboxMessage.failed_at.is_(None)
+
+
+def enqueue(db: AsyncSession, kind: str, payload: dict, key: str | None = None):
+    """Add a message to the caller's transaction.
+
+    Pass a `key` derived from the transition when the same transition could
+    be enqueued twice; the unique constraint then rejects the duplicate.
+    """
+    db.add(OutboxMessage(
+        idempotency_key=key or f"{kind}:{uuid.uuid4().hex}",
+        kind=kind,
+        payload=payload,
+    ))
+
+
+# --------------------
+# EFFECTS
+# --------------------
+class Claimed(NamedTuple):
+    """A claimed message's fields, usable after the claiming transaction ends."""
+    id: int
+    idempotency_key: str
+    kind: str
+    payload: dict
+    created_at: datetime
+    attempts: int
+
+
+_effects: list[Callable[[Session, OutboxMessage], None]] = []
+_external_effects: list[Callable[[Claimed], None]] = []
+
+
+def effect(fn: Callable[[Session, OutboxMessage], None]):
+    """Register `fn(session, message)` to run in the recording transaction; usable as a decorator."""
+    _effects.append(fn)
+    return fn
+
+
+def external_effect(fn: Callable[[Claimed], None]):
+    """Register `fn(message)` to run outside any transaction, e.g. a network call."""
+    _external_effects.append(fn)
+    return fn
+
+
+@effect
+def record_audit(session: Session, message: OutboxMessage):
+    session.add(AuditRecord(
+        idempotency_key=message.idempotency_key,
+        kind=message.kind,
+        actor_id=message.payload.get("actor_id"),
+        payload=message.payload,
+        occurred_at=message.created_at,
+    ))
+    session.flush()
+
+
+@external_effect
+def post_webhook(message: Claimed):
+    if not OUTBOX_WEBHOOK_URL:
+        return
+    body = json.dumps({
+        "kind": message.kind,
+        "payload": message.payload,
+        "occurred_at": message.created_at.isoformat(),
+    }).encode()
+    request = urllib.request.Request(
+        OUTBOX_WEBHOOK_URL,
+        data=body,
+        headers={"Content-Type": "application/json", "Idempotency-Key": message.idempotency_key},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=OUTBOX_WEBHOOK_TIMEOUT):
+        pass
+
+
+# --------------------
+# PROCESSING
+# --------------------
+class WorkerStats:
+    def __init__(self):
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+        self.batches = 0
+
+
+worker_stats = WorkerStats()
+
+
+def backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(OUTBOX_BACKOFF_BASE ** attempts, OUTBOX_BACKOFF_MAX))
+
+
+def _error(exc: Exception) -> str:
+    return f"{type(exc).__name__}: {exc}"[:2000]
+
+
+def claim(session: Session, batch_size: int) -> list[Claimed]:
+    """Lease up to `batch_size` due messages to this worker and commit."""
+    now = datetime.utcnow()
+    messages = session.scalars(
+        select(OutboxMessage)
+        .where(pending, OutboxMessage.available_at <= now)
+        .order_by(OutboxMessage.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    lease = timedelta(seconds=OUTBOX_LEASE_SECONDS + OUTBOX_WEBHOOK_TIMEOUT * len(messages))
+    claimed = []
+    for message in messages:
+        message.attempts += 1
+        message.available_at = now + lease
+        claimed.append(Claimed(message.id, message.idempotency_key, message.kind,
+                               message.payload, message.created_at, message.attempts))
+    session.commit()
+    return claimed
+
+
+def process_batch(session: Session, batch_size: int) -> int:
+    """Claim and process up to `batch_size` due messages; return how many were claimed."""
+    claimed = claim(session, batch_size)
+    if not claimed:
+        return 0
+
+    errors: dict[int, str] = {}
+    for message in claimed:
+        try:
+            for run in _external_effects:
+                run(message)
+        except Exception as exc:
+            errors[message.id] = _error(exc)
+
+    now = datetime.utcnow()
+    attempts = {message.id: message.attempts for message in claimed}
+    messages = session.scalars(
+        select(OutboxMessage).where(OutboxMessage.id.in_(attempts)).with_for_update()
+    ).all()
+    for message in messages:
+        # Claimed again by another worker after our lease ran out: theirs now.
+        if message.attempts != attempts[message.id] or message.processed_at is not None:
+            continue
+        error = errors.get(message.id)
+        if error is None:
+            try:
+                with session.begin_nested():
+                    for run in _effects:
+                        run(session, message)
+            except Exception as exc:
+                error = _error(exc)
+        if error is not None:
+            message.last_error = error
+            if message.attempts >= OUTBOX_MAX_ATTEMPTS:
+                message.failed_at = now
+                worker_stats.failed += 1
+            else:
+                message.available_at = now + backoff(message.attempts)
+                worker_stats.retried += 1
+        else:
+            message.processed_at = now
+            worker_stats.processed += 1
+    session.commit()
+    worker_stats.batches += 1
+    return len(claimed)
+
+
+def purge_processed(session: Session) -> int:
+    """Delete messages processed more than OUTBOX_RETENTION_DAYS ago."""
+    cutoff = datetime.utcnow() - timedelta(days=OUTBOX_RETENTION_DAYS)
+    deleted = session.execute(delete(OutboxMessage).where(OutboxMessage.processed_at < cutoff))
+    session.commit()
+    return deleted.rowcount
+
+
+def queue_state(conn) -> tuple[int, float, int]:
+    """(pending messages, seconds the oldest has waited, messages given up on)."""
+    waiting = OutboxMessage.failed_at.is_(None)
+    count, oldest, failed = conn.execute(
+        select(
+            func.count().filter(waiting),
+            func.min(OutboxMessage.created_at).filter(waiting),
+            func.count(OutboxMessage.failed_at),
+        ).where(OutboxMessage.processed_at.is_(None))
+    ).one()
+    lag = (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0
+    return count, lag, failed
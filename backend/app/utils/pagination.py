@@ -0,0 +1,60 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values: dict) -> str:
+    """Pack keyset values into an opaque, URL-safe cursor string."""
+    raw = json.dumps(values, separators=(",", ":"), default=_encode_value)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in cursor")
+
+
+def created_keyset(model, cursor: str | None):
+    """Filter clause for rows after `cursor` in (created_at DESC, id DESC) order."""
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        created_at = datetime.fromisoformat(values["c"])
+        last_id = int(values["i"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return or_(
+        model.created_at < created_at,
+        and_(model.created_at == created_at, model.id < last_id),
+    )
+
+
+def created_cursor(row) -> str:
+    return encode_cursor({"c": row.created_at, "i": row.id})
+
+
+def paginate(rows: list, limit: int, make_cursor) -> tuple[list, str | None]:
+    """Split a `limit + 1` fetch into the page and the cursor for the next one."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, make_cursor(page[-1])
@@ -0,0 +1,289 @@
+"""Content-based job recommendations for contractors.
+
+Each open job is a row of a SciPy sparse matrix of hashed term features
+(sublinear term frequency; title terms count twice). A contractor's skills
+and education are hashed the same way, and jobs are ranked by TF-IDF cosine
+similarity. IDF weights come from the document frequencies at query time,
+so opening or closing a job never needs a rebuild: new rows collect in a
+small pending block that is scored alongside the matrix and merged into it
+once it grows, and removed rows are masked until the next merge.
+
+This worker keeps the index current through the mapper events below, and
+through `track()`/`discard()` where jobs are written with Core statements.
+`refresh()` reconciles it with the ids and versions of OPEN jobs in the
+database, which picks up changes other workers made. `start()` runs it as a
+worker starts and then every RECOMMEND_REFRESH_SECONDS; `stop()` saves a
+snapshot to RECOMMEND_INDEX_PATH, so the next worker loads the snapshot and
+only re-reads the jobs that changed since.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import defaultdict
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import event, select
+from starlette.concurrency import run_in_threadpool
+
+from app.models import Job, JobStatus
+from app.utils.metrics import metric, register_collector
+from app.utils.search import tokenize
+
+FEATURES = int(os.getenv("RECOMMEND_FEATURES", str(2 ** 18)))
+INDEX_PATH = os.getenv("RECOMMEND_INDEX_PATH", "recommend_index.npz")
+REFRESH_SECONDS = float(os.getenv("RECOMMEND_REFRESH_SECONDS", "60"))
+# Pending rows are merged into the matrix once there are this many.
+MERGE_PENDING = 1024
+# Bumped whenever the snapshot layout or the feature hashing changes.
+SNAPSHOT_FORMAT = 1
+_FETCH_CHUNK = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def vectorize(*weighted_texts: tuple[str | None, float]) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted feature indices and sublinear TF weights of the given texts."""
+    counts: dict[int, float] = defaultdict(float)
+    for text, weight in weighted_texts:
+        for term in tokenize(text):
+            counts[zlib.crc32(term.encode()) % FEATURES] += weight
+    indices = np.fromiter(counts.keys(), np.int32, len(counts))
+    values = 1 + np.log(np.fromiter(counts.values(), np.float32, len(counts)))
+    order = np.argsort(indices)
+    return indices[order], values[order]
+
+
+def job_features(title: str | None, description: str | None) -> tuple[np.ndarray, np.ndarray]:
+    return vectorize((title, 2.0), (description, 1.0))
+
+
+def _pending_matrix(rows) -> sparse.csr_matrix:
+    indptr = np.zeros(len(rows) + 1, np.int64)
+    np.cumsum([len(indices) for _, _, indices, _ in rows], out=indptr[1:])
+    return sparse.csr_matrix((
+        np.concatenate([values for _, _, _, values in rows]) if rows else np.zeros(0, np.float32),
+        np.concatenate([indices for _, _, indices, _ in rows]) if rows else np.zeros(0, np.int32),
+        indptr,
+    ), shape=(len(rows), FEATURES), dtype=np.float32)
+
+
+def _database_key(bind) -> str:
+    return hashlib.sha256(bind.url.render_as_string(hide_password=True).encode()).hexdigest()
+
+
+class JobRecommender:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Serializes refresh() calls; queries keep running meanwhile.
+        self._refresh_lock = threading.Lock()
+        self._reset(sparse.csr_matrix((0, FEATURES), dtype=np.float32),
+                    np.zeros(0, np.int64), np.zeros(0, np.int64))
+        self.loaded = False
+        self.refreshed_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def _reset(self, matrix: sparse.csr_matrix, ids: np.ndarray, versions: np.ndarray):
+        self._matrix = matrix
+        self._squared = matrix.power(2)
+        self._ids = ids
+        self._versions = versions
+        self._alive = np.ones(len(ids), bool)
+        # job_id -> row; rows past the matrix index into _pending.
+        self._slots = dict(zip(ids.tolist(), range(len(ids))))
+        self._pending: list[tuple | None] = []
+        self._df = np.bincount(matrix.indices, minlength=FEATURES).astype(np.int32)
+        self._live = len(ids)
+        self._norms = None
+
+    def track(self, rows):
+        """Index open jobs given as (id, version, title, description) rows."""
+        features = [(job_id, version, *job_features(title, description))
+                    for job_id, version, title, description in rows]
+        with self._lock:
+            for job_id, version, indices, values in features:
+                self._discard(job_id)
+                self._slots[job_id] = len(self._ids) + len(self._pending)
+                self._pending.append((job_id, version, indices, values))
+                self._df[indices] += 1
+                self._live += 1
+            self._norms = None
+
+    def discard(self, job_ids):
+        with self._lock:
+            for job_id in job_ids:
+                self._discard(job_id)
+
+    def _discard(self, job_id: int):
+        slot = self._slots.pop(job_id, None)
+        if slot is None:
+            return
+        if slot < len(self._ids):
+            self._alive[slot] = False
+            matrix = self._matrix
+            indices = matrix.indices[matrix.indptr[slot]:matrix.indptr[slot + 1]]
+        else:
+            _, _, indices, _ = self._pending[slot - len(self._ids)]
+            self._pending[slot - len(self._ids)] = None
+        self._df[indices] -= 1
+        self._live -= 1
+        self._norms = None
+
+    def _merge(self):
+        """Fold pending rows into the matrix and drop removed rows."""
+        pending = [row for row in self._pending if row is not None]
+        keep = np.flatnonzero(self._alive)
+        self._reset(
+            sparse.vstack([self._matrix[keep], _pending_matrix(pending)], format="csr"),
+            np.concatenate([self._ids[keep], np.array([row[0] for row in pending], np.int64)]),
+            np.concatenate([self._versions[keep], np.array([row[1] for row in pending], np.int64)]),
+        )
+
+    def recommend(self, text: str | None, k: int) -> list[tuple[float, int]]:
+        """Return up to `k` (score, job_id) pairs for `text`, best first."""
+        q_indices, q_values = vectorize((text, 1.0))
+        if not len(q_indices):
+            return []
+        with self._lock:
+            if len(self._pending) >= MERGE_PENDING or self._live < len(self._ids) // 2:
+                self._merge()
+            if not self._live:
+                return []
+            if self._norms is None:
+                # IDF and the matrix rows' norms change whenever a job comes or goes.
+                self._idf = np.log((1 + self._live) / (1 + self._df.astype(np.float32))) + 1
+                self._squared_idf = self._idf * self._idf
+                self._norms = np.sqrt(self._squared @ self._squared_idf)
+            idf, squared_idf = self._idf, self._squared_idf
+            query = q_values * idf[q_indices]
+            query /= np.linalg.norm(query)
+            weights = np.zeros(FEATURES, np.float32)
+            weights[q_indices] = query * idf[q_indices]
+
+            pending = [row for row in self._pending if row is not None]
+            block = _pending_matrix(pending)
+            scores = np.concatenate([
+                np.where(self._alive, self._matrix @ weights, 0) / np.maximum(self._norms, 1e-12),
+                (block @ weights) / np.maximum(np.sqrt(block.power(2) @ squared_idf), 1e-12),
+            ])
+            ids = np.concatenate([self._ids, np.array([row[0] for row in pending], np.int64)])
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(round(float(scores[i]), 6), int(ids[i])) for i in top if scores[i] > 0]
+
+    def size(self) -> int:
+        return self._live
+
+    def refresh(self, conn):
+        """Reconcile with the OPEN jobs in the database; `conn` is a Connection or Session."""
+        with self._refresh_lock:
+            current = dict(conn.execute(
+                select(Job.id, Job.version).where(Job.status == JobStatus.OPEN)
+            ).all())
+            with self._lock:
+                known = {job_id: int(self._versions[slot]) if slot < len(self._ids)
+                         else self._pending[slot - len(self._ids)][1]
+                         for job_id, slot in self._slots.items()}
+                for job_id in known.keys() - current.keys():
+                    self._discard(job_id)
+            changed = [job_id for job_id, version in current.items() if known.get(job_id) != version]
+            for start in range(0, len(changed), _FETCH_CHUNK):
+                self.track(conn.execute(
+                    select(Job.id, Job.version, Job.title, Job.description)
+                    .where(Job.id.in_(changed[start:start + _FETCH_CHUNK]), Job.status == JobStatus.OPEN)
+                ).all())
+            self.loaded = True
+            self.refreshed_at = time.monotonic()
+            return len(changed)
+
+    def save(self, path: str, bind):
+        with self._lock:
+            self._merge()
+            matrix, ids, versions = self._matrix, self._ids, self._versions
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f, format=SNAPSHOT_FORMAT, features=FEATURES, database=_database_key(bind),
+                ids=ids, versions=versions, data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+            )
+        os.replace(tmp, path)
+
+    def load(self, path: str, bind) -> bool:
+        """Replace the index with a snapshot, if it matches this database and layout."""
+        try:
+            with np.load(path) as snapshot:
+                if (int(snapshot["format"]) != SNAPSHOT_FORMAT or int(snapshot["features"]) != FEATURES
+                        or str(snapshot["database"]) != _database_key(bind)):
+                    return False
+                matrix = sparse.csr_matrix(
+                    (snapshot["data"], snapshot["indices"], snapshot["indptr"]),
+                    shape=(len(snapshot["ids"]), FEATURES),
+                )
+                ids, versions = snapshot["ids"], snapshot["versions"]
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError):
+            logger.warning("ignoring unreadable recommendation snapshot %s", path, exc_info=True)
+            return False
+        with self._lock:
+            self._reset(matrix, ids, versions)
+        return True
+
+    async def start(self, engine):
+        """Load the snapshot and catch up with the database, then keep refreshing."""
+        if INDEX_PATH:
+            await run_in_threadpool(self.load, INDEX_PATH, engine)
+        await self._refresh_logged(engine)
+        self._task = asyncio.create_task(self._maintain(engine))
+
+    async def stop(self, engine):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.loaded and INDEX_PATH:
+            await run_in_threadpool(self.save, INDEX_PATH, engine)
+
+    async def _maintain(self, engine):
+        while True:
+            await asyncio.sleep(REFRESH_SECONDS)
+            await self._refresh_logged(engine)
+
+    async def _refresh_logged(self, engine):
+        try:
+            await run_in_threadpool(self._refresh_from, engine)
+        except Exception:
+            logger.exception("recommendation index refresh failed")
+
+    def _refresh_from(self, engine):
+        with engine.connect() as conn:
+            self.refresh(conn)
+
+
+recommender = JobRecommender()
+
+
+@event.listens_for(Job, "after_insert")
+@event.listens_for(Job, "after_update")
+def _track_job(mapper, connection, target):
+    if target.status in (None, JobStatus.OPEN):
+        recommender.track([(target.id, target.version, target.title, target.description)])
+    else:
+        recommender.discard([target.id])
+
+
+@event.listens_for(Job, "after_delete")
+def _discard_job(mapper, connection, target):
+    recommender.discard([target.id])
+
+
+@register_collector
+def _recommend_metrics():
+    yield from metric("recommend_index_jobs", "gauge", "Open jobs in the recommendation index.",
+                      [(None, recommender.size())])
@@ -0,0 +1,213 @@
+"""Read-replica routing for the handlers that only read.
+
+DATABASE_REPLICA_URLS lists replica databases, comma-separated. Handlers that
+never write depend on `get_read_db` instead of `get_db`. Each of their
+requests is served by the next healthy replica in turn. It falls back to the
+primary when no replica is healthy, or when the caller wrote within the last
+REPLICA_STICKY_SECONDS, so users always read their own writes despite
+replication lag.
+
+`StickyWritesMiddleware` marks the caller of every authenticated POST, PUT,
+PATCH or DELETE when the request arrives, and again when it succeeds. With
+CACHE_BACKEND=redis the marks live in Redis and every worker sees them;
+otherwise they are kept per process, which covers a single worker, apart
+from the local cache's LRU so page traffic cannot evict them. Keep
+REPLICA_STICKY_SECONDS above the replicas' usual lag.
+
+A replica leaves the rotation as soon as a connection to it fails (pre-ping
+failures that reconnect do not count). A background check pings every
+replica each REPLICA_CHECK_SECONDS and returns it once it answers again.
+"""
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from fastapi import Request
+from sqlalchemy import event, select
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+from app.database import ReplicaEngines, replica_engines
+from app.utils import cache
+from app.utils.jwt import caller_id
+from app.utils.metrics import metric, register_collector
+
+STICKY_SECONDS = cache.REPLICA_STICKY_SECONDS
+CHECK_SECONDS = float(os.getenv("REPLICA_CHECK_SECONDS", "5"))
+CHECK_TIMEOUT = float(os.getenv("REPLICA_CHECK_TIMEOUT", "2"))
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Expired per-process marks are dropped once this many have accumulated.
+_STICKY_PRUNE_AT = 10000
+
+logger = logging.getLogger(__name__)
+
+
+def _shared_store() -> bool:
+    return getattr(cache.backend, "shared", False)
+
+
+class ReplicaRouter:
+    def __init__(self, replicas: list[ReplicaEngines]):
+        self.replicas = replicas
+        self.up = {replica.name: True for replica in replicas}
+        self._turn = itertools.count()
+        # Used when there is no shared cache store to keep marks in.
+        self._sticky: dict[int, float] = {}
+        self._lock = threading.Lock()
+        self.routed: dict[tuple[str, str], int] = defaultdict(int)
+        self._task: asyncio.Task | None = None
+        for replica in replicas:
+            event.listen(replica.serving_engine, "handle_error", self._error_listener(replica))
+
+    def _error_listener(self, replica: ReplicaEngines):
+        def on_error(context):
+            # A failed connect has no connection; a failed pre-ping is retried by the pool.
+            if (context.connection is None or context.is_disconnect) and not context.is_pre_ping:
+                self._set_up(replica, False)
+        return on_error
+
+    def _set_up(self, replica: ReplicaEngines, up: bool):
+        if self.up[replica.name] == up:
+            return
+        self.up[replica.name] = up
+        if up:
+            logger.info("replica %s is back in rotation", replica.name)
+        else:
+            logger.warning("replica %s is unavailable; its reads go to the primary", replica.name)
+
+    async def mark_written(self, user_id: int):
+        """Send `user_id`'s reads to the primary for the next STICKY_SECONDS."""
+        if STICKY_SECONDS <= 0:
+            return
+        if _shared_store():
+            await cache.backend.set(f"primary:{user_id}", b"1", STICKY_SECONDS)
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._sticky) >= _STICKY_PRUNE_AT:
+                self._sticky = {user: until for user, until in self._sticky.items() if until > now}
+            self._sticky[user_id] = now + STICKY_SECONDS
+
+    async def is_sticky(self, user_id: int) -> bool:
+        if STICKY_SECONDS <= 0:
+            return False
+        if _shared_store():
+            return await cache.backend.get(f"primary:{user_id}") is not None
+        with self._lock:
+            until = self._sticky.get(user_id)
+            if until is not None and until <= time.monotonic():
+                del self._sticky[user_id]
+                until = None
+        return until is not None
+
+    async def route(self, request: Request) -> ReplicaEngines | None:
+        """The replica to serve this read from, or None for the primary.
+
+        Sets `request.state.read_from` to the replica's name, "sticky" or
+        "primary", which cached_json uses to keep its entries consistent.
+        """
+        target = None
+        if self.replicas:
+            user_id = caller_id(request.headers)
+            if user_id is not None and await self.is_sticky(user_id):
+                request.state.read_from = "sticky"
+                self.routed["primary", "sticky"] += 1
+                return None
+            healthy = [replica for replica in self.replicas if self.up[replica.name]]
+            if healthy:
+                target = healthy[next(self._turn) % len(healthy)]
+            self.routed[target.name if target else "primary", "replica" if target else "unavailable"] += 1
+        request.state.read_from = target.name if target else "primary"
+        return target
+
+    async def check(self):
+        """Ping every replica once, updating which are in rotation."""
+        for replica in self.replicas:
+            try:
+                await asyncio.wait_for(_ping(replica), CHECK_TIMEOUT)
+            except Exception:
+                self._set_up(replica, False)
+            else:
+                self._set_up(replica, True)
+
+    async def start(self):
+        if self.replicas:
+            await self.check()
+            self._task = asyncio.create_task(self._maintain())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(CHECK_SECONDS)
+            await self.check()
+
+    def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+    async def dispose_async(self):
+        for replica in self.replicas:
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+
+
+async def _ping(replica: ReplicaEngines):
+    if replica.async_engine is not None:
+        async with replica.async_engine.connect() as conn:
+            await conn.execute(select(1))
+    else:
+        await run_in_threadpool(_ping_sync, replica.engine)
+
+
+def _ping_sync(engine):
+    with engine.connect() as conn:
+        conn.execute(select(1))
+
+
+router = ReplicaRouter(replica_engines)
+
+
+class StickyWritesMiddleware:
+    """Mark the caller of each authenticated write; see the module docstring."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        user_id = None
+        if scope["type"] == "http" and scope["method"] not in SAFE_METHODS:
+            user_id = caller_id(Headers(scope=scope))
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Before the handler runs, so reads it triggers elsewhere (e.g. via
+        # an event) already go to the primary.
+        await router.mark_written(user_id)
+
+        async def send_marked(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                await router.mark_written(user_id)
+            await send(message)
+
+        await self.app(scope, receive, send_marked)
+
+
+@register_collector
+def _replica_metrics():
+    yield from metric("db_replica_up", "gauge", "1 while the replica is in the read rotation.",
+                      (({"replica": name}, int(up)) for name, up in router.up.items()))
+    yield from metric("db_read_routes_total", "counter",
+                      "Read-only requests by the database that served them and why.",
+                      (({"target": target, "reason": reason}, count)
+                       for (target, reason), count in list(router.routed.items())))
@@ -0,0 +1,228 @@
+import math
+import re
+import threading
+from collections import defaultdict
+
+from fastapi import HTTPException
+from sqlalchemy import Float, Select, and_, cast, event, func, literal_column, or_, select
+from sqlalchemy.orm import Session, object_session
+
+from app.models import Job, job_search_document
+from app.utils.pagination import decode_cursor, encode_cursor, paginate
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the to with".split()
+)
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class InvertedIndex:
+    """In-process term -> job postings index used when Postgres FTS is unavailable.
+
+    Built lazily from the jobs table on first search and kept current by the
+    session events below, which apply a transaction's job changes once it
+    commits. Changes committed while the table is being read are replayed
+    on top of it. It holds every job regardless of status; callers filter
+    the candidates against the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._doc_terms: dict[int, set[str]] = {}
+        self.loaded = False
+        # (job_id, title, description, removed) for each change committed
+        # while load() runs; None when no load is running.
+        self._during_load: list[tuple] | None = None
+
+    def load(self, session):
+        with self._lock:
+            self._during_load = []
+        try:
+            rows = session.execute(
+                select(Job.id, Job.title, Job.description).execution_options(yield_per=1000)
+            ).all()
+        except BaseException:
+            with self._lock:
+                self._during_load = None
+            raise
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            for job_id, title, description in rows:
+                self._add(job_id, title, description)
+            for job_id, title, description, removed in self._during_load:
+                if removed:
+                    self._remove(job_id)
+                else:
+                    self._add(job_id, title, description)
+            self._during_load = None
+            self.loaded = True
+
+    def add(self, job_id: int, title: str | None, description: str | None):
+        with self._lock:
+            if self._during_load is not None:
+                self._during_load.append((job_id, title, description, False))
+            if self.loaded:
+                self._add(job_id, title, description)
+
+    def remove(self, job_id: int):
+        with self._lock:
+            if self._during_load is not None:
+                self._during_load.append((job_id, None, None, True))
+            self._remove(job_id)
+
+    def _add(self, job_id, title, description):
+        self._remove(job_id)
+        counts: dict[str, int] = defaultdict(int)
+        for term in tokenize(title) + tokenize(description):
+            counts[term] += 1
+        for term, tf in counts.items():
+            self._postings[term][job_id] = tf
+        self._doc_terms[job_id] = set(counts)
+
+    def _remove(self, job_id):
+        for term in self._doc_terms.pop(job_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(job_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def search(self, text: str) -> list[tuple[float, int]]:
+        """Return (score, job_id) for jobs containing every term, best first."""
+        terms = set(tokenize(text))
+        if not terms:
+            return []
+        with self._lock:
+            postings = [self._postings.get(term, {}) for term in terms]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            total = max(len(self._doc_terms), 1)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            scored = []
+            for job_id in candidates:
+                score = 0.0
+                for p in postings:
+                    score += (1 + math.log(p[job_id])) * math.log(1 + total / len(p))
+                scored.append((round(score, 6), job_id))
+        scored.sort(reverse=True)
+        return scored
+
+
+job_index = InvertedIndex()
+
+
+# Flushed job changes wait in their session's info until the transaction
+# commits, so a rolled-back insert or update never reaches the index.
+_PENDING = "job_index_changes"
+
+
+def _pending(target) -> dict | None:
+    session = object_session(target)
+    return session.info.setdefault(_PENDING, {}) if session is not None else None
+
+
+@event.listens_for(Job, "after_insert")
+@event.listens_for(Job, "after_update")
+def _index_job(mapper, connection, target):
+    if connection.dialect.name != "postgresql" and (pending := _pending(target)) is not None:
+        pending[target.id] = (target.title, target.description)
+
+
+@event.listens_for(Job, "after_delete")
+def _unindex_job(mapper, connection, target):
+    if connection.dialect.name != "postgresql" and (pending := _pending(target)) is not None:
+        pending[target.id] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_job_changes(session):
+    for job_id, document in session.info.pop(_PENDING, {}).items():
+        if document is None:
+            job_index.remove(job_id)
+        else:
+            job_index.add(job_id, *document)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_job_changes(session):
+    session.info.pop(_PENDING, None)
+
+
+def index_inserted(bind, jobs):
+    """Index (id, title, description) of jobs inserted without the ORM unit of work.
+
+    Bulk INSERT statements do not fire the mapper events above.
+    """
+    if bind.dialect.name != "postgresql":
+        for job_id, title, description in jobs:
+            job_index.add(job_id, title, description)
+
+
+def _rank_cursor(values) -> tuple[float, int]:
+    try:
+        return float(values["r"]), int(values["i"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _search_cursor(ranked_row) -> str:
+    row, rank = ranked_row
+    return encode_cursor({"r": rank, "i": row.id})
+
+
+async def search_jobs(db, stmt: Select, text: str, cursor: str | None, limit: int):
+    """Rank the job rows selected by `stmt` against `text`, one keyset page at a time.
+
+    `stmt` selects Job columns including `id`. Pages are ordered by
+    (rank DESC, id DESC). Returns (rows, next_cursor).
+    """
+    after = _rank_cursor(decode_cursor(cursor)) if cursor else None
+    if db.get_bind().dialect.name == "postgresql":
+        rows = await _search_postgres(db, stmt, text, after, limit)
+    else:
+        rows = await _search_index(db, stmt, text, after, limit)
+    page, next_cursor = paginate(rows, limit, _search_cursor)
+    return [row for row, _ in page], next_cursor
+
+
+async def _search_postgres(db, stmt, text, after, limit):
+    tsquery = func.websearch_to_tsquery(literal_column("'english'"), text)
+    # ts_rank_cd returns real. Selected as double precision, the rank in the
+    # cursor is exactly the value compared on the next page, so rows tied at
+    # the page boundary are not skipped.
+    rank = cast(func.ts_rank_cd(job_search_document, tsquery), Float(precision=53))
+    stmt = stmt.where(job_search_document.op("@@")(tsquery)).add_columns(rank)
+    if after is not None:
+        last_rank, last_id = after
+        stmt = stmt.where(or_(rank < last_rank, and_(rank == last_rank, Job.id < last_id)))
+    stmt = stmt.order_by(rank.desc(), Job.id.desc()).limit(limit + 1)
+    return [(row, row[-1]) for row in (await db.execute(stmt)).all()]
+
+
+async def _search_index(db, stmt, text, after, limit):
+    if not job_index.loaded:
+        await db.run_sync(job_index.load)
+
+    ranked = job_index.search(text)
+    if after is not None:
+        ranked = [(score, job_id) for score, job_id in ranked if (score, job_id) < after]
+
+    rows = []
+    chunk = max(limit * 4, 100)
+    for start in range(0, len(ranked), chunk):
+        batch = ranked[start:start + chunk]
+        found = await db.execute(stmt.where(Job.id.in_([j for _, j in batch])))
+        jobs = {row.id: row for row in found}
+        rows.extend((jobs[job_id], score) for score, job_id in batch if job_id in jobs)
+        if len(rows) > limit:
+            break
+    return rows[:limit + 1]
@@ -1,24 +1,136 @@
+import asyncio
 import hashlib
 import hmac
+import multiprocessing
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 
+from starlette.concurrency import run_in_threadpool
 
-def hash_password(password: str) -> str:
-    """Return salt and hash using PBKDF2-HMAC for storage."""
+ALGORITHM = "pbkdf2_sha256"
+# Hashes written before the iteration count was stored ("salt:hash").
+LEGACY_ITERATIONS = 100_000
+
+PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", "100000"))
+# Processes dedicated to hashing; 0 falls back to the request threadpool.
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Hash/verify calls allowed in flight (running + queued) before shedding.
+HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(HASH_WORKERS * 16 or 64)))
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool is saturated and the caller should retry."""
+
+
+def _derive(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+
+def _parse(stored: str):
+    """Return (iterations, salt, hash) for a stored hash, or None if malformed."""
+    try:
+        if stored.startswith(ALGORITHM + "$"):
+            _, iterations, salt_hex, hash_hex = stored.split("$")
+            return int(iterations), bytes.fromhex(salt_hex), bytes.fromhex(hash_hex)
+        salt_hex, hash_hex = stored.split(":", 1)
+        return LEGACY_ITERATIONS, bytes.fromhex(salt_hex), bytes.fromhex(hash_hex)
+    except ValueError:
+        return None
+
+
+def hash_password(password: str, iterations: int | None = None) -> str:
+    """Return algorithm, iteration count, salt and hash using PBKDF2-HMAC for storage."""
+    iterations = iterations or PBKDF2_ITERATIONS
     salt = os.urandom(16)
-    hashed = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100_000)
-    return f"{salt.hex()}:{hashed.hex()}"
+    hashed = _derive(password, salt, iterations)
+    return f"{ALGORITHM}${iterations}${salt.hex()}${hashed.hex()}"
 
 
 def verify_password(password: str, stored: str) -> bool:
     if not stored:
         return False
-    try:
-        salt_hex, hash_hex = stored.split(":", 1)
-        salt = bytes.fromhex(salt_hex)
-        expected = bytes.fromhex(hash_hex)
-    except ValueError:
+    parsed = _parse(stored)
+    if parsed is None:
         return False
-
-    candidate = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100_000)
+    iterations, salt, expected = parsed
+    candidate = _derive(password, salt, iterations)
     return hmac.compare_digest(candidate, expected)
+
+
+def needs_rehash(stored: str) -> bool:
+    """True when `stored` was produced with other parameters than the current ones."""
+    parsed = _parse(stored) if stored else None
+    return (
+        parsed is None
+        or not stored.startswith(ALGORITHM + "$")
+        or parsed[0] != PBKDF2_ITERATIONS
+    )
+
+
+class HashingPool:
+    """Bounded process pool that keeps PBKDF2 off the event loop and threadpool.
+
+    At most `max_pending` calls may be running or queued; beyond that callers
+    get HashingBusy immediately instead of queueing behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def start(self, wait: bool = True):
+        """Spawn the worker processes ahead of the first login.
+
+        With `wait=False` this returns once they are launched; a login that
+        arrives while they are still importing simply queues behind them.
+        """
+        if self.workers:
+            executor = self._get_executor()
+            futures = [executor.submit(_derive, "", b"", 1) for _ in range(self.workers)]
+            if wait:
+                for future in futures:
+                    future.result()
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HashingBusy()
+            self._pending += 1
+        try:
+            if not self.workers:
+                return await run_in_threadpool(fn, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+hashing_pool = HashingPool(HASH_WORKERS, HASH_MAX_PENDING)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run(hash_password, password, PBKDF2_ITERATIONS)
+
+
+async def verify_password_async(password: str, stored: str) -> bool:
+    return await hashing_pool.run(verify_password, password, stored)
@@ -0,0 +1,134 @@
+"""Serialize query rows straight to JSON for the list endpoints.
+
+Validating every ORM object through a response model costs far more than
+the query for large pages. List endpoints instead select the columns their
+schema declares, turn each row into a dict with a prebuilt `Serializer` and
+return an `ORJSONResponse`, which FastAPI sends without revalidating. The
+schemas in app.schemas stay the source of truth for field names and OpenAPI.
+"""
+import time
+from operator import attrgetter
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.models import Application, Invoice, Job, User
+from app.schemas import (
+    AgentDashboardJob,
+    ApplicationOut,
+    ContractorDashboardJob,
+    InvoiceOut,
+    JobOut,
+    UserOut,
+    WorkPlanOut,
+)
+from app.utils.instrumentation import record_serialization
+
+
+def dumps(content) -> bytes:
+    start = time.perf_counter()
+    body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    record_serialization(time.perf_counter() - start)
+    return body
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (datetimes, dates and enums natively)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+class RowSerializer:
+    """Columns to select for `schema` and the dict builder for the rows they return.
+
+    Values are taken by position, which is several times cheaper than
+    attribute access on a Row. Fields named in `nested` are built by another
+    RowSerializer whose columns are appended after this one's; fields in
+    `exclude` are left out.
+    """
+
+    def __init__(self, model, schema, prefix: str = "", exclude=(), **nested):
+        self.names = [
+            name for name in schema.model_fields if name not in nested and name not in exclude
+        ]
+        self.columns = [getattr(model, name).label(prefix + name) for name in self.names]
+        self.nested = []
+        for name, child in nested.items():
+            start = len(self.columns)
+            self.columns.extend(child.columns)
+            self.nested.append((name, start, len(self.columns), child))
+
+    def __call__(self, row) -> dict:
+        data = dict(zip(self.names, row))
+        for name, start, end, child in self.nested:
+            data[name] = child(row[start:end])
+        return data
+
+    def many(self, rows) -> list[dict]:
+        if not self.nested:
+            names = self.names
+            return [dict(zip(names, row)) for row in rows]
+        return [self(row) for row in rows]
+
+
+class Serializer:
+    """Build the dict for `schema` from a loaded ORM object.
+
+    Fields listed in `nested` are produced by the given callables, usually
+    `related()`.
+    """
+
+    def __init__(self, schema, **nested):
+        self.names = [name for name in schema.model_fields if name not in nested]
+        self._get = attrgetter(*self.names)
+        self.nested = nested
+
+    def __call__(self, obj) -> dict:
+        data = dict(zip(self.names, self._get(obj)))
+        for name, serialize in self.nested.items():
+            data[name] = serialize(obj)
+        return data
+
+    def many(self, objs) -> list[dict]:
+        return [self(obj) for obj in objs]
+
+
+def related(attr: str, serializer: Serializer):
+    """Nested field serializer for a loaded relationship (object, list or None)."""
+    get = attrgetter(attr)
+
+    def serialize(obj):
+        value = get(obj)
+        if value is None:
+            return None
+        if isinstance(value, list):
+            return serializer.many(value)
+        return serializer(value)
+
+    return serialize
+
+
+# --------------------
+# PREBUILT SERIALIZERS
+# --------------------
+job_rows = RowSerializer(Job, JobOut)
+# "contractor__" keeps the joined User.id apart from Application.contractor_id.
+application_rows = RowSerializer(
+    Application, ApplicationOut, contractor=RowSerializer(User, UserOut, prefix="contractor__")
+)
+invoice_rows = RowSerializer(Invoice, InvoiceOut)
+
+contractor_dashboard_job = Serializer(
+    ContractorDashboardJob,
+    work_plan=related("work_plan", Serializer(WorkPlanOut)),
+    invoice=related("invoice", Serializer(InvoiceOut)),
+)
+agent_dashboard_job = Serializer(
+    AgentDashboardJob,
+    work_plan=related("work_plan", Serializer(WorkPlanOut)),
+    invoice=related("invoice", Serializer(InvoiceOut)),
+    applications=related(
+        "applications", Serializer(ApplicationOut, contractor=related("contractor", Serializer(UserOut)))
+    ),
+)
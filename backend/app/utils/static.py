@@ -0,0 +1,98 @@
+"""Serve the built frontend (Vite's `dist`, copied to STATIC_DIR).
+
+`SPAFiles` answers GET and HEAD requests that no API route matched. It is the
+router's default handler, not a mount at "/", so API paths keep their 404s
+and trailing-slash redirects. It serves:
+- files from STATIC_DIR. Vite puts a content hash in every name under
+  assets/, so those are cached as immutable for a year. index.html and the
+  other unhashed files are `no-cache`: browsers revalidate them by ETag and
+  get a 304 when nothing changed;
+- the .br or .gz variant written by `python -m scripts.precompress`, when the
+  client accepts it;
+- index.html for the client-side routes listed in SPA_ROUTES, such as
+  /dashboard, so they load the app.
+
+Anything else, including a mistyped API path like /applicatons/me, gets the
+API's usual JSON 404. A new route in the frontend's router needs adding to
+SPA_ROUTES. When STATIC_DIR has no
+index.html, as in development, main.py does not install it at all.
+"""
+import mimetypes
+import os
+import stat
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from app.utils.compression import negotiate
+
+STATIC_DIR = os.getenv("STATIC_DIR", str(Path(__file__).resolve().parents[2] / "static"))
+HASHED_DIR = "assets"
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Variants `scripts/precompress.py` writes, in order of preference.
+VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+# Paths of frontend/src/App.tsx's routes, which get index.html.
+SPA_ROUTES = frozenset(
+    os.path.normpath(route.strip().strip("/") or ".")
+    for route in os.getenv("SPA_ROUTES", "/,/login,/register,/dashboard").split(",")
+)
+
+
+def has_build(directory: str = STATIC_DIR) -> bool:
+    return os.path.isfile(os.path.join(directory, "index.html"))
+
+
+class SPAFiles(StaticFiles):
+    # The route label request metrics record for these responses.
+    path = "<static>"
+
+    def __init__(self, directory: str, fallback):
+        super().__init__(directory=directory)
+        self.fallback = fallback
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.fallback(scope, receive, send)
+            return
+        scope["route"] = self
+        await super().__call__(scope, receive, send)
+
+    async def get_response(self, path: str, scope) -> Response:
+        try:
+            return await super().get_response(path, scope)
+        except HTTPException as exc:
+            # Only the frontend's own routes fall back to the app.
+            if exc.status_code != 404 or path not in SPA_ROUTES:
+                raise
+        return await super().get_response("index.html", scope)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        relative = os.path.relpath(full_path, os.path.realpath(self.directory))
+        headers = {"Cache-Control": IMMUTABLE if relative.startswith(HASHED_DIR + os.sep) else "no-cache"}
+
+        variants = {}
+        for coding, suffix in VARIANTS:
+            try:
+                variant_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            if stat.S_ISREG(variant_stat.st_mode):
+                variants[coding] = (f"{full_path}{suffix}", variant_stat)
+        served, served_stat = full_path, stat_result
+        if variants:
+            headers["Vary"] = "Accept-Encoding"
+            coding = negotiate(request_headers.get("accept-encoding", ""), tuple(variants))
+            if coding is not None:
+                served, served_stat = variants[coding]
+                headers["Content-Encoding"] = coding
+
+        # The type comes from the original's name, and the ETag from the file sent.
+        response = FileResponse(served, status_code=status_code, stat_result=served_stat, headers=headers,
+                                media_type=mimetypes.guess_type(full_path)[0] or "text/plain")
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,170 @@
+"""Per-agent, per-contractor and per-job running totals.
+
+The routers call `bump()` inside the transaction that performs a state
+change, so the stats tables commit or roll back together with it and
+GET /stats/* reads a single row instead of scanning jobs, applications and
+invoices. Each `bump()` is one multi-row upsert (INSERT ... ON CONFLICT DO
+UPDATE SET col = col + excluded.col), so rows are created on first use and
+concurrent increments never lose updates.
+
+`rebuild()` recomputes every row from the source tables; run it through
+`python -m app.manage rebuild-stats` to backfill or repair the totals.
+"""
+from sqlalchemy import case, delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    AgentStats,
+    Application,
+    ContractorStats,
+    Invoice,
+    InvoiceStatus,
+    Job,
+    JobStats,
+    JobStatus,
+    User,
+    UserRole,
+    WorkPlan,
+    WorkPlanStatus,
+)
+
+
+def _insert_for(dialect: str):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise RuntimeError(f"No upsert configured for {dialect}")
+    return dialect_insert
+
+
+async def bump(db: AsyncSession, model, deltas: dict[int, dict[str, float]]):
+    """Add `deltas` ({primary key: {column: delta}}) to `model`'s counters."""
+    deltas = {key: row for key, row in deltas.items() if any(row.values())}
+    if not deltas:
+        return
+    key = model.__table__.primary_key.columns[0].name
+    columns = sorted({column for row in deltas.values() for column in row})
+    # Sorted keys: concurrent multi-row upserts lock rows in the same order.
+    values = [
+        {key: pk, **{column: deltas[pk].get(column, 0) for column in columns}}
+        for pk in sorted(deltas)
+    ]
+    stmt = _insert_for(db.get_bind().dialect.name)(model).values(values)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[key],
+        set_={column: getattr(model, column) + stmt.excluded[column] for column in columns},
+    ))
+
+
+def _count_if(condition):
+    return func.count(case((condition, 1)))
+
+
+def _sum_if(condition, value):
+    return func.coalesce(func.sum(case((condition, value), else_=0)), 0)
+
+
+def rebuild(conn) -> dict[str, int]:
+    """Replace every stats row with totals computed from the source tables.
+
+    On PostgreSQL the stats tables are locked first, so transitions that
+    commit during the rebuild wait and then apply their increments on top
+    of the recomputed totals. Returns the number of rows written per table.
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(
+            "LOCK TABLE agent_stats, contractor_stats, job_stats IN SHARE ROW EXCLUSIVE MODE"
+        ))
+    for model in (AgentStats, ContractorStats, JobStats):
+        conn.execute(delete(model))
+
+    jobs_by_agent = (
+        select(
+            Job.agent_id,
+            _count_if(Job.status == JobStatus.OPEN).label("open_jobs"),
+            _count_if(Job.status == JobStatus.ASSIGNED).label("assigned_jobs"),
+            _count_if(Job.status == JobStatus.COMPLETED).label("completed_jobs"),
+        )
+        .group_by(Job.agent_id)
+        .subquery()
+    )
+    applications_by_agent = (
+        select(Job.agent_id, func.count(Application.id).label("applications"))
+        .join(Application, Application.job_id == Job.id)
+        .group_by(Job.agent_id)
+        .subquery()
+    )
+    agents = conn.execute(insert(AgentStats).from_select(
+        ["agent_id", "open_jobs", "assigned_jobs", "completed_jobs", "applications_received"],
+        select(
+            jobs_by_agent.c.agent_id,
+            jobs_by_agent.c.open_jobs,
+            jobs_by_agent.c.assigned_jobs,
+            jobs_by_agent.c.completed_jobs,
+            func.coalesce(applications_by_agent.c.applications, 0),
+        ).outerjoin(
+            applications_by_agent, applications_by_agent.c.agent_id == jobs_by_agent.c.agent_id
+        ),
+    )).rowcount
+
+    applications = (
+        select(Application.contractor_id, func.count().label("n"))
+        .group_by(Application.contractor_id)
+        .subquery()
+    )
+    jobs = (
+        select(
+            Job.assigned_contractor_id.label("contractor_id"),
+            _count_if(Job.status == JobStatus.ASSIGNED).label("assigned"),
+            _count_if(Job.status == JobStatus.COMPLETED).label("completed"),
+        )
+        .where(Job.assigned_contractor_id.is_not(None))
+        .group_by(Job.assigned_contractor_id)
+        .subquery()
+    )
+    work_plans = (
+        select(WorkPlan.contractor_id, func.count().label("n"))
+        .where(WorkPlan.status == WorkPlanStatus.COMPLETED)
+        .group_by(WorkPlan.contractor_id)
+        .subquery()
+    )
+    invoices = (
+        select(
+            Invoice.contractor_id,
+            func.count().label("n"),
+            func.sum(Invoice.amount).label("invoiced"),
+            _sum_if(Invoice.status == InvoiceStatus.PAID, Invoice.amount).label("paid"),
+        )
+        .group_by(Invoice.contractor_id)
+        .subquery()
+    )
+    contractors = conn.execute(insert(ContractorStats).from_select(
+        [
+            "contractor_id", "applications_submitted", "assigned_jobs", "completed_jobs",
+            "completed_work_plans", "invoices_submitted", "invoiced_amount", "paid_amount",
+        ],
+        select(
+            User.id,
+            func.coalesce(applications.c.n, 0),
+            func.coalesce(jobs.c.assigned, 0),
+            func.coalesce(jobs.c.completed, 0),
+            func.coalesce(work_plans.c.n, 0),
+            func.coalesce(invoices.c.n, 0),
+            func.coalesce(invoices.c.invoiced, 0),
+            func.coalesce(invoices.c.paid, 0),
+        )
+        .outerjoin(applications, applications.c.contractor_id == User.id)
+        .outerjoin(jobs, jobs.c.contractor_id == User.id)
+        .outerjoin(work_plans, work_plans.c.contractor_id == User.id)
+        .outerjoin(invoices, invoices.c.contractor_id == User.id)
+        .where(User.role == UserRole.CONTRACTOR),
+    )).rowcount
+
+    job_rows = conn.execute(insert(JobStats).from_select(
+        ["job_id", "applications"],
+        select(Application.job_id, func.count()).group_by(Application.job_id),
+    )).rowcount
+
+    return {"agent_stats": agents, "contractor_stats": contractors, "job_stats": job_rows}
@@ -0,0 +1,120 @@
+"""Read the rows of an uploaded JSON array, NDJSON or CSV request body.
+
+`iter_rows()` picks the format from the Content-Type header and yields
+`(row, value, error)` for each record, numbering rows from 1 (a CSV header
+is not a row). Exactly one of `value` and `error` is set. NDJSON and CSV
+are parsed while the body streams in, so memory use stays at about one
+network chunk. A JSON array has to be read whole and is limited to
+`max_json_bytes`.
+"""
+import codecs
+import csv
+from typing import Any, AsyncIterator
+
+import orjson
+from fastapi import HTTPException, Request
+
+JSON_TYPES = ("application/json",)
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+CSV_TYPES = ("text/csv",)
+
+Row = tuple[int, Any, str | None]
+
+
+async def iter_rows(request: Request, max_json_bytes: int) -> AsyncIterator[Row]:
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in JSON_TYPES:
+        rows = _json_rows(request, max_json_bytes)
+    elif media_type in NDJSON_TYPES:
+        rows = _ndjson_rows(request)
+    elif media_type in CSV_TYPES:
+        rows = _csv_rows(request)
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail="Send application/json, application/x-ndjson or text/csv",
+        )
+    async for row in rows:
+        yield row
+
+
+async def _lines(request: Request) -> AsyncIterator[str]:
+    """Decoded body lines, without their line endings."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in request.stream():
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body is not valid UTF-8")
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _json_rows(request: Request, max_json_bytes: int) -> AsyncIterator[Row]:
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_json_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"JSON bodies are limited to {max_json_bytes} bytes; upload NDJSON or CSV instead",
+            )
+    try:
+        items = orjson.loads(body)
+    except orjson.JSONDecodeError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {exc}")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array")
+    for row, item in enumerate(items, 1):
+        yield row, item, None
+
+
+async def _ndjson_rows(request: Request) -> AsyncIterator[Row]:
+    row = 0
+    async for line in _lines(request):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            yield row, orjson.loads(line), None
+        except orjson.JSONDecodeError as exc:
+            yield row, None, f"Invalid JSON: {exc}"
+
+
+async def _csv_rows(request: Request) -> AsyncIterator[Row]:
+    header = None
+    pending: list[str] = []
+    row = 0
+    async for line in _lines(request):
+        pending.append(line)
+        record = "\n".join(pending)
+        # An odd number of quotes means a quoted field continues on the next line.
+        if record.count('"') % 2:
+            continue
+        pending = []
+        if not record.strip():
+            continue
+        try:
+            fields = next(csv.reader([record]))
+        except csv.Error as exc:
+            fields, error = None, f"Invalid CSV: {exc}"
+        if header is None:
+            if fields is None:
+                raise HTTPException(status_code=400, detail=f"Invalid CSV header: {error}")
+            header = [name.strip() for name in fields]
+            continue
+        row += 1
+        if fields is None:
+            yield row, None, error
+        elif len(fields) != len(header):
+            yield row, None, f"Expected {len(header)} fields, got {len(fields)}"
+        else:
+            # Empty cells are missing values, so optional columns may be left blank.
+            yield row, {name: value for name, value in zip(header, fields) if value != ""}, None
+    if pending:
+        yield row + 1, None, "Unterminated quoted field"
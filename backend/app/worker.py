@@ -0,0 +1,122 @@
+"""Outbox worker: carry out the side effects of committed state transitions.
+
+    python -m app.worker [--batch-size 100] [--poll-interval 1] [--once]
+
+Any number of workers can run against one database. Each loop claims a
+batch of due messages (see app.utils.outbox), sleeps for `--poll-interval`
+when there was nothing to do, and deletes processed messages older than
+OUTBOX_RETENTION_DAYS about once an hour. SIGINT/SIGTERM finish the current
+batch and exit. WORKER_METRICS_PORT, when set, serves the worker's counters
+and the queue depth and lag at /metrics on that port.
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.database import SessionLocal, engine
+from app.utils.metrics import CONTENT_TYPE, metric, register_collector, render
+from app.utils.outbox import process_batch, purge_processed, queue_state, worker_stats
+
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "0"))
+PURGE_INTERVAL = 3600
+
+logger = logging.getLogger("app.worker")
+
+
+@register_collector
+def _worker_metrics():
+    yield from metric("outbox_processed_total", "counter", "Outbox messages processed.",
+                      [(None, worker_stats.processed)])
+    yield from metric("outbox_retries_total", "counter",
+                      "Failed outbox attempts scheduled for a retry.", [(None, worker_stats.retried)])
+    yield from metric("outbox_dead_total", "counter", "Outbox messages that ran out of attempts.",
+                      [(None, worker_stats.failed)])
+    yield from metric("outbox_batches_total", "counter", "Outbox batches claimed.",
+                      [(None, worker_stats.batches)])
+
+
+# Queue gauges are served by the worker only, so scraping every API worker
+# does not query the outbox table each time.
+@register_collector
+def _queue_metrics():
+    try:
+        with engine.connect() as conn:
+            depth, lag, failed = queue_state(conn)
+    except Exception:
+        return
+    yield from metric("outbox_pending", "gauge", "Outbox messages waiting to be processed.",
+                      [(None, depth)])
+    yield from metric("outbox_lag_seconds", "gauge",
+                      "Age of the oldest unprocessed outbox message.", [(None, round(lag, 3))])
+    yield from metric("outbox_failed", "gauge", "Outbox messages that ran out of attempts.",
+                      [(None, failed)])
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port: int):
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(batch_size: int, poll_interval: float, once: bool, stop: threading.Event):
+    last_purge = 0.0
+    while not stop.is_set():
+        try:
+            with SessionLocal() as session:
+                claimed = process_batch(session, batch_size)
+                if time.monotonic() - last_purge > PURGE_INTERVAL:
+                    purge_processed(session)
+                    last_purge = time.monotonic()
+        except Exception:
+            # e.g. the database is unreachable; messages stay pending.
+            logger.exception("outbox batch failed")
+            claimed = 0
+        if once and not claimed:
+            return
+        if claimed < batch_size:
+            stop.wait(poll_interval)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.worker", description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--once", action="store_true", help="Exit as soon as no message is due.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    if WORKER_METRICS_PORT:
+        serve_metrics(WORKER_METRICS_PORT)
+
+    run(args.batch_size, args.poll_interval, args.once, stop)
+    logger.info("processed %d, retried %d, gave up on %d",
+                worker_stats.processed, worker_stats.retried, worker_stats.failed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
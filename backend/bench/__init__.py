@@ -0,0 +1,5 @@
+import os
+
+# Benchmarks drive the app far past one caller's rate limits on purpose;
+# bench.overload turns admission control back on to measure it.
+os.environ.setdefault("ADMISSION_CONTROL", "false")
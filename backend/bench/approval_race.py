@@ -0,0 +1,151 @@
+"""Hammer approvals and applications concurrently and check the invariants.
+
+Starts a uvicorn server against DATABASE_URL and, for each round, fires
+`--parallel` simultaneous requests at three scenarios:
+
+* contended: every applicant of one job is approved at once; exactly one
+  approval may succeed and the job must end up assigned to that applicant;
+* duplicate: one contractor applies to one job `--parallel` times; exactly
+  one pending application may exist afterwards;
+* independent: one approval per job across `--parallel` jobs; all must
+  succeed. On Postgres these only lock their own job rows, so the round
+  should take about as long as the contended one (SQLite serializes every
+  writer on the database lock).
+
+Afterwards the round's agent and contractor stats must have counted each
+successful approval and application exactly once.
+
+Exits non-zero on any violated invariant.
+
+    DATABASE_URL=postgresql://... python -m bench.approval_race --parallel 100
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+from sqlalchemy import func, insert, select
+
+from app.database import engine
+from app.models import (
+    AgentStats, Application, ApplicationStatus, Base, ContractorStats, Job, JobStatus, UserRole,
+)
+from app.utils.jwt import create_access_token
+from bench.common import seed_user, uvicorn_server
+
+
+def auth(user_id: int, role: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'id': user_id, 'role': role})}"}
+
+
+def seed(parallel: int, round_no: int) -> dict:
+    with engine.begin() as conn:
+        agent = seed_user(conn, f"race-agent-{round_no}", UserRole.AGENT, "-")
+        contractors = [seed_user(conn, f"race-contractor-{round_no}-{i}", UserRole.CONTRACTOR, "-")
+                       for i in range(parallel)]
+
+        def open_job(title):
+            return conn.execute(insert(Job).values(title=title, agent_id=agent)
+                                .returning(Job.id)).scalar_one()
+
+        def apply(job_id, contractor_ids):
+            return conn.execute(insert(Application).returning(Application.id), [
+                {"job_id": job_id, "contractor_id": c, "proposed_cost": 1.0} for c in contractor_ids
+            ]).scalars().all()
+
+        contended_job = open_job("race contended")
+        contended = apply(contended_job, contractors)
+        independent = [apply(open_job(f"race independent {i}"), [c])[0]
+                       for i, c in enumerate(contractors)]
+        duplicate_job = open_job("race duplicate")
+    return {
+        "agent_id": agent,
+        "agent": auth(agent, "AGENT"),
+        "contractor": contractors[0],
+        "contractor_auth": auth(contractors[0], "CONTRACTOR"),
+        "contended_job": contended_job,
+        "contended": contended,
+        "independent": independent,
+        "duplicate_job": duplicate_job,
+    }
+
+
+async def burst(client: httpx.AsyncClient, requests: list[tuple[str, dict, dict | None]]):
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(
+        client.post(url, headers=headers, json=body) for url, headers, body in requests
+    ))
+    return [r.status_code for r in responses], time.perf_counter() - start
+
+
+def check(name: str, ok: bool, detail: str, failures: list[str]):
+    print(f"  {name:<12} {'ok' if ok else 'FAIL'}  {detail}")
+    if not ok:
+        failures.append(name)
+
+
+async def run_round(base_url: str, parallel: int, round_no: int, failures: list[str]):
+    s = seed(parallel, round_no)
+    limits = httpx.Limits(max_connections=parallel)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        codes, contended_s = await burst(client, [
+            (f"/applications/approve/{app_id}", s["agent"], None) for app_id in s["contended"]
+        ])
+        with engine.connect() as conn:
+            job = conn.execute(select(Job.status, Job.assigned_contractor_id, Job.version)
+                               .where(Job.id == s["contended_job"])).one()
+            approved = conn.execute(select(Application.contractor_id).where(
+                Application.job_id == s["contended_job"],
+                Application.status == ApplicationStatus.APPROVED,
+            )).scalars().all()
+        check("contended", codes.count(200) == 1 and set(codes) <= {200, 400, 409}
+              and job.status == JobStatus.ASSIGNED and approved == [job.assigned_contractor_id],
+              f"{codes.count(200)} approved, {len(approved)} APPROVED rows, "
+              f"version {job.version}, {contended_s * 1000:.0f} ms", failures)
+
+        codes, _ = await burst(client, [
+            (f"/applications/apply/{s['duplicate_job']}", s["contractor_auth"], {"proposed_cost": 1.0})
+        ] * parallel)
+        with engine.connect() as conn:
+            pending = conn.execute(select(func.count()).where(
+                Application.job_id == s["duplicate_job"],
+                Application.contractor_id == s["contractor"],
+                Application.status == ApplicationStatus.SUBMITTED,
+            )).scalar_one()
+        check("duplicate", codes.count(200) == 1 and pending == 1,
+              f"{codes.count(200)} accepted, {pending} pending rows", failures)
+
+        codes, independent_s = await burst(client, [
+            (f"/applications/approve/{app_id}", s["agent"], None) for app_id in s["independent"]
+        ])
+        check("independent", codes.count(200) == parallel,
+              f"{codes.count(200)}/{parallel} approved, {independent_s * 1000:.0f} ms", failures)
+
+    # Seeded rows bypass the routers, so only the API's own transitions are counted.
+    with engine.connect() as conn:
+        assigned = conn.scalar(select(AgentStats.assigned_jobs)
+                               .where(AgentStats.agent_id == s["agent_id"]))
+        applied = conn.scalar(select(ContractorStats.applications_submitted)
+                              .where(ContractorStats.contractor_id == s["contractor"]))
+    check("stats", assigned == parallel + 1 and applied == 1,
+          f"{assigned} assigned jobs counted, {applied} applications counted", failures)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--parallel", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    failures: list[str] = []
+    with uvicorn_server() as base_url:
+        for round_no in range(args.rounds):
+            print(f"round {round_no + 1}")
+            asyncio.run(run_round(base_url, args.parallel, round_no, failures))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
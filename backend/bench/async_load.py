@@ -0,0 +1,82 @@
+"""Compare requests/second with DB_ASYNC off and on at high concurrency.
+
+Starts one uvicorn worker per mode against DATABASE_URL, seeds open jobs
+if the table is empty, and drives GET /jobs/{id} and GET /jobs/ with
+`--concurrency` concurrent clients for `--duration` seconds.
+
+    DATABASE_URL=postgresql://... python -m bench.async_load --concurrency 400
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+from bench.common import quantile, seed_jobs, uvicorn_server
+
+
+async def drive(base_url: str, job_ids: list[int], concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < stop_at:
+                if random.random() < 0.8:
+                    url, params = f"/jobs/{random.choice(job_ids)}", None
+                else:
+                    url, params = "/jobs/", {"limit": 20}
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url, params=params)
+                    ok = response.status_code == 200
+                except httpx.TransportError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50_ms": quantile(latencies, 0.50) * 1000,
+        "p99_ms": quantile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def run_mode(db_async: bool, args, job_ids) -> dict:
+    with uvicorn_server(DB_ASYNC="true" if db_async else "false") as base_url:
+        asyncio.run(drive(base_url, job_ids, min(args.concurrency, 50), 1.0))  # warm-up
+        return asyncio.run(drive(base_url, job_ids, args.concurrency, args.duration))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--jobs", type=int, default=1000)
+    args = parser.parse_args()
+
+    job_ids = seed_jobs(args.jobs)
+    results = {mode: run_mode(mode == "async", args, job_ids) for mode in ("sync", "async")}
+
+    print(f"{'mode':<6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode, r in results.items():
+        print(f"{mode:<6} {r['rps']:>9.1f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['errors']:>7}")
+    if results["sync"]["rps"]:
+        print(f"async / sync throughput: {results['async']['rps'] / results['sync']['rps']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""p99 of non-auth endpoints during a login burst, threadpool vs hashing pool.
+
+Fires `--rate` POST /auth/login per second (open loop) for `--duration`
+seconds while probing GET /jobs/{id} at `--probe-rate` per second, once
+with hashing on the request threadpool and once with the bounded process
+pool. Probe latency is what every other user sees during the burst; it
+covers every probe, and probes that did not get a 200 are also counted by
+status.
+
+    DATABASE_URL=postgresql://... python -m bench.auth_burst --rate 500
+"""
+import argparse
+import asyncio
+import collections
+import random
+import time
+
+import httpx
+
+from app.database import engine
+from app.models import UserRole
+from app.utils.security import hash_password
+from bench.common import quantile, seed_jobs, seed_user, uvicorn_server
+
+PASSWORD = "bench-password"
+
+MODES = {
+    # hashing on the threadpool with no admission limit: the old behaviour
+    "threadpool": {"PASSWORD_HASH_WORKERS": "0", "PASSWORD_HASH_MAX_PENDING": "1000000"},
+    "process-pool": {},
+}
+
+
+async def _open_loop(rate: float, duration: float, fire):
+    tasks = []
+    interval = 1.0 / rate
+    start = time.monotonic()
+    sent = 0
+    while (now := time.monotonic()) - start < duration:
+        due = int((now - start) / interval) + 1
+        for _ in range(due - sent):
+            tasks.append(asyncio.create_task(fire()))
+        sent = due
+        await asyncio.sleep(interval / 2)
+    await asyncio.gather(*tasks)
+
+
+async def burst(base_url, user_id, job_ids, args) -> dict:
+    probes: list[float] = []
+    probe_statuses = collections.Counter()
+    logins = collections.Counter()
+    limits = httpx.Limits(max_connections=2000, max_keepalive_connections=2000)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def login():
+            try:
+                response = await client.post("/auth/login", json={"user_id": user_id, "password": PASSWORD})
+                logins[response.status_code] += 1
+            except httpx.TransportError:
+                logins["error"] += 1
+
+        async def probe():
+            # Every probe counts, so a stall that ends in a timeout or a 503
+            # still shows in the latencies.
+            start = time.perf_counter()
+            try:
+                status = (await client.get(f"/jobs/{random.choice(job_ids)}")).status_code
+            except httpx.TransportError:
+                status = "error"
+            probes.append(time.perf_counter() - start)
+            probe_statuses[status] += 1
+
+        await asyncio.gather(
+            _open_loop(args.rate, args.duration, login),
+            _open_loop(args.probe_rate, args.duration, probe),
+        )
+
+    probes.sort()
+    return {
+        "probe_p50_ms": quantile(probes, 0.50) * 1000,
+        "probe_p99_ms": quantile(probes, 0.99) * 1000,
+        "probe_failures": {status: count for status, count in probe_statuses.items() if status != 200},
+        "logins": dict(logins),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=500.0)
+    parser.add_argument("--probe-rate", type=float, default=50.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    job_ids = seed_jobs(100)
+    with engine.begin() as conn:
+        user_id = seed_user(conn, "bench-login", UserRole.CONTRACTOR, hash_password(PASSWORD))
+
+    for mode, env in MODES.items():
+        with uvicorn_server(**env) as base_url:
+            result = asyncio.run(burst(base_url, user_id, job_ids, args))
+        print(f"{mode:<13} probe p50 {result['probe_p50_ms']:8.1f} ms  "
+              f"p99 {result['probe_p99_ms']:8.1f} ms  probe failures {result['probe_failures']}  "
+              f"logins {result['logins']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Helpers shared by the benchmarks: seeding, running a uvicorn server and driving it."""
+import asyncio
+import contextlib
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, NamedTuple
+
+import httpx
+from sqlalchemy import event, insert, select
+
+from app.database import async_engine, engine
+from app.models import Base, Job, User, UserRole
+
+
+def seed_jobs(count: int) -> list[int]:
+    """Ensure at least some open jobs exist and return up to `count` ids."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        ids = conn.execute(select(Job.id).limit(count)).scalars().all()
+        if ids:
+            return ids
+        agent_id = seed_user(conn, "bench-agent", UserRole.AGENT, "-")
+        conn.execute(insert(Job), [
+            {"title": f"Bench job {i}", "description": "load test", "budget": i, "agent_id": agent_id}
+            for i in range(count)
+        ])
+        return conn.execute(select(Job.id).limit(count)).scalars().all()
+
+
+class QueryCounter:
+    """Records the SQL statements executed while active; see count_queries()."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextlib.contextmanager
+def count_queries():
+    """Count statements sent by the engine that serves requests.
+
+        with count_queries() as queries:
+            client.get("/applications/job/1", headers=auth)
+        assert queries.count <= 2, queries.statements
+    """
+    serving = async_engine.sync_engine if async_engine is not None else engine
+    counter = QueryCounter()
+    event.listen(serving, "before_cursor_execute", counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(serving, "before_cursor_execute", counter._record)
+
+
+def seed_user(conn, name: str, role: UserRole, password_hash: str) -> int:
+    return conn.execute(
+        insert(User).values(name=name, role=role, password_hash=password_hash).returning(User.id)
+    ).scalar_one()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health/ready")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+@contextlib.contextmanager
+def uvicorn_server(workers: int = 1, **env):
+    """Run app.main:app in a child uvicorn process and yield its base URL."""
+    port = free_port()
+    # A keep-alive longer than the pauses between bursts, so httpx never
+    # reuses a connection the server is closing at that moment.
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--no-access-log", "--timeout-keep-alive", "60",
+         "--workers", str(workers)],
+        env=dict(os.environ, **env),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_ready(base_url))
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def quantile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+class Call(NamedTuple):
+    """One HTTP request; plain data so it can be sent to a client process."""
+    method: str
+    url: str
+    token: str | None = None
+    json: Any = None
+    params: dict | None = None
+
+
+async def drive(client: httpx.AsyncClient, calls: list[Call], concurrency: int = 1,
+                stream: bool = False) -> tuple[list[float], list[str]]:
+    """Send `calls` over `concurrency` connections; return 200 latencies and errors.
+
+    With `stream`, a request is timed to the first body chunk and then
+    closed, for responses that never end.
+    """
+    latencies: list[float] = []
+    errors: list[str] = []
+    pending = iter(calls)
+
+    async def send(call: Call) -> tuple[int, str]:
+        headers = {"Authorization": f"Bearer {call.token}"} if call.token else None
+        request = client.build_request(call.method, call.url, headers=headers,
+                                       json=call.json, params=call.params)
+        response = await client.send(request, stream=stream)
+        try:
+            if stream:
+                async for _ in response.aiter_raw():
+                    break
+            else:
+                await response.aread()
+        finally:
+            await response.aclose()
+        return response.status_code, "" if stream else response.text[:200]
+
+    async def worker():
+        for call in pending:
+            start = time.perf_counter()
+            try:
+                status, body = await send(call)
+            except httpx.TransportError as exc:
+                status, body = None, repr(exc)
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors.append(f"{call.method} {call.url}: {status} {body}")
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def drive_process(base_url: str, calls: list[Call], concurrency: int, stream: bool):
+    """drive() in a fresh event loop; the entry point of a load-client process."""
+    async def run():
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+            return await drive(client, calls, concurrency, stream)
+
+    return asyncio.run(run())
+
+
+def summarize(latencies: list[float], errors: list[str], elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    summary = {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(quantile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(quantile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(quantile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+    }
+    if errors:
+        summary["first_error"] = errors[0]
+    return summary
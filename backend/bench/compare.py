@@ -0,0 +1,64 @@
+"""Compare two bench.suite result files and flag regressions.
+
+For every route and micro-benchmark in both files, prints the baseline and
+current p50/p99 latency, throughput and µs/op with the relative change.
+Exits non-zero when a latency or µs/op value rose, or throughput fell, by
+more than `--threshold`. Changes smaller than `--floor` (ms or µs) are
+ignored, since they are noise at that scale.
+
+    python -m bench.compare before.json after.json --threshold 0.15
+"""
+import argparse
+import json
+import sys
+
+# metric -> True when a larger value is worse
+METRICS = {"p50_ms": True, "p95_ms": True, "p99_ms": True, "rps": False, "us_per_op": True}
+SHOWN = ("p50_ms", "p99_ms", "rps", "us_per_op")
+
+
+def compare(before: dict, after: dict, threshold: float, floor: float) -> list[str]:
+    regressions = []
+    for section in ("in-process", "load", "micro"):
+        old, new = before.get(section, {}), after.get(section, {})
+        for name in sorted(old.keys() & new.keys()):
+            cells = []
+            for metric, larger_is_worse in METRICS.items():
+                if metric not in old[name] or metric not in new[name]:
+                    continue
+                a, b = old[name][metric], new[name][metric]
+                change = (b - a) / a if a else 0.0
+                worse = change > threshold if larger_is_worse else change < -threshold
+                if worse and (metric == "rps" or abs(b - a) >= floor):
+                    regressions.append(f"{section} {name} {metric}: {a} -> {b} ({change:+.0%})")
+                if metric in SHOWN:
+                    cells.append(f"{metric} {a:.2f} -> {b:.2f} ({change:+.0%}){' !' if worse else ''}")
+            print(f"{section:<10} {name:<52} " + "  ".join(cells))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--floor", type=float, default=0.1)
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    for label, results in (("before", before), ("after", after)):
+        meta = results.get("meta", {})
+        print(f"{label}: {meta.get('commit')} {meta.get('database')} at {meta.get('created_at')}")
+
+    regressions = compare(before, after, args.threshold, args.floor)
+    if regressions:
+        print(f"\n{len(regressions)} regressions beyond {args.threshold:.0%}:", *regressions, sep="\n  ")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Measure what response compression saves on the wire.
+
+Seeds `--jobs` jobs and starts a uvicorn server against DATABASE_URL. Then
+fetches large list responses, an export and, when STATIC_DIR holds a build,
+the frontend's index.html and assets, once per Accept-Encoding: identity,
+gzip and br. For each it reports the bytes received and the local p50
+latency over `--repeat` requests. It also estimates the download time at
+`--mbps`, the part compression actually shortens on a real link. The
+"first load" row sums index.html and its assets: what a new visitor
+downloads before the dashboard can render. Run `python -m scripts.precompress`
+on the build first, or the assets go out uncompressed.
+
+    DATABASE_URL=sqlite:///bench.db STATIC_DIR=../frontend/dist python -m bench.compression
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from sqlalchemy import select
+
+from app.database import engine
+from app.models import User, UserRole
+from app.utils.jwt import create_access_token
+from app.utils.static import STATIC_DIR, has_build
+from bench.common import quantile, seed_jobs, uvicorn_server
+
+ENCODINGS = ("identity", "gzip", "br")
+API_PATHS = ("/jobs/?limit=100", "/jobs/agent/me", "/dashboard/agent?limit=100", "/exports/jobs")
+
+
+def static_paths() -> list[str]:
+    """index.html and the original (not precompressed) files under assets/."""
+    assets = os.path.join(STATIC_DIR, "assets")
+    names = sorted(os.listdir(assets)) if os.path.isdir(assets) else []
+    return ["/"] + [f"/assets/{name}" for name in names if not name.endswith((".br", ".gz"))]
+
+
+async def fetch(client: httpx.AsyncClient, path: str, headers: dict, repeat: int) -> tuple[int, float]:
+    """Bytes received for `path`, and its p50 latency in seconds."""
+    latencies, size = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+        size = response.num_bytes_downloaded
+    return size, quantile(sorted(latencies), 0.5)
+
+
+async def run(base_url: str, token: str, repeat: int, mbps: float):
+    paths = [(path, True) for path in API_PATHS]
+    if has_build(STATIC_DIR):
+        paths += [(path, False) for path in static_paths()]
+    results: dict[tuple[str, str], tuple[int, float]] = {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        for path, authenticated in paths:
+            for encoding in ENCODINGS:
+                headers = {"Accept-Encoding": encoding}
+                if authenticated:
+                    headers["Authorization"] = f"Bearer {token}"
+                results[path, encoding] = await fetch(client, path, headers, repeat)
+
+    def transfer_ms(size: int) -> float:
+        return size * 8 / (mbps * 1e6) * 1000
+
+    print(f"{'path':<34} {'encoding':<9} {'bytes':>10} {'ratio':>6} {'p50 ms':>8} {f'@{mbps:g}Mbps ms':>12}")
+    for path, _ in paths:
+        identity = results[path, "identity"][0]
+        for encoding in ENCODINGS:
+            size, p50 = results[path, encoding]
+            print(f"{path:<34} {encoding:<9} {size:>10} {size / max(identity, 1):>6.2f} "
+                  f"{p50 * 1000:>8.2f} {transfer_ms(size):>12.1f}")
+    static = [path for path, authenticated in paths if not authenticated]
+    if static:
+        for encoding in ENCODINGS:
+            size = sum(results[path, encoding][0] for path in static)
+            print(f"{'first load':<34} {encoding:<9} {size:>10} {'':>6} {'':>8} {transfer_ms(size):>12.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--mbps", type=float, default=10, help="Link speed for the download estimate.")
+    args = parser.parse_args()
+
+    seed_jobs(args.jobs)
+    with engine.connect() as conn:
+        agent = conn.execute(select(User.id).where(User.name == "bench-agent")).scalar_one()
+    token = create_access_token({"id": agent, "role": UserRole.AGENT.value})
+    with uvicorn_server() as base_url:
+        asyncio.run(run(base_url, token, args.repeat, args.mbps))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Measure how quickly status changes reach an open GET /events stream.
+
+Starts a uvicorn server against DATABASE_URL, opens `--idle` event streams
+for contractors that receive nothing, then for each of `--rounds` rounds
+approves a fresh application and times the approval request's start until
+the applicant's stream delivers the `application` event. Exits non-zero if
+any event takes longer than `--max-latency` seconds or never arrives.
+
+    DATABASE_URL=sqlite:///bench.db python -m bench.event_latency --idle 200 --rounds 50
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+import time
+
+import httpx
+from sqlalchemy import insert
+
+from app.database import engine
+from app.models import Application, Base, Job, UserRole
+from app.utils.jwt import create_access_token
+from bench.common import quantile, seed_user, uvicorn_server
+
+
+def token(user_id: int, role: str) -> str:
+    return create_access_token({"id": user_id, "role": role})
+
+
+def seed(idle: int, rounds: int) -> dict:
+    with engine.begin() as conn:
+        agent = seed_user(conn, "events-agent", UserRole.AGENT, "-")
+        contractor = seed_user(conn, "events-contractor", UserRole.CONTRACTOR, "-")
+        idle_ids = [seed_user(conn, f"events-idle-{i}", UserRole.CONTRACTOR, "-") for i in range(idle)]
+        applications = []
+        for i in range(rounds):
+            job_id = conn.execute(insert(Job).values(title=f"events {i}", agent_id=agent)
+                                  .returning(Job.id)).scalar_one()
+            applications.append(conn.execute(insert(Application).values(
+                job_id=job_id, contractor_id=contractor, proposed_cost=1.0,
+            ).returning(Application.id)).scalar_one())
+    return {
+        "agent": token(agent, "AGENT"),
+        "contractor": token(contractor, "CONTRACTOR"),
+        "idle": [token(user_id, "CONTRACTOR") for user_id in idle_ids],
+        "applications": applications,
+    }
+
+
+async def read_events(response: httpx.Response, received: asyncio.Queue):
+    name = None
+    async for line in response.aiter_lines():
+        if line.startswith("event: "):
+            name = line[len("event: "):]
+        elif line.startswith("data: ") and name == "application":
+            await received.put((time.perf_counter(), json.loads(line[len("data: "):])))
+
+
+async def run(base_url: str, s: dict, max_latency: float) -> int:
+    limits = httpx.Limits(max_connections=len(s["idle"]) + 10)
+    timeout = httpx.Timeout(30.0, read=None)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        async with contextlib.AsyncExitStack() as streams:
+            for idle_token in s["idle"]:
+                await streams.enter_async_context(
+                    client.stream("GET", "/events", params={"access_token": idle_token})
+                )
+            response = await streams.enter_async_context(
+                client.stream("GET", "/events", params={"access_token": s["contractor"]})
+            )
+            received: asyncio.Queue = asyncio.Queue()
+            reader = asyncio.create_task(read_events(response, received))
+            metrics = (await client.get("/metrics")).text
+            print(next(line for line in metrics.splitlines() if line.startswith("events_subscribers")))
+
+            latencies, missing = [], 0
+            agent = {"Authorization": f"Bearer {s['agent']}"}
+            for app_id in s["applications"]:
+                start = time.perf_counter()
+                (await client.post(f"/applications/approve/{app_id}", headers=agent)).raise_for_status()
+                try:
+                    while True:
+                        at, data = await asyncio.wait_for(received.get(), max_latency * 2)
+                        if data["id"] == app_id:
+                            latencies.append(at - start)
+                            break
+                except asyncio.TimeoutError:
+                    missing += 1
+            reader.cancel()
+
+    latencies.sort()
+    print(f"{len(s['idle'])} idle streams, {len(latencies)} events, {missing} missing")
+    for label, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        print(f"  {label} {quantile(latencies, q) * 1000:8.1f} ms (approve request included)")
+    worst = latencies[-1] if latencies else float("inf")
+    print(f"  max {worst * 1000:8.1f} ms")
+    return 1 if missing or worst > max_latency else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--idle", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--max-latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    s = seed(args.idle, args.rounds)
+    with uvicorn_server() as base_url:
+        return asyncio.run(run(base_url, s, args.max_latency))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
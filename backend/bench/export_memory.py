@@ -0,0 +1,84 @@
+"""Check that streaming exports use constant memory as the row count grows.
+
+Seeds invoices (one job each) up to the largest `--sizes` value, then
+consumes the invoice export generator for each size in both formats and
+reports peak traced Python memory alongside a fetch-everything baseline.
+Exits non-zero if the streaming peak grows more than 2x across sizes.
+
+    DATABASE_URL=sqlite:///bench.db python -m bench.export_memory --sizes 10000 100000
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import func, insert, select
+
+from app.database import engine
+from app.models import Base, Invoice, Job, UserRole
+from app.routers.exports import stream_rows
+from app.utils.serialization import dumps, invoice_rows
+from bench.common import seed_user
+
+
+def seed_invoices(count: int) -> int:
+    with engine.begin() as conn:
+        have = conn.execute(select(func.count()).select_from(Invoice)).scalar_one()
+        if have >= count:
+            return conn.execute(select(Invoice.contractor_id).limit(1)).scalar_one()
+        agent = seed_user(conn, "export-agent", UserRole.AGENT, "-")
+        contractor = seed_user(conn, "export-contractor", UserRole.CONTRACTOR, "-")
+        for start in range(have, count, 10000):
+            batch = range(start, min(start + 10000, count))
+            job_ids = conn.execute(insert(Job).returning(Job.id), [
+                {"title": f"Export job {i}", "agent_id": agent, "assigned_contractor_id": contractor}
+                for i in batch
+            ]).scalars().all()
+            conn.execute(insert(Invoice), [
+                {"job_id": job_id, "contractor_id": contractor, "amount": 10.0} for job_id in job_ids
+            ])
+        return contractor
+
+
+def measure(fn) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    seed_invoices(max(args.sizes))
+    stmt = select(*invoice_rows.columns).order_by(Invoice.id)
+
+    peaks = {"ndjson": [], "csv": []}
+    print(f"{'rows':>8} {'format':<8} {'peak KiB':>10} {'rows/s':>10}")
+    for size in args.sizes:
+        sized = stmt.limit(size)
+        for fmt in peaks:
+            peak, elapsed = measure(lambda: sum(len(chunk) for chunk in stream_rows(sized, invoice_rows, fmt)))
+            peaks[fmt].append(peak)
+            print(f"{size:>8} {fmt:<8} {peak:>10.0f} {size / elapsed:>10.0f}")
+
+        def fetch_all():
+            with engine.connect() as conn:
+                dumps(invoice_rows.many(conn.execute(sized).all()))
+
+        peak, elapsed = measure(fetch_all)
+        print(f"{size:>8} {'list':<8} {peak:>10.0f} {size / elapsed:>10.0f}")
+
+    growth = max(max(p) / min(p) for p in peaks.values())
+    print(f"streaming peak growth across sizes: {growth:.2f}x")
+    return 1 if growth > 2 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
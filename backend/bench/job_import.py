@@ -0,0 +1,95 @@
+"""Compare bulk job import with creating the same jobs one POST at a time.
+
+Starts a uvicorn server against DATABASE_URL, then creates `--rows` jobs for
+one agent four ways: `--concurrency` clients calling POST /jobs/ once per
+job, and one POST /jobs/import each with a JSON array, NDJSON and CSV body.
+Reports rows/s for each and exits non-zero if any row failed.
+
+    DATABASE_URL=sqlite:///bench.db python -m bench.job_import --rows 20000
+"""
+import argparse
+import asyncio
+import csv
+import io
+import sys
+import time
+
+import httpx
+import orjson
+
+from app.database import engine
+from app.models import Base, UserRole
+from app.utils.jwt import create_access_token
+from bench.common import Call, drive, seed_user, uvicorn_server
+
+
+def jobs(count: int, label: str) -> list[dict]:
+    return [
+        {"title": f"Import {label} {i}", "description": f"Bulk import benchmark row {i}", "budget": 10.0 + i % 500}
+        for i in range(count)
+    ]
+
+
+def bodies(count: int) -> dict[str, tuple[str, bytes]]:
+    """Content type and body per import format."""
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=["title", "description", "budget"])
+    writer.writeheader()
+    writer.writerows(jobs(count, "csv"))
+    return {
+        "import json": ("application/json", orjson.dumps(jobs(count, "json"))),
+        "import ndjson": ("application/x-ndjson", b"\n".join(orjson.dumps(job) for job in jobs(count, "ndjson"))),
+        "import csv": ("text/csv", out.getvalue().encode()),
+    }
+
+
+async def run(base_url: str, token: str, args) -> dict[str, tuple[int, float]]:
+    """(created rows, seconds) per method."""
+    results = {}
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        calls = [Call("POST", "/jobs/", token, json=job) for job in jobs(args.rows, "single")]
+        start = time.perf_counter()
+        latencies, errors = await drive(client, calls, args.concurrency)
+        results["single POST /jobs/"] = (len(latencies), time.perf_counter() - start)
+        for error in errors[:3]:
+            print("  single:", error)
+
+        for name, (content_type, body) in bodies(args.rows).items():
+            start = time.perf_counter()
+            response = await client.post("/jobs/import", content=body,
+                                         headers={**headers, "Content-Type": content_type})
+            elapsed = time.perf_counter() - start
+            response.raise_for_status()
+            result = response.json()
+            for error in result["errors"][:3]:
+                print(f"  {name}: row {error['row']}: {error['detail']}")
+            results[name] = (result["created"], elapsed)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Parallel connections for the one-job-per-request run.")
+    parser.add_argument("--batch-size", type=int, help="JOB_IMPORT_BATCH_SIZE for the server.")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        agent = seed_user(conn, "import-agent", UserRole.AGENT, "-")
+    token = create_access_token({"id": agent, "role": UserRole.AGENT.value})
+    env = {"JOB_IMPORT_BATCH_SIZE": str(args.batch_size)} if args.batch_size else {}
+    env["JOB_IMPORT_MAX_ROWS"] = str(max(args.rows, 100000))
+    with uvicorn_server(**env) as base_url:
+        results = asyncio.run(run(base_url, token, args))
+
+    print(f"{'method':<20} {'rows':>8} {'seconds':>9} {'rows/s':>10}")
+    for name, (created, elapsed) in results.items():
+        print(f"{name:<20} {created:>8} {elapsed:>9.2f} {created / elapsed:>10.0f}")
+    return 0 if all(created == args.rows for created, _ in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""Micro-benchmarks for password hashing, tokens, recommendations and response serialization.
+
+Each case is timed with timeit and reported as µs per call, best of
+`--repeat`. The recommendation case ranks RECOMMENDED_JOBS synthetic jobs
+held in a JobRecommender. The serialization cases compare the response_model path
+(validate into the schema, dump with pydantic) with the RowSerializer and
+Serializer paths the list endpoints and dashboards use. No database is
+needed. `python -m bench.suite --micro` stores these results with the route
+benchmarks.
+
+    python -m bench.micro --repeat 7
+"""
+import argparse
+import random
+import timeit
+from datetime import datetime
+from typing import Callable
+
+from pydantic import TypeAdapter
+
+from app.models import (
+    Application,
+    ApplicationStatus,
+    Invoice,
+    Job,
+    JobStatus,
+    User,
+    UserRole,
+    WorkPlan,
+    WorkPlanStatus,
+)
+from app.schemas import JobOut, JobPage
+from app.utils.jwt import create_access_token, decode_access_token, token_cache
+from app.utils.recommend import JobRecommender
+from app.utils.security import hash_password, verify_password
+from app.utils.serialization import agent_dashboard_job, application_rows, dumps, job_rows
+from bench.seed import WORDS
+
+PAGE = 50
+RECOMMENDED_JOBS = 20000
+
+
+def _job_row(i: int) -> tuple:
+    values = {
+        "id": i, "title": f"Job {i}", "description": "fence repair " * 10, "budget": 100.0 + i,
+        "status": JobStatus.OPEN, "agent_id": 1, "assigned_contractor_id": None,
+        "created_at": datetime(2024, 1, 1),
+    }
+    return tuple(values[name] for name in job_rows.names)
+
+
+def _application_row(i: int) -> tuple:
+    values = {
+        "id": i, "job_id": 1, "contractor_id": i, "proposed_cost": 90.0,
+        "status": ApplicationStatus.SUBMITTED, "created_at": datetime(2024, 1, 1),
+    }
+    contractor = {
+        "id": i, "name": f"Contractor {i}", "role": UserRole.CONTRACTOR, "email": None,
+        "contact_number": None, "skills": "painting", "education": None,
+    }
+    row = [values[name] for name in application_rows.names]
+    child = application_rows.nested[0][3]
+    return tuple(row + [contractor.get(name) for name in child.names])
+
+
+def _dashboard_job(i: int) -> Job:
+    """A transient Job with applications, work plan and invoice, as the agent dashboard loads it."""
+    created = datetime(2024, 1, 1)
+    job = Job(id=i, title=f"Job {i}", description="fence repair", budget=100.0,
+              status=JobStatus.ASSIGNED, agent_id=1, assigned_contractor_id=2, created_at=created)
+    job.applications = [
+        Application(id=i * 10 + k, job_id=i, contractor_id=k, proposed_cost=90.0,
+                    status=ApplicationStatus.REJECTED, created_at=created,
+                    contractor=User(id=k, name=f"Contractor {k}", role=UserRole.CONTRACTOR))
+        for k in range(5)
+    ]
+    job.work_plan = WorkPlan(id=i, job_id=i, contractor_id=2, plan_description="plan",
+                             status=WorkPlanStatus.IN_PROGRESS, created_at=created)
+    job.invoice = Invoice(id=i, job_id=i, contractor_id=2, amount=100.0, created_at=created)
+    return job
+
+
+def _recommender() -> JobRecommender:
+    rng = random.Random(1)
+    recommender = JobRecommender()
+    recommender.track(
+        (i, 1, " ".join(rng.sample(WORDS, 3)), " ".join(rng.choices(WORDS, k=20)))
+        for i in range(RECOMMENDED_JOBS)
+    )
+    return recommender
+
+
+def cases() -> dict[str, Callable[[], object]]:
+    stored = hash_password("bench-password")
+    token = create_access_token({"id": 1, "role": "AGENT"})
+    job_rows_page = [_job_row(i) for i in range(PAGE)]
+    job_dicts = job_rows.many(job_rows_page)
+    page_adapter = TypeAdapter(JobPage)
+    application_page = [_application_row(i) for i in range(PAGE)]
+    dashboard = [_dashboard_job(i) for i in range(20)]
+    recommender = _recommender()
+    skills = " ".join(WORDS[:4])
+
+    def decode_uncached():
+        token_cache.clear()
+        return decode_access_token(token)
+
+    return {
+        "hash_password": lambda: hash_password("bench-password"),
+        "verify_password": lambda: verify_password("bench-password", stored),
+        "create_access_token": lambda: create_access_token({"id": 1, "role": "AGENT"}),
+        "decode_access_token (cached)": lambda: decode_access_token(token),
+        "decode_access_token (uncached)": decode_uncached,
+        f"recommend top 20 ({RECOMMENDED_JOBS} jobs)": lambda: recommender.recommend(skills, 20),
+        "JobOut validate + dump_json": lambda: JobOut.model_validate(job_dicts[0]).model_dump_json(),
+        f"JobPage response_model ({PAGE} jobs)": lambda: page_adapter.dump_json(
+            page_adapter.validate_python({"items": job_dicts, "next_cursor": None})
+        ),
+        f"job_rows + orjson ({PAGE} jobs)": lambda: dumps(
+            {"items": job_rows.many(job_rows_page), "next_cursor": None}
+        ),
+        f"application_rows + orjson ({PAGE} with contractor)": lambda: dumps(
+            application_rows.many(application_page)
+        ),
+        "agent dashboard Serializer + orjson (20 jobs)": lambda: dumps(agent_dashboard_job.many(dashboard)),
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    """Best-of-`repeat` seconds per call."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(repeat: int = 5) -> dict[str, dict]:
+    return {name: {"us_per_op": round(measure(fn, repeat) * 1e6, 3)} for name, fn in cases().items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for name, result in run(args.repeat).items():
+        print(f"{name:<52} {result['us_per_op']:>12.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
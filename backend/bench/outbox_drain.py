@@ -0,0 +1,77 @@
+"""Drain a seeded outbox with several workers and check exactly-once effects.
+
+Inserts `--messages` outbox messages, runs `--workers` `python -m app.worker
+--once` processes against DATABASE_URL at the same time and reports the
+drain rate. Exits non-zero unless every message was processed and audited
+exactly once. More than one worker needs PostgreSQL: SQLite has no row
+locks for SKIP LOCKED to skip.
+
+    DATABASE_URL=postgresql://... python -m bench.outbox_drain --messages 20000 --workers 4
+"""
+import argparse
+import subprocess
+import sys
+import time
+import uuid
+
+from sqlalchemy import func, insert, select
+
+from app.database import engine
+from app.models import AuditRecord, Base, OutboxMessage
+from app.utils.outbox import queue_state
+
+
+def seed(count: int, run_id: str):
+    with engine.begin() as conn:
+        for start in range(0, count, 10000):
+            conn.execute(insert(OutboxMessage), [
+                {
+                    "idempotency_key": f"bench:{run_id}:{i}",
+                    "kind": "bench",
+                    "payload": {"n": i},
+                }
+                for i in range(start, min(start + 10000, count))
+            ])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    run_id = uuid.uuid4().hex[:8]
+    seed(args.messages, run_id)
+    with engine.connect() as conn:
+        depth, _, _ = queue_state(conn)
+    print(f"seeded {args.messages}; queue depth {depth}")
+
+    start = time.perf_counter()
+    workers = [
+        subprocess.Popen([sys.executable, "-m", "app.worker", "--once",
+                          "--batch-size", str(args.batch_size), "--poll-interval", "0.1"])
+        for _ in range(args.workers)
+    ]
+    codes = [worker.wait() for worker in workers]
+    elapsed = time.perf_counter() - start
+
+    with engine.connect() as conn:
+        keys = OutboxMessage.idempotency_key.like(f"bench:{run_id}:%")
+        processed = conn.execute(select(func.count()).where(
+            keys, OutboxMessage.processed_at.is_not(None)
+        )).scalar_one()
+        attempts = conn.execute(select(func.max(OutboxMessage.attempts)).where(keys)).scalar_one()
+        audited = conn.execute(select(func.count()).where(
+            AuditRecord.idempotency_key.like(f"bench:{run_id}:%")
+        )).scalar_one()
+
+    print(f"{args.workers} workers: {elapsed:.2f} s, {args.messages / elapsed:.0f} messages/s")
+    print(f"processed {processed}, audited {audited}, max attempts {attempts}, exit codes {codes}")
+    ok = processed == audited == args.messages and attempts == 1 and not any(codes)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
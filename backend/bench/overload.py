@@ -0,0 +1,100 @@
+"""Measure how admission control protects ordinary users from one abusive client.
+
+Starts a uvicorn server against DATABASE_URL twice, with ADMISSION_CONTROL
+off and then on. For `--seconds` each time, one contractor's script loops on
+GET /jobs/?search= over `--abusers` connections. Meanwhile `--users`
+contractors each send GET /applications/me every `--interval` seconds from
+another process, so the abusive client cannot delay their event loop.
+Reports the ordinary users' success rate and p50/p99 latency, and how the
+abusive client's requests were answered.
+
+    DATABASE_URL=sqlite:///bench.db python -m bench.overload --abusers 64 --users 20
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+from app.database import engine
+from app.models import UserRole
+from app.utils.jwt import create_access_token
+from bench.common import quantile, seed_jobs, seed_user, uvicorn_server
+from bench.seed import WORDS
+
+
+async def loop(client: httpx.AsyncClient, url, token: str, deadline: float, interval: float,
+               results: list[tuple[int | None, float]]):
+    """Send GET url() until `deadline`, starting one every `interval` seconds (0: back to back)."""
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            status = (await client.get(url(), headers=headers)).status_code
+        except httpx.TransportError:
+            status = None
+        elapsed = time.perf_counter() - start
+        results.append((status, elapsed))
+        if interval:
+            await asyncio.sleep(max(0.0, interval - elapsed))
+
+
+async def run(base_url: str, tokens: list[str], url, connections: int, seconds: float,
+              interval: float) -> list[tuple[int | None, float]]:
+    deadline = time.monotonic() + seconds
+    results: list = []
+    limits = httpx.Limits(max_connections=connections * len(tokens))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await asyncio.gather(*(loop(client, url, token, deadline, interval, results)
+                               for token in tokens for _ in range(connections)))
+    return results
+
+
+def abuse(base_url: str, token: str, connections: int, seconds: float) -> Counter:
+    """The abusive client; runs in its own process."""
+    rng = random.Random(0)
+    results = asyncio.run(run(base_url, [token], lambda: f"/jobs/?search={rng.choice(WORDS)}",
+                              connections, seconds, 0))
+    return Counter(status for status, _ in results)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--abusers", type=int, default=64, help="Connections of the abusive client.")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.2, help="Seconds between a user's requests.")
+    parser.add_argument("--max-in-flight", type=int, help="ADMISSION_MAX_IN_FLIGHT for the server.")
+    args = parser.parse_args()
+
+    seed_jobs(1000)
+    with engine.begin() as conn:
+        ids = [seed_user(conn, f"overload-{i}", UserRole.CONTRACTOR, "-") for i in range(args.users + 1)]
+    tokens = [create_access_token({"id": user_id, "role": UserRole.CONTRACTOR.value}) for user_id in ids]
+
+    print(f"{'admission':<10} {'user ok %':>10} {'user p50 ms':>12} {'user p99 ms':>12}  abusive client")
+    for enabled in (False, True):
+        env = {"ADMISSION_CONTROL": str(enabled).lower()}
+        if args.max_in_flight is not None:
+            env["ADMISSION_MAX_IN_FLIGHT"] = str(args.max_in_flight)
+        with uvicorn_server(**env) as base_url, \
+                ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            abusive = pool.submit(abuse, base_url, tokens[0], args.abusers, args.seconds)
+            ordinary = asyncio.run(run(base_url, tokens[1:], lambda: "/applications/me", 1,
+                                       args.seconds, args.interval))
+            answered = abusive.result()
+        latencies = sorted(elapsed for _, elapsed in ordinary)
+        ok = sum(status == 200 for status, _ in ordinary)
+        print(f"{'on' if enabled else 'off':<10} {100 * ok / max(len(ordinary), 1):>10.1f} "
+              f"{quantile(latencies, 0.50) * 1000:>12.1f} {quantile(latencies, 0.99) * 1000:>12.1f}  "
+              + ", ".join(f"{status}: {count}" for status, count in sorted(answered.items(), key=str)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
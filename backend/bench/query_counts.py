@@ -0,0 +1,148 @@
+"""Assert that per-request SQL statement counts do not grow with row counts.
+
+Seeds one scenario per `--sizes` value (a job with that many applicants,
+plus an assigned job with a work plan and invoice), drives the listing and
+approval paths and dashboards in-process and compares statement counts across sizes and
+against the budgets below. Exits non-zero on any N+1 regression.
+
+    DATABASE_URL=sqlite:///bench.db python -m bench.query_counts --sizes 5 500
+"""
+import argparse
+import sys
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from app.database import engine
+from app.main import app
+from app.models import (
+    Application, Base, Invoice, Job, JobStatus, User, UserRole, WorkPlan, WorkPlanStatus,
+)
+from app.utils.jwt import create_access_token
+from bench.common import count_queries, seed_user
+
+# Statements allowed per request, independent of how many rows are involved.
+# State transitions include one upsert per stats table they touch and, for
+# approvals and invoices, the outbox INSERT.
+BUDGETS = {
+    "GET /dashboard/agent": 4,
+    "GET /dashboard/contractor": 3,
+    "GET /applications/job/{id}": 2,
+    "GET /applications/me": 1,
+    "POST /applications/reject/{id}": 2,
+    "POST /applications/approve/{id}": 7,
+    "POST /applications/bulk": 8,
+    "GET /work-plans/{id}": 1,
+    "PATCH /work-plans/{id}": 3,
+    "POST /invoices/{id}": 7,
+    "PATCH /invoices/{id}/status": 6,
+    "GET /stats/agent/me": 1,
+    "GET /stats/contractor/me": 1,
+    "GET /stats/jobs/{id}": 1,
+    "POST /jobs/import": 2,
+    "GET /jobs/recommended": 2,
+}
+
+
+def seed(applicants: int) -> dict:
+    with engine.begin() as conn:
+        agent = seed_user(conn, "qc-agent", UserRole.AGENT, "-")
+        contractors = [seed_user(conn, f"qc-contractor-{i}", UserRole.CONTRACTOR, "-")
+                       for i in range(applicants)]
+        open_job = conn.execute(insert(Job).values(title="qc open", agent_id=agent)
+                                .returning(Job.id)).scalar_one()
+        app_ids = conn.execute(insert(Application).returning(Application.id), [
+            {"job_id": open_job, "contractor_id": c, "proposed_cost": 1.0} for c in contractors
+        ]).scalars().all()
+        bulk_job = conn.execute(insert(Job).values(title="qc bulk", agent_id=agent)
+                                .returning(Job.id)).scalar_one()
+        bulk_ids = conn.execute(insert(Application).returning(Application.id), [
+            {"job_id": bulk_job, "contractor_id": c, "proposed_cost": 1.0} for c in contractors
+        ]).scalars().all()
+
+        def assigned_job(title):
+            job_id = conn.execute(insert(Job).values(
+                title=title, agent_id=agent, status=JobStatus.ASSIGNED,
+                assigned_contractor_id=contractors[0],
+            ).returning(Job.id)).scalar_one()
+            conn.execute(insert(WorkPlan).values(
+                job_id=job_id, contractor_id=contractors[0], status=WorkPlanStatus.COMPLETED,
+            ))
+            return job_id
+
+        plan_job = assigned_job("qc planned")
+        paid_job = assigned_job("qc invoiced")
+        invoice = conn.execute(insert(Invoice).values(
+            job_id=paid_job, contractor_id=contractors[0], amount=1.0,
+        ).returning(Invoice.id)).scalar_one()
+        reader = conn.execute(insert(User).values(
+            name="qc-reader", role=UserRole.CONTRACTOR, password_hash="-", skills="qc import",
+        ).returning(User.id)).scalar_one()
+
+    token = lambda user_id, role: {
+        "Authorization": f"Bearer {create_access_token({'id': user_id, 'role': role})}"
+    }
+    return {
+        "agent": token(agent, "AGENT"),
+        "contractor": token(contractors[0], "CONTRACTOR"),
+        "open_job": open_job,
+        "applications": app_ids,
+        "bulk": [{"application_id": bulk_ids[0], "status": "APPROVED"}]
+        + [{"application_id": i, "status": "REJECTED"} for i in bulk_ids[1:]],
+        "plan_job": plan_job,
+        "invoice": invoice,
+        "import": [{"title": f"qc import {i}", "budget": i} for i in range(applicants)],
+        "reader": token(reader, "CONTRACTOR"),
+    }
+
+
+def measure(client: TestClient, s: dict) -> dict:
+    calls = {
+        "GET /dashboard/agent": ("get", "/dashboard/agent", s["agent"], None),
+        "GET /dashboard/contractor": ("get", "/dashboard/contractor", s["contractor"], None),
+        "GET /applications/job/{id}": ("get", f"/applications/job/{s['open_job']}", s["agent"], None),
+        "GET /applications/me": ("get", "/applications/me", s["contractor"], None),
+        "POST /applications/reject/{id}": ("post", f"/applications/reject/{s['applications'][-1]}", s["agent"], None),
+        "POST /applications/approve/{id}": ("post", f"/applications/approve/{s['applications'][0]}", s["agent"], None),
+        "POST /applications/bulk": ("post", "/applications/bulk", s["agent"], {"decisions": s["bulk"]}),
+        "GET /work-plans/{id}": ("get", f"/work-plans/{s['plan_job']}", s["contractor"], None),
+        "PATCH /work-plans/{id}": ("patch", f"/work-plans/{s['plan_job']}", s["contractor"], {"plan_description": "qc"}),
+        "POST /invoices/{id}": ("post", f"/invoices/{s['plan_job']}", s["contractor"], {"amount": 1.0}),
+        "PATCH /invoices/{id}/status": ("patch", f"/invoices/{s['invoice']}/status", s["agent"], {"status": "PAID"}),
+        "GET /stats/agent/me": ("get", "/stats/agent/me", s["agent"], None),
+        "GET /stats/contractor/me": ("get", "/stats/contractor/me", s["contractor"], None),
+        "GET /stats/jobs/{id}": ("get", f"/stats/jobs/{s['open_job']}", s["agent"], None),
+        "POST /jobs/import": ("post", "/jobs/import", s["agent"], s["import"]),
+        # After the import, which puts `applicants` matching jobs in the index.
+        "GET /jobs/recommended": ("get", "/jobs/recommended", s["reader"], None),
+    }
+    counts = {}
+    for name, (method, url, headers, body) in calls.items():
+        with count_queries() as queries:
+            response = client.request(method, url, headers=headers, json=body)
+        response.raise_for_status()
+        counts[name] = queries.count
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 500])
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with TestClient(app) as client:
+        results = {size: measure(client, seed(size)) for size in args.sizes}
+
+    failures = 0
+    print(f"{'endpoint':<34}" + "".join(f"{f'n={n}':>8}" for n in args.sizes) + f"{'budget':>8}")
+    for name, budget in BUDGETS.items():
+        counts = [results[n][name] for n in args.sizes]
+        ok = len(set(counts)) == 1 and counts[0] <= budget
+        failures += not ok
+        print(f"{name:<34}" + "".join(f"{c:>8}" for c in counts) + f"{budget:>8}" + ("" if ok else "  FAIL"))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
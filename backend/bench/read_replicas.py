@@ -0,0 +1,163 @@
+"""Check read-replica routing against two local databases.
+
+DATABASE_URL is the primary and `--replica-url` a second database standing in
+for its replica. Nothing replicates between them: the script copies the
+primary's rows into the replica when it wants them "caught up", so every
+later write shows up as replication lag. With a SQLite primary the replica
+defaults to a read-only copy next to it. The script starts a uvicorn server
+with both and checks that:
+
+* while the replica cannot be opened, reads fall back to the primary;
+* once it can, the health check returns it to the rotation;
+* a user who just wrote reads it back (sticky to the primary), while another
+  user's read of the same job comes from the lagging replica;
+* after REPLICA_STICKY_SECONDS the writer reads from the replica again.
+
+The first two steps need a SQLite replica, whose file can be removed. Exits
+non-zero on any failed check.
+
+    DATABASE_URL=sqlite:///primary.db python -m bench.read_replicas
+    DATABASE_URL=postgresql://.../app python -m bench.read_replicas --replica-url postgresql://.../replica
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+
+import httpx
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.engine import make_url
+
+from app.database import engine
+from app.models import Base, Job, UserRole
+from app.utils.jwt import create_access_token
+from bench.common import seed_user, uvicorn_server
+
+STICKY_SECONDS = 2
+CHECK_SECONDS = 0.5
+
+
+def default_replica_url(primary_url: str) -> str | None:
+    url = make_url(primary_url)
+    if url.get_backend_name() != "sqlite" or not url.database:
+        return None
+    root, ext = os.path.splitext(os.path.abspath(url.database))
+    return f"sqlite:///file:{root}-replica{ext or '.db'}?mode=ro&uri=true"
+
+
+def writable(replica_url: str):
+    """An engine that may write to the replica, for copying rows into it."""
+    url = make_url(replica_url)
+    return create_engine(url.set(query={k: v for k, v in url.query.items() if k != "mode"}))
+
+
+def sqlite_path(replica_url: str) -> str | None:
+    url = make_url(replica_url)
+    if url.get_backend_name() != "sqlite":
+        return None
+    return url.database.removeprefix("file:")
+
+
+def catch_up(replica):
+    """Make the replica an exact copy of the primary."""
+    Base.metadata.create_all(bind=replica)
+    with engine.connect() as source, replica.begin() as target:
+        for table in reversed(Base.metadata.sorted_tables):
+            target.execute(delete(table))
+        for table in Base.metadata.sorted_tables:
+            rows = source.execute(select(table)).mappings().all()
+            if rows:
+                target.execute(insert(table), [dict(row) for row in rows])
+
+
+def auth(user_id: int, role: UserRole) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'id': user_id, 'role': role.value})}"}
+
+
+async def replica_up(client: httpx.AsyncClient) -> bool:
+    text = (await client.get("/metrics")).text
+    return re.search(r'^db_replica_up\{replica="replica0"\} 1$', text, re.M) is not None
+
+
+async def wait_for(predicate, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if await predicate():
+            return True
+        await asyncio.sleep(0.1)
+    return False
+
+
+async def run(base_url: str, replica, path: str | None, agent: int, contractor: int) -> list[str]:
+    failures = []
+
+    def check(ok: bool, what: str):
+        print(f"  {'ok  ' if ok else 'FAIL'} {what}")
+        if not ok:
+            failures.append(what)
+
+    as_agent, as_contractor = auth(agent, UserRole.AGENT), auth(contractor, UserRole.CONTRACTOR)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        if path is not None:
+            with engine.begin() as conn:
+                job = conn.execute(insert(Job).values(title="replica fallback", agent_id=agent)
+                                   .returning(Job.id)).scalar_one()
+            check(not await replica_up(client), "replica that cannot be opened is out of rotation")
+            response = await client.get(f"/jobs/{job}", headers=as_contractor)
+            check(response.status_code == 200, "reads fall back to the primary")
+            catch_up(replica)
+            check(await wait_for(lambda: replica_up(client), CHECK_SECONDS * 10),
+                  "health check returns the replica to rotation")
+        else:
+            catch_up(replica)
+            check(await wait_for(lambda: replica_up(client), CHECK_SECONDS * 10), "replica is in rotation")
+
+        response = await client.post("/jobs/", headers=as_agent,
+                                     json={"title": "replica lag", "description": "-", "budget": 1})
+        response.raise_for_status()
+        job = response.json()["id"]
+        mine = [row["id"] for row in (await client.get("/jobs/agent/me", headers=as_agent)).json()]
+        check(job in mine, "the writer reads their write back")
+        response = await client.get(f"/jobs/{job}", headers=as_contractor)
+        check(response.status_code == 404, "another user's read is served by the lagging replica")
+
+        await asyncio.sleep(STICKY_SECONDS + 0.5)
+        mine = [row["id"] for row in (await client.get("/jobs/agent/me", headers=as_agent)).json()]
+        check(job not in mine, "after the sticky window the writer reads from the replica")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replica-url", default=default_replica_url(str(engine.url)),
+                        help="Second database; required unless DATABASE_URL is SQLite.")
+    args = parser.parse_args()
+    if not args.replica_url:
+        parser.error("--replica-url is required for a non-SQLite DATABASE_URL")
+
+    Base.metadata.create_all(bind=engine)
+    replica = writable(args.replica_url)
+    path = sqlite_path(args.replica_url)
+    if path is not None and os.path.exists(path):
+        replica.dispose()
+        os.remove(path)
+    with engine.begin() as conn:
+        agent = seed_user(conn, "replica-agent", UserRole.AGENT, "-")
+        contractor = seed_user(conn, "replica-contractor", UserRole.CONTRACTOR, "-")
+
+    env = {
+        "DATABASE_REPLICA_URLS": args.replica_url,
+        "REPLICA_STICKY_SECONDS": str(STICKY_SECONDS),
+        "REPLICA_CHECK_SECONDS": str(CHECK_SECONDS),
+    }
+    with uvicorn_server(**env) as base_url:
+        failures = asyncio.run(run(base_url, replica, path, agent, contractor))
+    replica.dispose()
+    print(f"{len(failures)} failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
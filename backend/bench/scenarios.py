@@ -0,0 +1,417 @@
+"""One request factory per API route, for bench.suite.
+
+Each `Scenario` turns a `Sample` of seeded rows into `n` calls to its route.
+Read routes pick their targets from the sample. Routes that change state
+first insert fresh fixtures (an open job with a pending application for
+every approval, and so on), so each call succeeds and repeated runs measure
+the same work. `missing_routes()` lists API routes that have no scenario.
+"""
+import functools
+import random
+from typing import Callable, NamedTuple
+
+from fastapi.routing import APIRoute
+from sqlalchemy import select
+
+from app.main import app
+from app.models import (
+    Application,
+    ApplicationStatus,
+    Invoice,
+    Job,
+    JobStatus,
+    User,
+    UserRole,
+    WorkPlan,
+    WorkPlanStatus,
+)
+from app.utils.jwt import create_access_token
+from bench.common import Call
+from bench.seed import PASSWORD, WORDS, insert_rows
+
+
+class Sample(NamedTuple):
+    agents: list[int]
+    contractors: list[int]
+    # (job_id, agent_id) of open jobs with pending applications
+    open_jobs: list[tuple[int, int]]
+    # (job_id, agent_id, contractor_id) of jobs with a work plan
+    planned_jobs: list[tuple[int, int, int]]
+    # (invoice_id, job_id, agent_id, contractor_id)
+    invoices: list[tuple[int, int, int, int]]
+
+
+def load_sample(conn, size: int = 500) -> Sample:
+    """Pick up to `size` rows of each kind from a seeded database."""
+    def rows(stmt):
+        return [tuple(row) for row in conn.execute(stmt.limit(size))]
+
+    sample = Sample(
+        agents=conn.execute(select(User.id).where(User.role == UserRole.AGENT).limit(size)).scalars().all(),
+        contractors=conn.execute(
+            select(User.id).where(User.role == UserRole.CONTRACTOR).limit(size)
+        ).scalars().all(),
+        open_jobs=rows(
+            select(Job.id, Job.agent_id).distinct()
+            .join(Application, Application.job_id == Job.id)
+            .where(Job.status == JobStatus.OPEN, Application.status == ApplicationStatus.SUBMITTED)
+        ),
+        planned_jobs=rows(
+            select(Job.id, Job.agent_id, WorkPlan.contractor_id).join(WorkPlan, WorkPlan.job_id == Job.id)
+        ),
+        invoices=rows(
+            select(Invoice.id, Job.id, Job.agent_id, Invoice.contractor_id)
+            .join(Job, Invoice.job_id == Job.id)
+        ),
+    )
+    empty = [name for name, values in sample._asdict().items() if not values]
+    if empty or len(sample.contractors) < 10:
+        raise RuntimeError(f"seed more data first; nothing found for {empty or ['contractors']}")
+    return sample
+
+
+@functools.cache
+def token(user_id: int, role: UserRole) -> str:
+    return create_access_token({"id": user_id, "role": role.value})
+
+
+def agent(user_id: int) -> str:
+    return token(user_id, UserRole.AGENT)
+
+
+def contractor(user_id: int) -> str:
+    return token(user_id, UserRole.CONTRACTOR)
+
+
+Build = Callable[[object, Sample, int, random.Random], list[Call]]
+
+
+class Scenario(NamedTuple):
+    route: str
+    build: Build
+    variant: str = ""
+    # The response never ends; time it to the first body chunk.
+    stream: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.route} [{self.variant}]" if self.variant else self.route
+
+
+SCENARIOS: list[Scenario] = []
+
+
+def scenario(route: str, variant: str = "", stream: bool = False):
+    def register(build: Build) -> Build:
+        SCENARIOS.append(Scenario(route, build, variant, stream))
+        return build
+    return register
+
+
+def missing_routes() -> list[str]:
+    covered = {s.route for s in SCENARIOS}
+    return sorted(
+        f"{method} {route.path}"
+        for route in app.routes if isinstance(route, APIRoute)
+        for method in route.methods
+        if f"{method} {route.path}" not in covered
+    )
+
+
+# --------------------
+# FIXTURES
+# --------------------
+def _jobs(conn, agent_id: int, n: int, contractor_id: int | None = None, status=JobStatus.OPEN):
+    return insert_rows(conn, Job, [
+        {"title": f"bench fixture {i}", "agent_id": agent_id, "budget": 100.0,
+         "status": status, "assigned_contractor_id": contractor_id}
+        for i in range(n)
+    ])
+
+
+def _applications(conn, pairs: list[tuple[int, int]]) -> list[int]:
+    return insert_rows(conn, Application, [
+        {"job_id": job_id, "contractor_id": contractor_id, "proposed_cost": 90.0}
+        for job_id, contractor_id in pairs
+    ])
+
+
+def _work_plans(conn, job_ids: list[int], contractor_id: int, status: WorkPlanStatus):
+    insert_rows(conn, WorkPlan, [
+        {"job_id": job_id, "contractor_id": contractor_id, "plan_description": "bench", "status": status}
+        for job_id in job_ids
+    ])
+
+
+# --------------------
+# AUTH
+# --------------------
+@scenario("POST /auth/register")
+def _register(conn, s, n, rng):
+    return [
+        Call("POST", "/auth/register", json={
+            "name": f"bench-register-{rng.getrandbits(48):x}", "role": "CONTRACTOR", "password": PASSWORD,
+        })
+        for _ in range(n)
+    ]
+
+
+@scenario("POST /auth/login")
+def _login(conn, s, n, rng):
+    users = s.agents + s.contractors
+    return [Call("POST", "/auth/login", json={"user_id": rng.choice(users), "password": PASSWORD})
+            for _ in range(n)]
+
+
+@scenario("GET /auth/me")
+def _me(conn, s, n, rng):
+    return [Call("GET", "/auth/me", contractor(rng.choice(s.contractors))) for _ in range(n)]
+
+
+# --------------------
+# JOBS
+# --------------------
+@scenario("POST /jobs/")
+def _create_job(conn, s, n, rng):
+    return [
+        Call("POST", "/jobs/", agent(rng.choice(s.agents)), json={
+            "title": " ".join(rng.sample(WORDS, 3)), "description": " ".join(rng.choices(WORDS, k=12)),
+            "budget": round(rng.uniform(50, 5000), 2),
+        })
+        for _ in range(n)
+    ]
+
+
+@scenario("POST /jobs/import", variant="100 rows, JSON")
+def _import_jobs(conn, s, n, rng):
+    return [
+        Call("POST", "/jobs/import", agent(rng.choice(s.agents)), json=[
+            {"title": " ".join(rng.sample(WORDS, 3)), "budget": round(rng.uniform(50, 5000), 2)}
+            for _ in range(100)
+        ])
+        for _ in range(n)
+    ]
+
+
+@scenario("GET /jobs/")
+def _list_jobs(conn, s, n, rng):
+    return [Call("GET", "/jobs/", params={"limit": 20}) for _ in range(n)]
+
+
+@scenario("GET /jobs/", variant="search")
+def _search_jobs(conn, s, n, rng):
+    return [Call("GET", "/jobs/", params={"search": rng.choice(WORDS), "limit": 20}) for _ in range(n)]
+
+
+@scenario("GET /jobs/recommended")
+def _recommended_jobs(conn, s, n, rng):
+    return [Call("GET", "/jobs/recommended", contractor(rng.choice(s.contractors)), params={"limit": 20})
+            for _ in range(n)]
+
+
+@scenario("GET /jobs/{job_id}")
+def _get_job(conn, s, n, rng):
+    return [Call("GET", f"/jobs/{rng.choice(s.open_jobs)[0]}") for _ in range(n)]
+
+
+@scenario("GET /jobs/assigned/me")
+def _assigned_jobs(conn, s, n, rng):
+    return [Call("GET", "/jobs/assigned/me", contractor(rng.choice(s.planned_jobs)[2])) for _ in range(n)]
+
+
+@scenario("GET /jobs/agent/me")
+def _agent_jobs(conn, s, n, rng):
+    return [Call("GET", "/jobs/agent/me", agent(rng.choice(s.agents))) for _ in range(n)]
+
+
+# --------------------
+# APPLICATIONS
+# --------------------
+@scenario("POST /applications/apply/{job_id}")
+def _apply(conn, s, n, rng):
+    # Fresh contractors, so no call hits the one-pending-application rule.
+    applicants = insert_rows(conn, User, [
+        {"name": f"bench-applicant-{i}", "role": UserRole.CONTRACTOR, "password_hash": "-"}
+        for i in range(n)
+    ])
+    return [
+        Call("POST", f"/applications/apply/{rng.choice(s.open_jobs)[0]}", contractor(user_id),
+             json={"proposed_cost": 90.0})
+        for user_id in applicants
+    ]
+
+
+@scenario("GET /applications/job/{job_id}")
+def _job_applications(conn, s, n, rng):
+    return [Call("GET", f"/applications/job/{job_id}", agent(agent_id))
+            for job_id, agent_id in (rng.choice(s.open_jobs) for _ in range(n))]
+
+
+@scenario("GET /applications/me")
+def _my_applications(conn, s, n, rng):
+    return [Call("GET", "/applications/me", contractor(rng.choice(s.contractors))) for _ in range(n)]
+
+
+def _pending(conn, s, n, rng) -> tuple[int, list[int]]:
+    agent_id = rng.choice(s.agents)
+    jobs = _jobs(conn, agent_id, n)
+    return agent_id, _applications(conn, [(job_id, rng.choice(s.contractors)) for job_id in jobs])
+
+
+@scenario("POST /applications/approve/{application_id}")
+def _approve(conn, s, n, rng):
+    agent_id, applications = _pending(conn, s, n, rng)
+    return [Call("POST", f"/applications/approve/{app_id}", agent(agent_id)) for app_id in applications]
+
+
+@scenario("POST /applications/reject/{application_id}")
+def _reject(conn, s, n, rng):
+    agent_id, applications = _pending(conn, s, n, rng)
+    return [Call("POST", f"/applications/reject/{app_id}", agent(agent_id)) for app_id in applications]
+
+
+@scenario("POST /applications/bulk", variant="1 approve + 9 reject")
+def _bulk(conn, s, n, rng):
+    agent_id = rng.choice(s.agents)
+    calls = []
+    for job_id in _jobs(conn, agent_id, n):
+        applications = _applications(conn, [(job_id, c) for c in rng.sample(s.contractors, 10)])
+        calls.append(Call("POST", "/applications/bulk", agent(agent_id), json={"decisions": [
+            {"application_id": app_id, "status": "APPROVED" if i == 0 else "REJECTED"}
+            for i, app_id in enumerate(applications)
+        ]}))
+    return calls
+
+
+# --------------------
+# WORK PLANS
+# --------------------
+def _assigned(conn, s, n, rng, plan: WorkPlanStatus | None = None) -> tuple[int, int, list[int]]:
+    agent_id, contractor_id = rng.choice(s.agents), rng.choice(s.contractors)
+    jobs = _jobs(conn, agent_id, n, contractor_id, JobStatus.ASSIGNED)
+    if plan is not None:
+        _work_plans(conn, jobs, contractor_id, plan)
+    return agent_id, contractor_id, jobs
+
+
+@scenario("POST /work-plans/{job_id}")
+def _create_plan(conn, s, n, rng):
+    _, contractor_id, jobs = _assigned(conn, s, n, rng)
+    return [Call("POST", f"/work-plans/{job_id}", contractor(contractor_id),
+                 json={"plan_description": "bench plan"}) for job_id in jobs]
+
+
+@scenario("PATCH /work-plans/{job_id}")
+def _update_plan(conn, s, n, rng):
+    _, contractor_id, jobs = _assigned(conn, s, n, rng, WorkPlanStatus.NOT_STARTED)
+    return [Call("PATCH", f"/work-plans/{job_id}", contractor(contractor_id),
+                 json={"status": "IN_PROGRESS"}) for job_id in jobs]
+
+
+@scenario("GET /work-plans/{job_id}")
+def _get_plan(conn, s, n, rng):
+    return [Call("GET", f"/work-plans/{job_id}", contractor(contractor_id))
+            for job_id, _, contractor_id in (rng.choice(s.planned_jobs) for _ in range(n))]
+
+
+@scenario("GET /work-plans/agent-view/{job_id}")
+def _get_plan_as_agent(conn, s, n, rng):
+    return [Call("GET", f"/work-plans/agent-view/{job_id}", agent(agent_id))
+            for job_id, agent_id, _ in (rng.choice(s.planned_jobs) for _ in range(n))]
+
+
+# --------------------
+# INVOICES
+# --------------------
+@scenario("POST /invoices/{job_id}")
+def _submit_invoice(conn, s, n, rng):
+    _, contractor_id, jobs = _assigned(conn, s, n, rng, WorkPlanStatus.COMPLETED)
+    return [Call("POST", f"/invoices/{job_id}", contractor(contractor_id), json={"amount": 100.0})
+            for job_id in jobs]
+
+
+@scenario("PATCH /invoices/{invoice_id}/status")
+def _invoice_status(conn, s, n, rng):
+    agent_id, contractor_id, jobs = _assigned(conn, s, n, rng, WorkPlanStatus.COMPLETED)
+    invoices = insert_rows(conn, Invoice, [
+        {"job_id": job_id, "contractor_id": contractor_id, "amount": 100.0} for job_id in jobs
+    ])
+    return [Call("PATCH", f"/invoices/{invoice_id}/status", agent(agent_id), json={"status": "APPROVED"})
+            for invoice_id in invoices]
+
+
+@scenario("GET /invoices/job/{job_id}")
+def _job_invoice(conn, s, n, rng):
+    return [Call("GET", f"/invoices/job/{job_id}", agent(agent_id))
+            for _, job_id, agent_id, _ in (rng.choice(s.invoices) for _ in range(n))]
+
+
+@scenario("GET /invoices/job/{job_id}/me")
+def _my_job_invoice(conn, s, n, rng):
+    return [Call("GET", f"/invoices/job/{job_id}/me", contractor(contractor_id))
+            for _, job_id, _, contractor_id in (rng.choice(s.invoices) for _ in range(n))]
+
+
+@scenario("GET /invoices/me")
+def _my_invoices(conn, s, n, rng):
+    return [Call("GET", "/invoices/me", contractor(rng.choice(s.invoices)[3])) for _ in range(n)]
+
+
+# --------------------
+# DASHBOARDS, EXPORTS, STATS
+# --------------------
+@scenario("GET /dashboard/agent")
+def _agent_dashboard(conn, s, n, rng):
+    return [Call("GET", "/dashboard/agent", agent(rng.choice(s.agents))) for _ in range(n)]
+
+
+@scenario("GET /dashboard/contractor")
+def _contractor_dashboard(conn, s, n, rng):
+    return [Call("GET", "/dashboard/contractor", contractor(rng.choice(s.planned_jobs)[2]))
+            for _ in range(n)]
+
+
+def _export(path: str, fmt: str) -> Build:
+    def build(conn, s, n, rng):
+        return [Call("GET", path, agent(rng.choice(s.agents)), params={"format": fmt}) for _ in range(n)]
+    return build
+
+
+for _path in ("/exports/jobs", "/exports/applications", "/exports/invoices"):
+    scenario(f"GET {_path}", variant="ndjson")(_export(_path, "ndjson"))
+
+
+@scenario("GET /stats/agent/me")
+def _agent_stats(conn, s, n, rng):
+    return [Call("GET", "/stats/agent/me", agent(rng.choice(s.agents))) for _ in range(n)]
+
+
+@scenario("GET /stats/contractor/me")
+def _contractor_stats(conn, s, n, rng):
+    return [Call("GET", "/stats/contractor/me", contractor(rng.choice(s.contractors))) for _ in range(n)]
+
+
+@scenario("GET /stats/jobs/{job_id}")
+def _job_stats(conn, s, n, rng):
+    return [Call("GET", f"/stats/jobs/{job_id}", agent(agent_id))
+            for job_id, agent_id in (rng.choice(s.open_jobs) for _ in range(n))]
+
+
+@scenario("GET /events", stream=True)
+def _events(conn, s, n, rng):
+    return [Call("GET", "/events", contractor(rng.choice(s.contractors))) for _ in range(n)]
+
+
+@scenario("GET /metrics")
+def _metrics(conn, s, n, rng):
+    return [Call("GET", "/metrics") for _ in range(n)]
+
+
+@scenario("GET /health/live")
+def _health_live(conn, s, n, rng):
+    return [Call("GET", "/health/live") for _ in range(n)]
+
+
+@scenario("GET /health/ready")
+def _health_ready(conn, s, n, rng):
+    return [Call("GET", "/health/ready") for _ in range(n)]
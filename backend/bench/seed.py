@@ -0,0 +1,180 @@
+"""Bulk-seed a database with users, jobs, applications, work plans and invoices.
+
+Rows are generated from `--seed`, so the same arguments produce the same
+data, and written with chunked multi-row INSERTs instead of through the API.
+Every user's password is PASSWORD. The data follows the application's
+rules:
+- open jobs have only pending applications;
+- an assigned job has exactly one approved application, from its contractor,
+  and the rest are rejected;
+- work plans and invoices exist only for assigned jobs;
+- an invoiced job is completed.
+
+The stats tables are rebuilt at the end.
+
+    DATABASE_URL=sqlite:///bench.db python -m bench.seed --jobs 100000 --contractors 5000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import insert
+
+from app.database import engine
+from app.models import (
+    Application,
+    ApplicationStatus,
+    Base,
+    Invoice,
+    InvoiceStatus,
+    Job,
+    JobStatus,
+    User,
+    UserRole,
+    WorkPlan,
+    WorkPlanStatus,
+)
+from app.utils import stats
+from app.utils.security import hash_password
+
+PASSWORD = "bench-password"
+CHUNK = 5000
+
+WORDS = (
+    "paint fence roof repair kitchen bathroom garden tile floor window door wiring plumbing "
+    "deck patio gutter drywall cabinet lighting insulation driveway shed stairs basement"
+).split()
+
+
+class Volumes(NamedTuple):
+    agents: int = 20
+    contractors: int = 200
+    jobs: int = 2000
+    # Mean applications per job; each job gets between 0 and twice as many.
+    applications: int = 4
+    # Share of jobs with an approved contractor.
+    assigned: float = 0.4
+
+
+def insert_rows(conn, model, rows: list[dict]) -> list[int]:
+    """Insert `rows` in chunks and return their ids in order."""
+    ids = []
+    stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+    for start in range(0, len(rows), CHUNK):
+        ids.extend(conn.execute(stmt, rows[start:start + CHUNK]).scalars())
+    return ids
+
+
+def seed(conn, volumes: Volumes, rng: random.Random) -> dict[str, int]:
+    """Insert `volumes` worth of rows through `conn` and return the counts."""
+    password_hash = hash_password(PASSWORD)
+    now = datetime.utcnow()
+
+    def created():
+        return now - timedelta(seconds=rng.uniform(0, 90 * 86400))
+
+    def users(role: UserRole, count: int) -> list[int]:
+        prefix = role.value.lower()
+        return insert_rows(conn, User, [
+            {"name": f"bench-{prefix}-{i}", "role": role, "password_hash": password_hash,
+             "skills": " ".join(rng.sample(WORDS, 3)), "created_at": created()}
+            for i in range(count)
+        ])
+
+    agents = users(UserRole.AGENT, volumes.agents)
+    contractors = users(UserRole.CONTRACTOR, volumes.contractors)
+
+    # Decide each job's stage up front, since job status depends on it.
+    plans = {}     # job index -> work plan status
+    invoices = {}  # job index -> invoice status
+    jobs, assignees = [], {}
+    for i in range(volumes.jobs):
+        job = {
+            "title": " ".join(rng.sample(WORDS, 3)).capitalize(),
+            "description": " ".join(rng.choices(WORDS, k=12)),
+            "budget": round(rng.uniform(50, 5000), 2),
+            "agent_id": rng.choice(agents),
+            "status": JobStatus.OPEN,
+            "assigned_contractor_id": None,
+            "created_at": created(),
+        }
+        if contractors and rng.random() < volumes.assigned:
+            assignees[i] = rng.choice(contractors)
+            job.update(status=JobStatus.ASSIGNED, assigned_contractor_id=assignees[i])
+            if rng.random() < 0.7:
+                plans[i] = rng.choice(list(WorkPlanStatus))
+                if plans[i] == WorkPlanStatus.COMPLETED and rng.random() < 0.7:
+                    invoices[i] = rng.choice(list(InvoiceStatus))
+                    job["status"] = JobStatus.COMPLETED
+        jobs.append(job)
+    job_ids = insert_rows(conn, Job, jobs)
+
+    applications = []
+    for i, job_id in enumerate(job_ids):
+        count = min(rng.randint(0, 2 * volumes.applications), len(contractors))
+        applicants = rng.sample(contractors, count)
+        assignee = assignees.get(i)
+        if assignee is not None and assignee not in applicants:
+            applicants.append(assignee)
+        for contractor_id in applicants:
+            if assignee is None:
+                status = ApplicationStatus.SUBMITTED
+            elif contractor_id == assignee:
+                status = ApplicationStatus.APPROVED
+            else:
+                status = ApplicationStatus.REJECTED
+            applications.append({
+                "job_id": job_id, "contractor_id": contractor_id, "status": status,
+                "proposed_cost": round(jobs[i]["budget"] * rng.uniform(0.7, 1.1), 2),
+                "created_at": jobs[i]["created_at"] + timedelta(hours=rng.uniform(0, 72)),
+            })
+    insert_rows(conn, Application, applications)
+
+    insert_rows(conn, WorkPlan, [
+        {"job_id": job_ids[i], "contractor_id": assignees[i], "status": status,
+         "plan_description": " ".join(rng.choices(WORDS, k=20))}
+        for i, status in plans.items()
+    ])
+    insert_rows(conn, Invoice, [
+        {"job_id": job_ids[i], "contractor_id": assignees[i], "status": status,
+         "amount": jobs[i]["budget"]}
+        for i, status in invoices.items()
+    ])
+    stats.rebuild(conn)
+    return {
+        "users": len(agents) + len(contractors),
+        "jobs": len(job_ids),
+        "applications": len(applications),
+        "work_plans": len(plans),
+        "invoices": len(invoices),
+    }
+
+
+def main():
+    defaults = Volumes()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=defaults.agents)
+    parser.add_argument("--contractors", type=int, default=defaults.contractors)
+    parser.add_argument("--jobs", type=int, default=defaults.jobs)
+    parser.add_argument("--applications", type=int, default=defaults.applications,
+                        help="Mean applications per job.")
+    parser.add_argument("--assigned", type=float, default=defaults.assigned,
+                        help="Share of jobs with an approved contractor.")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    volumes = Volumes(args.agents, args.contractors, args.jobs, args.applications, args.assigned)
+    Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        counts = seed(conn, volumes, random.Random(args.seed))
+    elapsed = time.perf_counter() - start
+    rows = sum(counts.values())
+    print(", ".join(f"{count} {table}" for table, count in counts.items()))
+    print(f"{rows} rows in {elapsed:.1f} s ({rows / elapsed:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Compare µs/row of the list endpoints' serialization paths.
+
+"model" is what FastAPI does with a response_model: load ORM objects,
+validate them into the schema with from_attributes and dump to JSON.
+"rows" is the fast path the list endpoints use: select the schema's columns,
+build dicts with a prebuilt RowSerializer and encode with orjson. Both are
+timed with and without the query itself, for jobs and for applications
+with their nested contractor.
+
+    DATABASE_URL=sqlite:///bench.db python -m bench.serialization --rows 10000
+"""
+import argparse
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, joinedload
+
+from app.database import engine
+from app.models import Application, Base, Job, User, UserRole
+from app.schemas import ApplicationOut, JobOut
+from app.utils.serialization import application_rows, dumps, job_rows
+from bench.common import seed_jobs, seed_user
+
+
+def seed_applications(job_ids: list[int]):
+    """One application per job, so the pending-application unique index holds."""
+    with engine.begin() as conn:
+        if conn.execute(select(func.count()).select_from(Application)).scalar_one() >= len(job_ids):
+            return
+        contractor = seed_user(conn, "bench-serializer", UserRole.CONTRACTOR, "-")
+        conn.execute(insert(Application), [
+            {"job_id": job_id, "contractor_id": contractor, "proposed_cost": job_id}
+            for job_id in job_ids
+        ])
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(name: str, rows: int, repeat: int, model_query, model_schema, row_query, serializer):
+    adapter = TypeAdapter(list[model_schema])
+
+    def model_path(objs):
+        return adapter.dump_json(adapter.validate_python(objs, from_attributes=True))
+
+    def row_path(found):
+        return dumps(serializer.many(found))
+
+    with Session(engine) as session:
+        objs = session.scalars(model_query).unique().all()
+        found = session.execute(row_query).all()
+        assert len(objs) == len(found) == rows, (len(objs), len(found))
+        results = {
+            "model, encode only": best_of(repeat, lambda: model_path(objs)),
+            "rows, encode only": best_of(repeat, lambda: row_path(found)),
+        }
+
+    def end_to_end(query, scalars, encode):
+        def run():
+            with Session(engine) as session:
+                result = session.scalars(query).unique() if scalars else session.execute(query)
+                encode(result.all())
+        return run
+
+    results["model, query + encode"] = best_of(repeat, end_to_end(model_query, True, model_path))
+    results["rows, query + encode"] = best_of(repeat, end_to_end(row_query, False, row_path))
+
+    print(f"{name} ({rows} rows, best of {repeat})")
+    for label, seconds in results.items():
+        print(f"  {label:<24} {seconds / rows * 1e6:8.2f} µs/row")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    seed_applications(seed_jobs(args.rows))
+
+    compare(
+        "jobs", args.rows, args.repeat,
+        select(Job).order_by(Job.id).limit(args.rows), JobOut,
+        select(*job_rows.columns).order_by(Job.id).limit(args.rows), job_rows,
+    )
+    compare(
+        "applications", args.rows, args.repeat,
+        select(Application).options(joinedload(Application.contractor))
+        .order_by(Application.id).limit(args.rows),
+        ApplicationOut,
+        select(*application_rows.columns).join(User, Application.contractor_id == User.id)
+        .order_by(Application.id).limit(args.rows),
+        application_rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Measure how long the app takes to import and how long a server takes to become ready.
+
+Import time is the best of `--repeat` runs of `python -c "import app.main"`,
+less the same for `python -c pass`. `--importtime N` also lists the N
+slowest modules by cumulative import time (python -X importtime).
+
+Time to ready is measured from launching a server against DATABASE_URL
+until GET /health/ready answers 200 on its port, for three profiles:
+uvicorn with one worker, and gunicorn.conf.py with `--workers` workers with
+and without GUNICORN_PRELOAD. Exits non-zero if a server never becomes
+ready, or if one takes longer than `--budget-ms`.
+
+    DATABASE_URL=sqlite:///bench.db python -m bench.startup --repeat 5 --importtime 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from app.database import engine
+from app.models import Base
+from bench.common import free_port
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=BACKEND, capture_output=True, text=True, check=True)
+
+
+def import_ms(repeat: int) -> float:
+    def best(code: str) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _run_python("-c", code)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    return (best("import app.main") - best("pass")) * 1000
+
+
+def slowest_imports(count: int) -> list[tuple[int, str]]:
+    """(cumulative µs, module) of the `count` slowest top-level imports."""
+    lines = _run_python("-X", "importtime", "-c", "import app.main").stderr.splitlines()
+    rows = []
+    for line in lines:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    # Only the first levels of the import tree, so deep dependencies are not listed twice.
+    depth = min(len(name) - len(name.lstrip()) for _, name in rows)
+    top = [(us, name.strip()) for us, name in rows
+           if len(name) - len(name.lstrip()) <= depth + 2 and name.strip() != "app.main"]
+    return sorted(top, reverse=True)[:count]
+
+
+def profiles(workers: int, port: int) -> dict[str, tuple[list[str], dict]]:
+    gunicorn = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"]
+    env = {"PORT": str(port), "WEB_CONCURRENCY": str(workers)}
+    return {
+        "uvicorn": ([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+                     "--log-level", "warning"], {}),
+        f"gunicorn x{workers}, preload": (gunicorn, {**env, "GUNICORN_PRELOAD": "true"}),
+        f"gunicorn x{workers}, no preload": (gunicorn, {**env, "GUNICORN_PRELOAD": "false"}),
+    }
+
+
+def ready_ms(command: list[str], env: dict, port: int, timeout: float) -> float | None:
+    start = time.perf_counter()
+    server = subprocess.Popen(command, cwd=BACKEND, env=dict(os.environ, **env),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                if server.poll() is not None:
+                    return None
+                try:
+                    if client.get("/health/ready").status_code == 200:
+                        return (time.perf_counter() - start) * 1000
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        return None
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=2, help="Gunicorn workers.")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N",
+                        help="List the N slowest imports.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for each server.")
+    parser.add_argument("--budget-ms", type=float, help="Fail if a server takes longer to become ready.")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    print(f"{'import app.main':<32} {import_ms(args.repeat):>10.0f} ms")
+    for us, name in slowest_imports(args.importtime) if args.importtime else []:
+        print(f"  {name:<30} {us / 1000:>10.0f} ms")
+
+    failed = False
+    port = free_port()
+    for name, (command, env) in profiles(args.workers, port).items():
+        timings = [ready_ms(command, env, port, args.timeout) for _ in range(args.repeat)]
+        if None in timings:
+            print(f"{name:<32} {'never ready':>13}")
+            failed = True
+            continue
+        best = min(timings)
+        over = args.budget_ms is not None and best > args.budget_ms
+        failed |= over
+        print(f"{name:<32} {best:>10.0f} ms{'  over budget' if over else ''}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Benchmark every API route in-process and under multi-process load.
+
+Seeds DATABASE_URL with bench.seed (unless `--no-seed`), then runs each
+route scenario from bench.scenarios for `--requests` calls after `--warmup`
+discarded ones, and reports throughput and p50/p95/p99 latency per route in
+two modes:
+- "in-process" sends requests one at a time through httpx's ASGI
+  transport, in this process. It measures the application's own cost
+  without sockets. Streaming routes are skipped here because the transport
+  waits for the whole body.
+- "load" starts `--server-workers` uvicorn workers. `--clients` client
+  processes drive them with `--concurrency` connections each.
+
+Results are written to `--output` as JSON with the commit and settings they
+were measured with; `python -m bench.compare old.json new.json` shows
+regressions. The run fails if a route has no scenario.
+
+    DATABASE_URL=sqlite:///bench.db python -m bench.suite --jobs 20000 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import httpx
+
+from app.database import DB_ASYNC, engine
+from app.main import app
+from app.models import Base
+from bench import micro
+from bench.common import drive, drive_process, summarize, uvicorn_server
+from bench.scenarios import SCENARIOS, load_sample, missing_routes
+from bench.seed import Volumes, seed
+
+
+def build_calls(scenarios, args) -> dict[str, tuple[list, list]]:
+    """(warm-up calls, measured calls) per scenario, fixtures included."""
+    rng = random.Random(args.seed)
+    calls = {}
+    with engine.begin() as conn:
+        sample = load_sample(conn)
+        for s in scenarios:
+            built = s.build(conn, sample, args.warmup + args.requests, rng)
+            calls[s.name] = (built[:args.warmup], built[args.warmup:])
+    return calls
+
+
+async def run_in_process(scenarios, calls) -> dict[str, dict]:
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for s in scenarios:
+                if s.stream:
+                    continue
+                warmup, measured = calls[s.name]
+                await drive(client, warmup)
+                start = time.perf_counter()
+                latencies, errors = await drive(client, measured)
+                results[s.name] = summarize(latencies, errors, time.perf_counter() - start)
+                report("in-process", s.name, results[s.name])
+    return results
+
+
+def run_load(scenarios, calls, args) -> dict[str, dict]:
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    with uvicorn_server(workers=args.server_workers) as base_url, \
+            ProcessPoolExecutor(args.clients, mp_context=context) as pool:
+        for s in scenarios:
+            warmup, measured = calls[s.name]
+            shares = [measured[i::args.clients] for i in range(args.clients)]
+            list(pool.map(drive_process, [base_url] * args.clients,
+                          [warmup[i::args.clients] for i in range(args.clients)],
+                          [args.concurrency] * args.clients, [s.stream] * args.clients))
+            start = time.perf_counter()
+            outcomes = list(pool.map(drive_process, [base_url] * args.clients, shares,
+                                     [args.concurrency] * args.clients, [s.stream] * args.clients))
+            elapsed = time.perf_counter() - start
+            latencies = [latency for found, _ in outcomes for latency in found]
+            errors = [error for _, failed in outcomes for error in failed]
+            results[s.name] = summarize(latencies, errors, elapsed)
+            report("load", s.name, results[s.name])
+    return results
+
+
+def report(mode: str, name: str, r: dict):
+    line = (f"{mode:<10} {name:<52} {r['rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+            f"{r['p99_ms']:>8.2f} {r['errors']:>6}")
+    print(line + (f"  {r['first_error']}" if r["errors"] else ""), flush=True)
+
+
+def commit() -> str | None:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    defaults = Volumes()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("in-process", "load", "both"), default="both")
+    parser.add_argument("--only", help="Run only scenarios whose name contains this text.")
+    parser.add_argument("--requests", type=int, default=200, help="Measured calls per route.")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--server-workers", type=int, default=2)
+    parser.add_argument("--clients", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=16, help="Connections per client process.")
+    parser.add_argument("--micro", action="store_true", help="Also run bench.micro.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--no-seed", action="store_true", help="Use the data already in the database.")
+    parser.add_argument("--agents", type=int, default=defaults.agents)
+    parser.add_argument("--contractors", type=int, default=defaults.contractors)
+    parser.add_argument("--jobs", type=int, default=defaults.jobs)
+    parser.add_argument("--applications", type=int, default=defaults.applications)
+    parser.add_argument("--assigned", type=float, default=defaults.assigned)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    missing = missing_routes()
+    if missing:
+        print("routes without a scenario in bench.scenarios:", *missing, sep="\n  ")
+        return 2
+
+    Base.metadata.create_all(bind=engine)
+    if not args.no_seed:
+        volumes = Volumes(args.agents, args.contractors, args.jobs, args.applications, args.assigned)
+        with engine.begin() as conn:
+            counts = seed(conn, volumes, random.Random(args.seed))
+        print("seeded", ", ".join(f"{count} {table}" for table, count in counts.items()))
+
+    scenarios = [s for s in SCENARIOS if not args.only or args.only in s.name]
+    results = {
+        "meta": {
+            "commit": commit(),
+            "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "database": engine.dialect.name,
+            "db_async": DB_ASYNC,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        },
+    }
+    print(f"{'mode':<10} {'route':<52} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    if args.mode in ("in-process", "both"):
+        results["in-process"] = asyncio.run(run_in_process(scenarios, build_calls(scenarios, args)))
+    if args.mode in ("load", "both"):
+        results["load"] = run_load(scenarios, build_calls(scenarios, args), args)
+    if args.micro:
+        results["micro"] = micro.run()
+        for name, r in results["micro"].items():
+            print(f"{'micro':<10} {name:<52} {r['us_per_op']:>12.2f} µs")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"wrote {args.output}")
+    failed = sum(r["errors"] for mode in ("in-process", "load") for r in results.get(mode, {}).values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Production server profile: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported once in the master (`preload_app`), and workers fork
+from it. Each worker then only runs the lifespan hook (warm-up), which
+keeps a respawned or newly scaled worker's cold start short. WEB_CONCURRENCY
+overrides the worker count, which otherwise is the number of CPUs this
+container may use: its CPU affinity, capped by any cgroup CPU quota.
+Each worker has its own database pool, so budget
+WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) server connections.
+
+State kept per process, such as the "local" event bus and response cache,
+only reaches the worker that wrote it; with more than one worker, the
+master logs an error at start-up for each such setting.
+"""
+import math
+import os
+
+
+def available_cpus() -> int:
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    quota = None
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            limit, period = f.read().split()
+        if limit != "max":
+            quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            # cgroup v1
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                limit = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if limit > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return cpus
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY") or available_cpus())
+if workers > 1:
+    # A per-worker cache is only invalidated in the worker that wrote, so
+    # default to no cache; set CACHE_BACKEND=redis to share one. This runs
+    # before the app is imported, so the workers inherit it.
+    os.environ.setdefault("CACHE_BACKEND", "none")
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() in ("1", "true", "yes")
+# Seconds a worker gets after SIGTERM: DRAIN_DELAY_SECONDS plus in-flight requests.
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+accesslog = os.getenv("ACCESS_LOG") or None
+
+
+def per_worker_state() -> list[str]:
+    """Settings that keep state in each worker, which several workers do not share."""
+    problems = []
+    if os.getenv("EVENTS_BACKEND", "local").lower() == "local":
+        problems.append("EVENTS_BACKEND=local: event streams only receive events "
+                        "published by the worker they are connected to; use postgres")
+    cache_backend = os.getenv("CACHE_BACKEND", "local").lower()
+    if cache_backend == "local":
+        problems.append("CACHE_BACKEND=local: after a write, the other workers serve "
+                        "old job pages for up to CACHE_TTL; use redis or none")
+    if os.getenv("DATABASE_REPLICA_URLS") and cache_backend != "redis":
+        problems.append("DATABASE_REPLICA_URLS without CACHE_BACKEND=redis: a user who "
+                        "just wrote may read from a lagging replica on another worker")
+    return problems
+
+
+def on_starting(server):
+    if workers > 1:
+        for problem in per_worker_state():
+            server.log.error("%d workers with per-worker state: %s", workers, problem)
+
+
+def post_fork(server, worker):
+    # Connections opened in the master while preloading must not be shared.
+    from app.database import async_engine, engine, replica_engines
+
+    async_engines = [async_engine, *(replica.async_engine for replica in replica_engines)]
+    for sync_engine in [engine, *(replica.engine for replica in replica_engines),
+                        *(e.sync_engine for e in async_engines if e is not None)]:
+        sync_engine.dispose(close=False)
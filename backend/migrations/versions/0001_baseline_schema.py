@@ -0,0 +1,98 @@
+"""Baseline schema
+
+Tables as originally created by Base.metadata.create_all. Databases that
+were bootstrapped that way should run `alembic stamp 0001` once, then
+`alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+user_role = sa.Enum("AGENT", "CONTRACTOR", name="userrole")
+job_status = sa.Enum("OPEN", "ASSIGNED", "COMPLETED", "CANCELLED", name="jobstatus")
+application_status = sa.Enum(
+    "SUBMITTED", "APPROVED", "REJECTED", "WITHDRAWN", name="applicationstatus"
+)
+work_plan_status = sa.Enum("NOT_STARTED", "IN_PROGRESS", "COMPLETED", name="workplanstatus")
+invoice_status = sa.Enum("SUBMITTED", "APPROVED", "PAID", name="invoicestatus")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("role", user_role, nullable=False),
+        sa.Column("password_hash", sa.String(256), nullable=False),
+        sa.Column("email", sa.String(200), nullable=True, unique=True),
+        sa.Column("contact_number", sa.String(50), nullable=True),
+        sa.Column("skills", sa.Text(), nullable=True),
+        sa.Column("education", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("budget", sa.Float(), nullable=True),
+        sa.Column("status", job_status, nullable=True),
+        sa.Column("agent_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("assigned_contractor_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "applications",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id"), nullable=False),
+        sa.Column("contractor_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("proposed_cost", sa.Float(), nullable=True),
+        sa.Column("status", application_status, nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "work_plans",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id"), nullable=True, unique=True),
+        sa.Column("contractor_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("plan_description", sa.Text(), nullable=True),
+        sa.Column("start_date", sa.Date(), nullable=True),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("status", work_plan_status, nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "invoices",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id"), nullable=True, unique=True),
+        sa.Column("contractor_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("status", invoice_status, nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("invoices")
+    op.drop_table("work_plans")
+    op.drop_table("applications")
+    op.drop_table("jobs")
+    op.drop_table("users")
+    bind = op.get_bind()
+    for enum in (invoice_status, work_plan_status, application_status, job_status, user_role):
+        enum.drop(bind, checkfirst=True)
@@ -0,0 +1,62 @@
+"""Indexes for router query predicates
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GET /jobs/: status = OPEN ordered by the (created_at, id) keyset
+    op.create_index("ix_jobs_status_created_at", "jobs", ["status", "created_at", "id"])
+    # GET /jobs/agent/me and agent ownership checks
+    op.create_index("ix_jobs_agent_id", "jobs", ["agent_id"])
+    # GET /jobs/assigned/me
+    op.create_index(
+        "ix_jobs_assigned_contractor_status", "jobs", ["assigned_contractor_id", "status"]
+    )
+    # GET /jobs/?search= full-text matching
+    if op.get_bind().dialect.name == "postgresql":
+        op.create_index(
+            "ix_jobs_search_document",
+            "jobs",
+            [sa.text(
+                "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+            )],
+            postgresql_using="gin",
+        )
+    # duplicate-application check and GET /applications/job/{job_id}
+    op.create_index(
+        "ix_applications_job_contractor_status",
+        "applications",
+        ["job_id", "contractor_id", "status"],
+    )
+    # GET /applications/me
+    op.create_index("ix_applications_contractor_id", "applications", ["contractor_id"])
+    # GET /invoices/me
+    op.create_index("ix_invoices_contractor_id", "invoices", ["contractor_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_invoices_contractor_id", table_name="invoices")
+    op.drop_index("ix_applications_contractor_id", table_name="applications")
+    op.drop_index("ix_applications_job_contractor_status", table_name="applications")
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_jobs_search_document", table_name="jobs")
+    op.drop_index("ix_jobs_assigned_contractor_status", table_name="jobs")
+    op.drop_index("ix_jobs_agent_id", table_name="jobs")
+    op.drop_index("ix_jobs_status_created_at", table_name="jobs")
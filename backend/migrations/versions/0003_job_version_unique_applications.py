@@ -0,0 +1,48 @@
+"""Job version column and one pending application per contractor and job
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "jobs", sa.Column("version", sa.Integer(), nullable=False, server_default="0")
+    )
+    # Duplicates left behind by the old check-then-insert race: keep the
+    # earliest pending application and withdraw the rest.
+    op.execute(
+        "UPDATE applications SET status = 'WITHDRAWN' "
+        "WHERE status = 'SUBMITTED' AND id NOT IN ("
+        "SELECT MIN(id) FROM applications WHERE status = 'SUBMITTED' "
+        "GROUP BY job_id, contractor_id)"
+    )
+    op.create_index(
+        "uq_applications_job_contractor_submitted",
+        "applications",
+        ["job_id", "contractor_id"],
+        unique=True,
+        postgresql_where=sa.text("status = 'SUBMITTED'"),
+        sqlite_where=sa.text("status = 'SUBMITTED'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_applications_job_contractor_submitted", table_name="applications")
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_column("version")
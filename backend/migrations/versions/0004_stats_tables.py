@@ -0,0 +1,93 @@
+"""Incrementally maintained agent, contractor and job stats
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _counter(name: str, type_=sa.Integer()) -> sa.Column:
+    return sa.Column(name, type_, nullable=False, server_default="0")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "agent_stats",
+        sa.Column("agent_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        _counter("open_jobs"),
+        _counter("assigned_jobs"),
+        _counter("completed_jobs"),
+        _counter("applications_received"),
+    )
+    op.create_table(
+        "contractor_stats",
+        sa.Column("contractor_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        _counter("applications_submitted"),
+        _counter("assigned_jobs"),
+        _counter("completed_jobs"),
+        _counter("completed_work_plans"),
+        _counter("invoices_submitted"),
+        _counter("invoiced_amount", sa.Float()),
+        _counter("paid_amount", sa.Float()),
+    )
+    op.create_table(
+        "job_stats",
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id"), primary_key=True),
+        _counter("applications"),
+    )
+
+    # Backfill; same totals as `python -m app.manage rebuild-stats`.
+    op.execute(
+        "INSERT INTO agent_stats "
+        "(agent_id, open_jobs, assigned_jobs, completed_jobs, applications_received) "
+        "SELECT j.agent_id, "
+        "SUM(CASE WHEN j.status = 'OPEN' THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN j.status = 'ASSIGNED' THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN j.status = 'COMPLETED' THEN 1 ELSE 0 END), "
+        "COALESCE(SUM(a.n), 0) "
+        "FROM jobs j LEFT JOIN "
+        "(SELECT job_id, COUNT(*) AS n FROM applications GROUP BY job_id) a ON a.job_id = j.id "
+        "GROUP BY j.agent_id"
+    )
+    op.execute(
+        "INSERT INTO contractor_stats "
+        "(contractor_id, applications_submitted, assigned_jobs, completed_jobs, "
+        "completed_work_plans, invoices_submitted, invoiced_amount, paid_amount) "
+        "SELECT u.id, "
+        "(SELECT COUNT(*) FROM applications a WHERE a.contractor_id = u.id), "
+        "(SELECT COUNT(*) FROM jobs j WHERE j.assigned_contractor_id = u.id "
+        "AND j.status = 'ASSIGNED'), "
+        "(SELECT COUNT(*) FROM jobs j WHERE j.assigned_contractor_id = u.id "
+        "AND j.status = 'COMPLETED'), "
+        "(SELECT COUNT(*) FROM work_plans w WHERE w.contractor_id = u.id "
+        "AND w.status = 'COMPLETED'), "
+        "(SELECT COUNT(*) FROM invoices i WHERE i.contractor_id = u.id), "
+        "(SELECT COALESCE(SUM(i.amount), 0) FROM invoices i WHERE i.contractor_id = u.id), "
+        "(SELECT COALESCE(SUM(i.amount), 0) FROM invoices i WHERE i.contractor_id = u.id "
+        "AND i.status = 'PAID') "
+        "FROM users u WHERE u.role = 'CONTRACTOR'"
+    )
+    op.execute(
+        "INSERT INTO job_stats (job_id, applications) "
+        "SELECT job_id, COUNT(*) FROM applications GROUP BY job_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("job_stats")
+    op.drop_table("contractor_stats")
+    op.drop_table("agent_stats")
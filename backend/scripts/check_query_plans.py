@@ -0,0 +1,154 @@
+"""Fail if any router query plans a sequential scan.
+
+Drives every endpoint once through the ASGI app against DATABASE_URL,
+then scrapes /metrics and runs one outbox worker batch and queue-depth
+query, records the SQL each one emits, and runs EXPLAIN on every filtered
+statement. Point it at a scratch database that has been migrated with
+`alembic upgrade head`; it seeds its own rows.
+
+    DATABASE_URL=postgresql://... python -m scripts.check_query_plans
+"""
+import json
+import re
+import sys
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import SessionLocal, async_engine, engine
+from app.main import app
+from app.utils.outbox import process_batch, queue_state
+
+_WHERE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+
+
+def capture_statements(client: TestClient) -> list[tuple[str, str, object]]:
+    captured = []
+    current = {"route": None}
+    # Metrics collectors and the worker use the sync engine even in DB_ASYNC mode.
+    engines = {engine}
+    if async_engine is not None:
+        engines.add(async_engine.sync_engine)
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and _WHERE.search(statement):
+            captured.append((current["route"], statement, parameters))
+
+    def call(method, url, **kwargs):
+        current["route"] = f"{method.upper()} {url}"
+        response = client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    for listened in engines:
+        event.listen(listened, "before_cursor_execute", _record)
+    try:
+        _drive_endpoints(call)
+        current["route"] = "GET /metrics"
+        client.get("/metrics").raise_for_status()
+        current["route"] = "outbox worker"
+        with SessionLocal() as session:
+            process_batch(session, 100)
+        with engine.connect() as conn:
+            queue_state(conn)
+    finally:
+        for listened in engines:
+            event.remove(listened, "before_cursor_execute", _record)
+    return captured
+
+
+def _drive_endpoints(call):
+    suffix = uuid.uuid4().hex[:8]
+
+    def register(role):
+        user = call("post", "/auth/register", json={
+            "name": f"plan-check-{role.lower()}-{suffix}",
+            "role": role,
+            "password": "plan-check",
+            "skills": f"plan check {suffix}",
+        })
+        token = call("post", "/auth/login", json={"user_id": user["id"], "password": "plan-check"})
+        return {"Authorization": f"Bearer {token['access_token']}"}
+
+    agent = register("AGENT")
+    contractor = register("CONTRACTOR")
+
+    job = call("post", "/jobs/", headers=agent, json={"title": f"plan check {suffix}", "budget": 10})
+    job_id = job["id"]
+    call("get", "/jobs/")
+    call("get", "/jobs/", params={"search": suffix, "min_budget": 1})
+    call("get", f"/jobs/{job_id}")
+    call("get", "/jobs/agent/me", headers=agent)
+    call("get", "/jobs/recommended", headers=contractor)
+
+    application = call("post", f"/applications/apply/{job_id}", headers=contractor, json={"proposed_cost": 9})
+    call("get", f"/applications/job/{job_id}", headers=agent)
+    call("get", "/applications/me", headers=contractor)
+    call("post", f"/applications/approve/{application['id']}", headers=agent)
+    call("get", "/jobs/assigned/me", headers=contractor)
+
+    call("post", f"/work-plans/{job_id}", headers=contractor, json={"plan_description": "plan check"})
+    call("patch", f"/work-plans/{job_id}", headers=contractor, json={"status": "COMPLETED"})
+    call("get", f"/work-plans/{job_id}", headers=contractor)
+    call("get", f"/work-plans/agent-view/{job_id}", headers=agent)
+
+    invoice = call("post", f"/invoices/{job_id}", headers=contractor, json={"amount": 9})
+    call("patch", f"/invoices/{invoice['id']}/status", headers=agent, json={"status": "PAID"})
+    call("get", f"/invoices/job/{job_id}", headers=agent)
+    call("get", f"/invoices/job/{job_id}/me", headers=contractor)
+    call("get", "/invoices/me", headers=contractor)
+    call("get", "/auth/me", headers=agent)
+
+    call("get", "/stats/agent/me", headers=agent)
+    call("get", "/stats/contractor/me", headers=contractor)
+    call("get", f"/stats/jobs/{job_id}", headers=agent)
+
+
+def sequential_scans(conn, statement: str, parameters) -> list[str]:
+    if conn.dialect.name == "postgresql":
+        # With seq scans priced out, any that remain have no usable index.
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return [f"Seq Scan on {node['Relation Name']}" for node in _walk(plan[0]["Plan"])
+                if node["Node Type"] == "Seq Scan"]
+
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in rows
+            if row[-1].startswith("SCAN ") and " USING " not in row[-1]
+            and not row[-1].startswith("SCAN CONSTANT")]
+
+
+def _walk(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _walk(child)
+
+
+def main() -> int:
+    with TestClient(app) as client:
+        captured = capture_statements(client)
+
+    failures = []
+    seen = set()
+    with engine.connect() as conn:
+        for route, statement, parameters in captured:
+            if statement in seen:
+                continue
+            seen.add(statement)
+            with conn.begin() as trans:
+                scans = sequential_scans(conn, statement, parameters)
+                trans.rollback()
+            if scans:
+                failures.append((route, statement, scans))
+
+    for route, statement, scans in failures:
+        print(f"{route}: {', '.join(scans)}\n    {' '.join(statement.split())}\n")
+    print(f"checked {len(seen)} statements, {len(failures)} with sequential scans")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Write .br and .gz variants of the built frontend's text files.
+
+SPAFiles (app/utils/static.py) serves these to clients that accept them, so
+the assets are compressed once, at the highest levels, instead of per
+request. The Dockerfile runs it on the copied Vite build:
+
+    python -m scripts.precompress static
+
+Files under --min-bytes are skipped, and so is any variant that would not be
+smaller than its original. Without the `brotli` package only .gz files are
+written.
+"""
+import argparse
+import gzip
+import os
+import sys
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+EXTENSIONS = frozenset({
+    ".html", ".js", ".mjs", ".css", ".svg", ".json", ".map", ".txt", ".xml", ".webmanifest", ".wasm",
+})
+
+
+def encoders():
+    yield ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", lambda data: brotli.compress(data, quality=11)
+
+
+def precompress(directory: str, min_bytes: int) -> tuple[int, int, dict[str, int]]:
+    """Compress every eligible file.
+
+    Returns the number of files, their total size, and per suffix the bytes a
+    client accepting it downloads (the original where no variant was kept).
+    """
+    files, original, served = 0, 0, {}
+    for root, _, names in os.walk(directory):
+        for name in sorted(names):
+            if os.path.splitext(name)[1].lower() not in EXTENSIONS:
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) < min_bytes:
+                continue
+            files += 1
+            original += len(data)
+            for suffix, encode in encoders():
+                compressed = encode(data)
+                served.setdefault(suffix, 0)
+                if len(compressed) >= len(data):
+                    served[suffix] += len(data)
+                    continue
+                with open(path + suffix, "wb") as f:
+                    f.write(compressed)
+                served[suffix] += len(compressed)
+    return files, original, served
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--min-bytes", type=int, default=1024)
+    args = parser.parse_args()
+    if not os.path.isdir(args.directory):
+        parser.error(f"{args.directory} is not a directory")
+
+    files, original, served = precompress(args.directory, args.min_bytes)
+    print(f"compressed {files} files, {original} bytes: "
+          + ", ".join(f"{suffix} {size} bytes" for suffix, size in served.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""Run the suite against a throwaway SQLite database migrated to head.
+
+The environment is set before anything imports app.database, which reads it
+at import time. The invariants checked here also have Postgres benchmarks in
+bench/ and scripts/, run by hand against a real server.
+"""
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="job-contractor-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["RECOMMEND_INDEX_PATH"] = ""
+os.environ["CACHE_BACKEND"] = "none"
+os.environ["ADMISSION_CONTROL"] = "false"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+import pytest  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="session")
+def client():
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    command.upgrade(config, "head")
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,32 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select
+
+from app.database import engine
+from app.models import Application, ApplicationStatus, Job, JobStatus
+from bench.approval_race import seed
+
+PARALLEL = 100
+
+
+def test_parallel_approvals_have_one_winner(client):
+    s = seed(PARALLEL, round_no=0)
+
+    def approve(application_id):
+        return client.post(f"/applications/approve/{application_id}", headers=s["agent"]).status_code
+
+    with ThreadPoolExecutor(PARALLEL) as pool:
+        codes = list(pool.map(approve, s["contended"]))
+
+    with engine.connect() as conn:
+        job = conn.execute(select(Job.status, Job.assigned_contractor_id)
+                           .where(Job.id == s["contended_job"])).one()
+        approved = conn.execute(select(Application.contractor_id).where(
+            Application.job_id == s["contended_job"],
+            Application.status == ApplicationStatus.APPROVED,
+        )).scalars().all()
+
+    assert codes.count(200) == 1, codes
+    assert set(codes) <= {200, 400, 409}, codes
+    assert job.status == JobStatus.ASSIGNED
+    assert approved == [job.assigned_contractor_id]
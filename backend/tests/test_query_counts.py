@@ -0,0 +1,15 @@
+import pytest
+
+from bench.query_counts import BUDGETS, measure, seed
+
+
+@pytest.fixture(scope="module")
+def counts(client):
+    return {size: measure(client, seed(size)) for size in (5, 500)}
+
+
+@pytest.mark.parametrize("endpoint", list(BUDGETS))
+def test_statement_count_is_constant(counts, endpoint):
+    few, many = counts[5][endpoint], counts[500][endpoint]
+    assert few == many, f"{endpoint}: {few} statements for 5 rows, {many} for 500"
+    assert many <= BUDGETS[endpoint], f"{endpoint}: {many} statements, budget {BUDGETS[endpoint]}"
@@ -0,0 +1,20 @@
+from app.database import engine
+from scripts.check_query_plans import capture_statements, sequential_scans
+
+
+def test_no_statement_scans_a_table(client):
+    captured = capture_statements(client)
+    assert captured
+
+    scans = {}
+    with engine.connect() as conn:
+        for route, statement, parameters in captured:
+            if statement in scans:
+                continue
+            with conn.begin() as trans:
+                scans[statement] = (route, sequential_scans(conn, statement, parameters))
+                trans.rollback()
+
+    failures = [f"{route}: {', '.join(found)}\n    {' '.join(statement.split())}"
+                for statement, (route, found) in scans.items() if found]
+    assert not failures, "\n".join(failures)
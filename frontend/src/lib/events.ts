@@ -0,0 +1,31 @@
+import { API_BASE_URL } from './api';
+
+export type StatusEventType = 'application' | 'job' | 'work_plan' | 'invoice' | 'resync';
+
+export interface StatusEvent {
+  id?: number;
+  job_id?: number;
+  status?: string;
+  amount?: number;
+}
+
+const EVENT_TYPES: StatusEventType[] = ['application', 'job', 'work_plan', 'invoice', 'resync'];
+
+// Subscribe to the server's status-change stream; returns the unsubscribe function.
+export function subscribeToEvents(onEvent: (type: StatusEventType, data: StatusEvent) => void): () => void {
+  const token = localStorage.getItem('token');
+  if (!token) return () => {};
+
+  // EventSource cannot send an Authorization header.
+  const source = new EventSource(`${API_BASE_URL}/events?access_token=${encodeURIComponent(token)}`);
+  const listener = (event: MessageEvent) => onEvent(event.type as StatusEventType, JSON.parse(event.data));
+  EVENT_TYPES.forEach((type) => source.addEventListener(type, listener));
+
+  // Events missed while disconnected are not replayed, so a reconnect means reload.
+  let connected = false;
+  source.onopen = () => {
+    if (connected) onEvent('resync', {});
+    connected = true;
+  };
+  return () => source.close();
+}
@@ -1,78 +1,45 @@
 import React, { useState, useEffect } from 'react';
 import Layout from '../components/Layout';
 import api from '../lib/api';
-import type { Job, Application, WorkPlan, Invoice } from '../types';
+import { subscribeToEvents } from '../lib/events';
+import type { AgentDashboardJob, Application, Job, WorkPlan, Invoice, Page } from '../types';
 import { JobStatus } from '../types';
 
 const AgentDashboard: React.FC = () => {
   const [jobs, setJobs] = useState<Job[]>([]);
   const [selectedJob, setSelectedJob] = useState<number | null>(null);
-  const [applications, setApplications] = useState<Application[]>([]);
   const [showCreateJob, setShowCreateJob] = useState(false);
   const [newJob, setNewJob] = useState({ title: '', description: '', budget: '' });
   const [workPlans, setWorkPlans] = useState<Record<number, WorkPlan | null>>({});
   const [invoices, setInvoices] = useState<Record<number, Invoice | null>>({});
   const [expandedJobId, setExpandedJobId] = useState<number | null>(null);
-  const [loadingDetails, setLoadingDetails] = useState<Record<number, boolean>>({});
+  const [jobsCursor, setJobsCursor] = useState<string | null>(null);
+  const [applicationsByJob, setApplicationsByJob] = useState<Record<number, Application[]>>({});
 
   useEffect(() => {
     fetchJobs();
+    // Applications, work plans and invoices arrive as events instead of polling.
+    return subscribeToEvents(() => fetchJobs());
   }, []);
 
-  const fetchJobs = async () => {
+  const fetchJobs = async (cursor: string | null = null) => {
     try {
-      const response = await api.get('/jobs/agent/me');
-      setJobs(response.data);
+      const response = await api.get<Page<AgentDashboardJob>>('/dashboard/agent', {
+        params: { cursor: cursor || undefined },
+      });
+      const items = response.data.items;
+      setJobs((prev) => (cursor ? [...prev, ...items] : items));
+      setJobsCursor(response.data.next_cursor);
+      setApplicationsByJob((prev) => ({ ...prev, ...Object.fromEntries(items.map((job) => [job.id, job.applications])) }));
+      setWorkPlans((prev) => ({ ...prev, ...Object.fromEntries(items.map((job) => [job.id, job.work_plan])) }));
+      setInvoices((prev) => ({ ...prev, ...Object.fromEntries(items.map((job) => [job.id, job.invoice])) }));
     } catch (error) {
       console.error('Failed to fetch jobs:', error);
     }
   };
 
-  const fetchApplications = async (jobId: number) => {
-    try {
-      const response = await api.get(`/applications/job/${jobId}`);
-      setApplications(response.data);
-      setSelectedJob(jobId);
-    } catch (error) {
-      console.error('Failed to fetch applications:', error);
-    }
-  };
-
-  const fetchWorkPlan = async (jobId: number) => {
-    try {
-      const response = await api.get(`/work-plans/agent-view/${jobId}`);
-      setWorkPlans((prev) => ({ ...prev, [jobId]: response.data }));
-    } catch (error: any) {
-      if (error?.response?.status === 404) {
-        setWorkPlans((prev) => ({ ...prev, [jobId]: null }));
-      } else {
-        console.error('Failed to fetch work plan:', error);
-      }
-    }
-  };
-
-  const fetchInvoice = async (jobId: number) => {
-    try {
-      const response = await api.get(`/invoices/job/${jobId}`);
-      setInvoices((prev) => ({ ...prev, [jobId]: response.data }));
-    } catch (error: any) {
-      if (error?.response?.status === 404) {
-        setInvoices((prev) => ({ ...prev, [jobId]: null }));
-      } else {
-        console.error('Failed to fetch invoice:', error);
-      }
-    }
-  };
-
-  const toggleJobDetails = async (jobId: number) => {
-    if (expandedJobId === jobId) {
-      setExpandedJobId(null);
-      return;
-    }
-    setExpandedJobId(jobId);
-    setLoadingDetails((prev) => ({ ...prev, [jobId]: true }));
-    await Promise.all([fetchWorkPlan(jobId), fetchInvoice(jobId)]);
-    setLoadingDetails((prev) => ({ ...prev, [jobId]: false }));
+  const toggleJobDetails = (jobId: number) => {
+    setExpandedJobId(expandedJobId === jobId ? null : jobId);
   };
 
   const handleCreateJob = async (e: React.FormEvent) => {
@@ -95,7 +62,6 @@ const AgentDashboard: React.FC = () => {
     try {
       await api.post(`/applications/approve/${applicationId}`);
       fetchJobs();
-      if (selectedJob) fetchApplications(selectedJob);
     } catch (error) {
       console.error('Failed to approve application:', error);
     }
@@ -104,12 +70,14 @@ const AgentDashboard: React.FC = () => {
   const handleRejectApplication = async (applicationId: number) => {
     try {
       await api.post(`/applications/reject/${applicationId}`);
-      if (selectedJob) fetchApplications(selectedJob);
+      fetchJobs();
     } catch (error) {
       console.error('Failed to reject application:', error);
     }
   };
 
+  const applications = selectedJob ? applicationsByJob[selectedJob] || [] : [];
+
   return (
     <Layout>
       <div className="container" style={{ margin: 'var(--spacing-xl) auto' }}>
@@ -203,7 +171,7 @@ const AgentDashboard: React.FC = () => {
                   </div>
                   {job.status === JobStatus.OPEN && (
                     <button
-                      onClick={() => fetchApplications(job.id)}
+                      onClick={() => setSelectedJob(job.id)}
                       className="btn btn-outline"
                       style={{ marginTop: '1rem', fontSize: '0.9rem', padding: '0.4rem 0.8rem' }}
                     >
@@ -223,63 +191,66 @@ const AgentDashboard: React.FC = () => {
 
                   {expandedJobId === job.id && (
                     <div style={{ marginTop: '1rem', paddingTop: '1rem', borderTop: '1px solid var(--border-color)', display: 'grid', gap: 'var(--spacing-md)' }}>
-                      {loadingDetails[job.id] ? (
-                        <p style={{ color: 'var(--text-muted)' }}>Loading details...</p>
-                      ) : (
-                        <>
-                          <div style={{
-                            backgroundColor: 'var(--bg-secondary)',
-                            padding: 'var(--spacing-md)',
-                            borderRadius: 'var(--radius-md)',
-                            border: '1px solid var(--border-color)'
-                          }}>
-                            <h4 style={{ fontWeight: 'bold', marginBottom: '0.5rem' }}>Work Plan</h4>
-                            {workPlans[job.id] ? (
-                              <div style={{ display: 'grid', gap: '0.35rem', fontSize: '0.95rem' }}>
-                                <p><strong>Description:</strong> {workPlans[job.id]?.plan_description}</p>
-                                <p>
-                                  <strong>Start:</strong> {workPlans[job.id]?.start_date || 'N/A'} | <strong>End:</strong> {workPlans[job.id]?.end_date || 'N/A'}
-                                </p>
-                                <p><strong>Status:</strong> {workPlans[job.id]?.status}</p>
-                              </div>
-                            ) : (
-                              <p style={{ color: 'var(--text-muted)' }}>No work plan submitted yet.</p>
-                            )}
+                      <div style={{
+                        backgroundColor: 'var(--bg-secondary)',
+                        padding: 'var(--spacing-md)',
+                        borderRadius: 'var(--radius-md)',
+                        border: '1px solid var(--border-color)'
+                      }}>
+                        <h4 style={{ fontWeight: 'bold', marginBottom: '0.5rem' }}>Work Plan</h4>
+                        {workPlans[job.id] ? (
+                          <div style={{ display: 'grid', gap: '0.35rem', fontSize: '0.95rem' }}>
+                            <p><strong>Description:</strong> {workPlans[job.id]?.plan_description}</p>
+                            <p>
+                              <strong>Start:</strong> {workPlans[job.id]?.start_date || 'N/A'} | <strong>End:</strong> {workPlans[job.id]?.end_date || 'N/A'}
+                            </p>
+                            <p><strong>Status:</strong> {workPlans[job.id]?.status}</p>
                           </div>
+                        ) : (
+                          <p style={{ color: 'var(--text-muted)' }}>No work plan submitted yet.</p>
+                        )}
+                      </div>
 
-                          <div style={{
-                            backgroundColor: 'var(--bg-secondary)',
-                            padding: 'var(--spacing-md)',
-                            borderRadius: 'var(--radius-md)',
-                            border: '1px solid var(--border-color)'
-                          }}>
-                            <h4 style={{ fontWeight: 'bold', marginBottom: '0.5rem' }}>Invoice</h4>
-                            {invoices[job.id] ? (
-                              <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', fontSize: '0.95rem' }}>
-                                <div>
-                                  <p><strong>Amount:</strong> ${invoices[job.id]?.amount.toFixed(2)}</p>
-                                  <p><strong>Status:</strong> {invoices[job.id]?.status}</p>
-                                </div>
-                                <span style={{
-                                  padding: '0.3rem 0.6rem',
-                                  borderRadius: 'var(--radius-sm)',
-                                  backgroundColor: 'var(--color-tan)',
-                                  fontSize: '0.85rem'
-                                }}>
-                                  Invoice Submitted
-                                </span>
-                              </div>
-                            ) : (
-                              <p style={{ color: 'var(--text-muted)' }}>No invoice submitted yet.</p>
-                            )}
+                      <div style={{
+                        backgroundColor: 'var(--bg-secondary)',
+                        padding: 'var(--spacing-md)',
+                        borderRadius: 'var(--radius-md)',
+                        border: '1px solid var(--border-color)'
+                      }}>
+                        <h4 style={{ fontWeight: 'bold', marginBottom: '0.5rem' }}>Invoice</h4>
+                        {invoices[job.id] ? (
+                          <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', fontSize: '0.95rem' }}>
+                            <div>
+                              <p><strong>Amount:</strong> ${invoices[job.id]?.amount.toFixed(2)}</p>
+                              <p><strong>Status:</strong> {invoices[job.id]?.status}</p>
+                            </div>
+                            <span style={{
+                              padding: '0.3rem 0.6rem',
+                              borderRadius: 'var(--radius-sm)',
+                              backgroundColor: 'var(--color-tan)',
+                              fontSize: '0.85rem'
+                            }}>
+                              Invoice Submitted
+                            </span>
                           </div>
-                        </>
-                      )}
+                        ) : (
+                          <p style={{ color: 'var(--text-muted)' }}>No invoice submitted yet.</p>
+                        )}
+                      </div>
                     </div>
                   )}
                 </div>
               ))}
             </div>
+            {jobsCursor && (
+              <button
+                onClick={() => fetchJobs(jobsCursor)}
+                className="btn btn-secondary"
+                style={{ marginTop: 'var(--spacing-md)' }}
+              >
+                Load more
+              </button>
+            )}
           </div>
 
           {selectedJob && (
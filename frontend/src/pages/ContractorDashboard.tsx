@@ -1,36 +1,58 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import Layout from '../components/Layout';
 import api from '../lib/api';
-import type { Job, Application, WorkPlan, Invoice } from '../types';
+import { subscribeToEvents } from '../lib/events';
+import type { ContractorDashboardJob, Job, Application, WorkPlan, Invoice, Page } from '../types';
 import { WorkPlanStatus } from '../types';
 
 
 const ContractorDashboard: React.FC = () => {
   const [activeTab, setActiveTab] = useState<'browse' | 'applications' | 'assigned'>('browse');
   const [openJobs, setOpenJobs] = useState<Job[]>([]);
+  const [openJobsCursor, setOpenJobsCursor] = useState<string | null>(null);
   const [myApplications, setMyApplications] = useState<Application[]>([]);
   const [assignedJobs, setAssignedJobs] = useState<Job[]>([]);
+  const [assignedJobsCursor, setAssignedJobsCursor] = useState<string | null>(null);
   const [workPlans, setWorkPlans] = useState<Record<number, WorkPlan | null>>({});
   const [invoicesByJob, setInvoicesByJob] = useState<Record<number, Invoice | null>>({});
   const [workPlanForm, setWorkPlanForm] = useState<Record<number, { plan_description: string; start_date: string; end_date: string }>>({});
   const [workPlanStatusChoice, setWorkPlanStatusChoice] = useState<Record<number, WorkPlanStatus>>({});
   const [invoiceAmounts, setInvoiceAmounts] = useState<Record<number, string>>({});
   const [expandedJobId, setExpandedJobId] = useState<number | null>(null);
-  const [loadingDetails, setLoadingDetails] = useState<Record<number, boolean>>({});
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedJob, setSelectedJob] = useState<number | null>(null);
   const [proposedCost, setProposedCost] = useState('');
 
+  const activeTabRef = useRef(activeTab);
+
+  const refreshTab = (tab: typeof activeTab) => {
+    if (tab === 'browse') fetchOpenJobs();
+    else if (tab === 'applications') fetchMyApplications();
+    else if (tab === 'assigned') fetchAssignedJobs();
+  };
+
   useEffect(() => {
-    if (activeTab === 'browse') fetchOpenJobs();
-    else if (activeTab === 'applications') fetchMyApplications();
-    else if (activeTab === 'assigned') fetchAssignedJobs();
+    activeTabRef.current = activeTab;
+    refreshTab(activeTab);
   }, [activeTab]);
 
-  const fetchOpenJobs = async () => {
+  // Approvals, rejections and invoice payments arrive as events instead of polling.
+  useEffect(() => subscribeToEvents(() => refreshTab(activeTabRef.current)), []);
+
+  // The search the listed jobs, and so their cursor, belong to.
+  const openJobsQueryRef = useRef('');
+
+  // Refreshes (events, tab switches, applying) and Load more keep the listed
+  // search, read through the ref so the event subscription's first-render
+  // closure sees it too; only the Search button passes the box's term.
+  const fetchOpenJobs = async (cursor: string | null = null, query: string = openJobsQueryRef.current) => {
     try {
-      const response = await api.get('/jobs/', { params: { search: searchTerm } });
-      setOpenJobs(response.data);
+      const response = await api.get<Page<Job>>('/jobs/', {
+        params: { search: query || undefined, cursor: cursor || undefined },
+      });
+      openJobsQueryRef.current = query;
+      setOpenJobs((prev) => (cursor ? [...prev, ...response.data.items] : response.data.items));
+      setOpenJobsCursor(response.data.next_cursor);
     } catch (error) {
       console.error('Failed to fetch jobs:', error);
     }
@@ -45,49 +67,33 @@ const ContractorDashboard: React.FC = () => {
     }
   };
 
-  const fetchAssignedJobs = async () => {
+  const fetchAssignedJobs = async (cursor: string | null = null) => {
     try {
-      const response = await api.get('/jobs/assigned/me');
-      setAssignedJobs(response.data);
+      const response = await api.get<Page<ContractorDashboardJob>>('/dashboard/contractor', {
+        params: { limit: 200, cursor: cursor || undefined },
+      });
+      const items = response.data.items;
+      // A first page replaces what is listed; later pages add to it.
+      const kept = <T,>(prev: Record<number, T>): Record<number, T> => (cursor ? prev : {});
+      setAssignedJobs((prev) => (cursor ? [...prev, ...items] : items));
+      setAssignedJobsCursor(response.data.next_cursor);
+      setWorkPlans((prev) => ({ ...kept(prev), ...Object.fromEntries(items.map((job) => [job.id, job.work_plan])) }));
+      setInvoicesByJob((prev) => ({ ...kept(prev), ...Object.fromEntries(items.map((job) => [job.id, job.invoice])) }));
+      const withPlan = items.filter((job) => job.work_plan);
+      setWorkPlanStatusChoice((prev) => ({
+        ...kept(prev),
+        ...Object.fromEntries(withPlan.map((job) => [job.id, job.work_plan!.status])),
+      }));
+      const withInvoice = items.filter((job) => job.invoice);
+      setInvoiceAmounts((prev) => ({
+        ...kept(prev),
+        ...Object.fromEntries(withInvoice.map((job) => [job.id, job.invoice!.amount.toString()])),
+      }));
     } catch (error) {
       console.error('Failed to fetch assigned jobs:', error);
     }
   };
 
-  const loadWorkPlan = async (jobId: number) => {
-    try {
-      const response = await api.get(`/work-plans/${jobId}`);
-      setWorkPlans((prev) => ({ ...prev, [jobId]: response.data }));
-      setWorkPlanStatusChoice((prev) => ({ ...prev, [jobId]: response.data.status }));
-    } catch (error: any) {
-      if (error?.response?.status === 404) {
-        setWorkPlans((prev) => ({ ...prev, [jobId]: null }));
-      } else {
-        console.error('Failed to load work plan:', error);
-      }
-    }
-  };
-
-  const loadInvoice = async (jobId: number) => {
-    try {
-      const response = await api.get(`/invoices/job/${jobId}/me`);
-      setInvoicesByJob((prev) => ({ ...prev, [jobId]: response.data }));
-      setInvoiceAmounts((prev) => ({ ...prev, [jobId]: response.data.amount.toString() }));
-    } catch (error: any) {
-      if (error?.response?.status === 404) {
-        setInvoicesByJob((prev) => ({ ...prev, [jobId]: null }));
-      } else {
-        console.error('Failed to load invoice:', error);
-      }
-    }
-  };
-
-  const loadJobDetails = async (jobId: number) => {
-    setLoadingDetails((prev) => ({ ...prev, [jobId]: true }));
-    await Promise.all([loadWorkPlan(jobId), loadInvoice(jobId)]);
-    setLoadingDetails((prev) => ({ ...prev, [jobId]: false }));
-  };
-
   const handleApply = async (jobId: number) => {
     try {
       await api.post(`/applications/apply/${jobId}`, {
@@ -158,7 +164,6 @@ const ContractorDashboard: React.FC = () => {
       return;
     }
     setExpandedJobId(jobId);
-    loadJobDetails(jobId);
   };
 
   return (
@@ -210,7 +215,7 @@ const ContractorDashboard: React.FC = () => {
                 className="input"
               />
               <button
-                onClick={fetchOpenJobs}
+                onClick={() => fetchOpenJobs(null, searchTerm)}
                 className="btn btn-primary"
               >
                 Search
@@ -270,6 +275,15 @@ const ContractorDashboard: React.FC = () => {
                 </div>
               ))}
             </div>
+            {openJobsCursor && (
+              <button
+                onClick={() => fetchOpenJobs(openJobsCursor)}
+                className="btn btn-secondary"
+                style={{ alignSelf: 'center' }}
+              >
+                Load more
+              </button>
+            )}
           </div>
         )}
 
@@ -332,155 +346,158 @@ const ContractorDashboard: React.FC = () => {
 
                 {expandedJobId === job.id && (
                   <div style={{ marginTop: '1rem', paddingTop: '1rem', borderTop: '1px solid var(--border-color)', display: 'grid', gap: 'var(--spacing-md)' }}>
-                    {loadingDetails[job.id] ? (
-                      <p style={{ color: 'var(--text-muted)' }}>Loading details...</p>
-                    ) : (
-                      <>
-                        <div style={{
-                          backgroundColor: 'var(--bg-secondary)',
-                          padding: 'var(--spacing-md)',
-                          borderRadius: 'var(--radius-md)',
-                          border: '1px solid var(--border-color)'
-                        }}>
-                          <h4 style={{ fontWeight: 'bold', marginBottom: '0.5rem' }}>Work Plan</h4>
-                          {workPlans[job.id] ? (
-                            <div style={{ display: 'grid', gap: '0.5rem' }}>
-                              <p><strong>Description:</strong> {workPlans[job.id]?.plan_description}</p>
-                              <p><strong>Start:</strong> {workPlans[job.id]?.start_date || 'N/A'} | <strong>End:</strong> {workPlans[job.id]?.end_date || 'N/A'}</p>
-                              <div style={{ display: 'flex', alignItems: 'center', gap: '0.5rem' }}>
-                                <label className="label" style={{ margin: 0 }}>Status</label>
-                                <select
-                                  value={workPlanStatusChoice[job.id] || WorkPlanStatus.NOT_STARTED}
-                                  onChange={(e) => setWorkPlanStatusChoice((prev) => ({ ...prev, [job.id]: e.target.value as WorkPlanStatus }))}
-                                  className="input"
-                                  style={{ width: '200px', appearance: 'auto' }}
-                                >
-                                  {Object.values(WorkPlanStatus).map((status) => (
-                                    <option key={status} value={status}>{status}</option>
-                                  ))}
-                                </select>
-                                <button
-                                  onClick={() => handleUpdateWorkPlanStatus(job.id, workPlanStatusChoice[job.id] || WorkPlanStatus.NOT_STARTED)}
-                                  className="btn btn-primary"
-                                >
-                                  Update
-                                </button>
-                              </div>
-                            </div>
-                          ) : (
-                            <div style={{ display: 'grid', gap: '0.5rem' }}>
-                              <textarea
-                                placeholder="Outline your approach, milestones, and deliverables"
-                                value={workPlanForm[job.id]?.plan_description || ''}
-                                onChange={(e) => setWorkPlanForm((prev) => ({
-                                  ...prev,
-                                  [job.id]: {
-                                    plan_description: e.target.value,
-                                    start_date: prev[job.id]?.start_date || '',
-                                    end_date: prev[job.id]?.end_date || '',
-                                  },
-                                }))}
-                                className="input"
-                                rows={3}
-                                style={{ fontFamily: 'inherit' }}
-                              />
-                              <div style={{ display: 'flex', gap: '0.5rem' }}>
-                                <input
-                                  type="date"
-                                  value={workPlanForm[job.id]?.start_date || ''}
-                                  onChange={(e) => setWorkPlanForm((prev) => ({
-                                    ...prev,
-                                    [job.id]: {
-                                      plan_description: prev[job.id]?.plan_description || '',
-                                      start_date: e.target.value,
-                                      end_date: prev[job.id]?.end_date || '',
-                                    },
-                                  }))}
-                                  className="input"
-                                  style={{ flex: 1 }}
-                                />
-                                <input
-                                  type="date"
-                                  value={workPlanForm[job.id]?.end_date || ''}
-                                  onChange={(e) => setWorkPlanForm((prev) => ({
-                                    ...prev,
-                                    [job.id]: {
-                                      plan_description: prev[job.id]?.plan_description || '',
-                                      start_date: prev[job.id]?.start_date || '',
-                                      end_date: e.target.value,
-                                    },
-                                  }))}
-                                  className="input"
-                                  style={{ flex: 1 }}
-                                />
-                              </div>
-                              <button
-                                onClick={() => handleCreateWorkPlan(job.id)}
-                                className="btn btn-primary"
-                                style={{ width: 'fit-content' }}
-                              >
-                                Create Work Plan
-                              </button>
-                            </div>
-                          )}
+                    <div style={{
+                      backgroundColor: 'var(--bg-secondary)',
+                      padding: 'var(--spacing-md)',
+                      borderRadius: 'var(--radius-md)',
+                      border: '1px solid var(--border-color)'
+                    }}>
+                      <h4 style={{ fontWeight: 'bold', marginBottom: '0.5rem' }}>Work Plan</h4>
+                      {workPlans[job.id] ? (
+                        <div style={{ display: 'grid', gap: '0.5rem' }}>
+                          <p><strong>Description:</strong> {workPlans[job.id]?.plan_description}</p>
+                          <p><strong>Start:</strong> {workPlans[job.id]?.start_date || 'N/A'} | <strong>End:</strong> {workPlans[job.id]?.end_date || 'N/A'}</p>
+                          <div style={{ display: 'flex', alignItems: 'center', gap: '0.5rem' }}>
+                            <label className="label" style={{ margin: 0 }}>Status</label>
+                            <select
+                              value={workPlanStatusChoice[job.id] || WorkPlanStatus.NOT_STARTED}
+                              onChange={(e) => setWorkPlanStatusChoice((prev) => ({ ...prev, [job.id]: e.target.value as WorkPlanStatus }))}
+                              className="input"
+                              style={{ width: '200px', appearance: 'auto' }}
+                            >
+                              {Object.values(WorkPlanStatus).map((status) => (
+                                <option key={status} value={status}>{status}</option>
+                              ))}
+                            </select>
+                            <button
+                              onClick={() => handleUpdateWorkPlanStatus(job.id, workPlanStatusChoice[job.id] || WorkPlanStatus.NOT_STARTED)}
+                              className="btn btn-primary"
+                            >
+                              Update
+                            </button>
+                          </div>
                         </div>
+                      ) : (
+                        <div style={{ display: 'grid', gap: '0.5rem' }}>
+                          <textarea
+                            placeholder="Outline your approach, milestones, and deliverables"
+                            value={workPlanForm[job.id]?.plan_description || ''}
+                            onChange={(e) => setWorkPlanForm((prev) => ({
+                              ...prev,
+                              [job.id]: {
+                                plan_description: e.target.value,
+                                start_date: prev[job.id]?.start_date || '',
+                                end_date: prev[job.id]?.end_date || '',
+                              },
+                            }))}
+                            className="input"
+                            rows={3}
+                            style={{ fontFamily: 'inherit' }}
+                          />
+                          <div style={{ display: 'flex', gap: '0.5rem' }}>
+                            <input
+                              type="date"
+                              value={workPlanForm[job.id]?.start_date || ''}
+                              onChange={(e) => setWorkPlanForm((prev) => ({
+                                ...prev,
+                                [job.id]: {
+                                  plan_description: prev[job.id]?.plan_description || '',
+                                  start_date: e.target.value,
+                                  end_date: prev[job.id]?.end_date || '',
+                                },
+                              }))}
+                              className="input"
+                              style={{ flex: 1 }}
+                            />
+                            <input
+                              type="date"
+                              value={workPlanForm[job.id]?.end_date || ''}
+                              onChange={(e) => setWorkPlanForm((prev) => ({
+                                ...prev,
+                                [job.id]: {
+                                  plan_description: prev[job.id]?.plan_description || '',
+                                  start_date: prev[job.id]?.start_date || '',
+                                  end_date: e.target.value,
+                                },
+                              }))}
+                              className="input"
+                              style={{ flex: 1 }}
+                            />
+                          </div>
+                          <button
+                            onClick={() => handleCreateWorkPlan(job.id)}
+                            className="btn btn-primary"
+                            style={{ width: 'fit-content' }}
+                          >
+                            Create Work Plan
+                          </button>
+                        </div>
+                      )}
+                    </div>
 
-                        <div style={{
-                          backgroundColor: 'var(--bg-secondary)',
-                          padding: 'var(--spacing-md)',
-                          borderRadius: 'var(--radius-md)',
-                          border: '1px solid var(--border-color)'
-                        }}>
-                          <h4 style={{ fontWeight: 'bold', marginBottom: '0.5rem' }}>Invoice</h4>
-                          {invoicesByJob[job.id] ? (
-                            <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
-                              <div>
-                                <p><strong>Amount:</strong> ${invoicesByJob[job.id]?.amount.toFixed(2)}</p>
-                                <p><strong>Status:</strong> {invoicesByJob[job.id]?.status}</p>
-                              </div>
-                              <span style={{
-                                padding: '0.3rem 0.6rem',
-                                borderRadius: 'var(--radius-sm)',
-                                backgroundColor: 'var(--color-tan)',
-                                fontSize: '0.85rem'
-                              }}>
-                                Submitted
-                              </span>
-                            </div>
-                          ) : workPlans[job.id]?.status === WorkPlanStatus.COMPLETED ? (
-                            <div style={{ display: 'flex', gap: '0.5rem', alignItems: 'flex-end' }}>
-                              <div style={{ flex: 1 }}>
-                                <label className="label" style={{ marginBottom: '0.3rem' }}>Invoice Amount ($)</label>
-                                <input
-                                  type="number"
-                                  min="0"
-                                  step="0.01"
-                                  value={invoiceAmounts[job.id] || ''}
-                                  onChange={(e) => setInvoiceAmounts((prev) => ({ ...prev, [job.id]: e.target.value }))}
-                                  className="input"
-                                  placeholder="Enter amount"
-                                />
-                              </div>
-                              <button
-                                onClick={() => handleSubmitInvoice(job.id)}
-                                className="btn btn-primary"
-                                style={{ whiteSpace: 'nowrap' }}
-                              >
-                                Submit Invoice
-                              </button>
-                            </div>
-                          ) : (
-                            <p style={{ color: 'var(--text-muted)' }}>
-                              Complete the work plan before submitting an invoice.
-                            </p>
-                          )}
+                    <div style={{
+                      backgroundColor: 'var(--bg-secondary)',
+                      padding: 'var(--spacing-md)',
+                      borderRadius: 'var(--radius-md)',
+                      border: '1px solid var(--border-color)'
+                    }}>
+                      <h4 style={{ fontWeight: 'bold', marginBottom: '0.5rem' }}>Invoice</h4>
+                      {invoicesByJob[job.id] ? (
+                        <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
+                          <div>
+                            <p><strong>Amount:</strong> ${invoicesByJob[job.id]?.amount.toFixed(2)}</p>
+                            <p><strong>Status:</strong> {invoicesByJob[job.id]?.status}</p>
+                          </div>
+                          <span style={{
+                            padding: '0.3rem 0.6rem',
+                            borderRadius: 'var(--radius-sm)',
+                            backgroundColor: 'var(--color-tan)',
+                            fontSize: '0.85rem'
+                          }}>
+                            Submitted
+                          </span>
                         </div>
-                      </>
-                    )}
+                      ) : workPlans[job.id]?.status === WorkPlanStatus.COMPLETED ? (
+                        <div style={{ display: 'flex', gap: '0.5rem', alignItems: 'flex-end' }}>
+                          <div style={{ flex: 1 }}>
+                            <label className="label" style={{ marginBottom: '0.3rem' }}>Invoice Amount ($)</label>
+                            <input
+                              type="number"
+                              min="0"
+                              step="0.01"
+                              value={invoiceAmounts[job.id] || ''}
+                              onChange={(e) => setInvoiceAmounts((prev) => ({ ...prev, [job.id]: e.target.value }))}
+                              className="input"
+                              placeholder="Enter amount"
+                            />
+                          </div>
+                          <button
+                            onClick={() => handleSubmitInvoice(job.id)}
+                            className="btn btn-primary"
+                            style={{ whiteSpace: 'nowrap' }}
+                          >
+                            Submit Invoice
+                          </button>
+                        </div>
+                      ) : (
+                        <p style={{ color: 'var(--text-muted)' }}>
+                          Complete the work plan before submitting an invoice.
+                        </p>
+                      )}
+                    </div>
                   </div>
                 )}
               </div>
             ))}
+            {assignedJobsCursor && (
+              <button
+                onClick={() => fetchAssignedJobs(assignedJobsCursor)}
+                className="btn btn-secondary"
+                style={{ justifySelf: 'center' }}
+              >
+                Load more
+              </button>
+            )}
           </div>
         )}
       </div>
@@ -61,6 +61,11 @@ export interface Job {
   created_at: string;
 }
 
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
 export interface Application {
   id: number;
   job_id: number;
@@ -90,3 +95,12 @@ export interface Invoice {
   status: InvoiceStatus;
   created_at: string;
 }
+
+export interface ContractorDashboardJob extends Job {
+  work_plan: WorkPlan | null;
+  invoice: Invoice | null;
+}
+
+export interface AgentDashboardJob extends ContractorDashboardJob {
+  applications: Application[];
+}